@@ -18,7 +18,9 @@ from player_constants import (
     FAV_FILES,
 
 )
+from buffered_writer import flush_all
 from static_methods import ensure_folder_exists
+from stats_manager import compact_stats
 from datetime import datetime
 
 class BackupManager:
@@ -40,6 +42,8 @@ class BackupManager:
         ensure_folder_exists(self.backup_folder)
 
     def create_backup(self):
+        flush_all(fsync=True)  # rows still queued by the log writers
+        compact_stats(self.file_paths["VIDEO_STATS_CSV"])  # stats updates still in the journal
         backup_data = {}
         self.backup_file = os.path.join(
             self.backup_folder,
@@ -0,0 +1,127 @@
+import atexit
+import os
+import sys
+import threading
+import time
+
+from player_constants import BUFFERED_WRITE_INTERVAL, BUFFERED_WRITE_MAX_PENDING
+
+
+class BufferedWriter:
+    """
+    Appends text to a file in batches instead of opening it for every line.
+
+    Lines are queued in memory and written with a single open/append when the queue
+    reaches max_pending lines, when the background timer fires (every
+    BUFFERED_WRITE_INTERVAL seconds) or when flush() is called. close() flushes and
+    fsyncs, and every writer is closed at exit or on an uncaught exception.
+    """
+
+    def __init__(self, file_path, newline=None, encoding="utf-8", max_pending=BUFFERED_WRITE_MAX_PENDING):
+        """
+        Args:
+            file_path (str): The file to append to.
+            newline (str, optional): Passed to open(); use "" for csv rows. Defaults to None.
+            encoding (str, optional): Defaults to "utf-8".
+            max_pending (int, optional): Queued lines that trigger an immediate flush. Defaults to BUFFERED_WRITE_MAX_PENDING.
+        """
+        self.file_path = file_path
+        self.newline = newline
+        self.encoding = encoding
+        self.max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        """Queues text to be appended to the file."""
+        with self._lock:
+            self._pending.append(text)
+            if len(self._pending) < self.max_pending:
+                return
+        self.flush()
+
+    def flush(self, fsync=False):
+        """Writes every queued line to the file in one append. Lines are kept for the next flush if it fails."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                with open(self.file_path, "a", newline=self.newline, encoding=self.encoding) as f:
+                    f.write("".join(pending))
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            except OSError as e:
+                print(f"Error writing to {self.file_path}: {e}")
+                self._pending = pending + self._pending
+
+    def close(self):
+        """Flushes the queued lines and fsyncs the file."""
+        self.flush(fsync=True)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+_timer = None
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(BUFFERED_WRITE_INTERVAL)
+        flush_all()
+
+
+def get_writer(file_path, newline=None, encoding="utf-8"):
+    """
+    Returns the writer shared by everything appending to file_path, so their lines stay in order.
+
+    The first call starts the background flush timer.
+    """
+    global _timer
+    key = os.path.normcase(os.path.abspath(file_path))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = BufferedWriter(file_path, newline=newline, encoding=encoding)
+        if _timer is None:
+            _timer = threading.Thread(target=_flush_periodically, daemon=True)
+            _timer.start()
+        return writer
+
+
+def flush_all(fsync=False):
+    """Flushes every writer. Call this before reading a file that has a writer in this process."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush(fsync=fsync)
+
+
+def close_all():
+    flush_all(fsync=True)
+
+
+def _flush_on_exception(previous_hook):
+    def hook(*args):
+        close_all()
+        previous_hook(*args)
+    return hook
+
+
+atexit.register(close_all)
+sys.excepthook = _flush_on_exception(sys.excepthook)
+threading.excepthook = _flush_on_exception(threading.excepthook)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    demo_path = os.path.join(tempfile.gettempdir(), "buffered_writer_demo.log")
+    writer = get_writer(demo_path)
+    for i in range(5):
+        writer.write(f"line {i}\n")
+    writer.close()
+    with open(demo_path, encoding="utf-8") as f:
+        print(f.read())
+    os.remove(demo_path)
@@ -71,6 +71,42 @@ class CategoryManager:
                 return True
             return False
 
+    def move_files_in_categories(self, path_mapping: dict) -> int:
+        """
+        Re-points category entries of moved files to their new paths with a single rewrite
+        of the categories file. The original 'Date Added' of each entry is kept.
+
+        Args:
+            path_mapping (dict): Old file path -> new file path.
+
+        Returns:
+            int: Number of category entries updated.
+        """
+        with self.lock:
+            moved = {old: new for old, new in path_mapping.items() if self.file_to_categories.get(old)}
+            if not moved:
+                return 0
+            entries = []
+            updated = 0
+            for row in self.entries:
+                category, file_path, date_added = row
+                new_path = moved.get(file_path)
+                if new_path is None:
+                    entries.append(row)
+                    continue
+                self.category_to_files[category].discard(file_path)
+                self.file_to_categories[file_path].discard(category)
+                updated += 1
+                if new_path in self.category_to_files[category]:
+                    continue
+                entries.append([category, new_path, date_added])
+                self.category_to_files[category].add(new_path)
+                self.file_to_categories[new_path].add(category)
+                self.logger.update_logs('[CATEGORY MOVED]', f"'{file_path}' -> '{new_path}' in category '{category}'")
+            self.entries = entries
+            self._write_entries()
+            return updated
+
     def get_category_files(self, category_name: str) -> list:
         return list(self.category_to_files.get(category_name, []))
 
@@ -5,6 +5,7 @@ from tkinter import filedialog
 from static_methods import get_favs_folder, normalise_path, ensure_folder_exists, rename_if_exists
 from player_constants import FAV_FILES, DELETE_FILES_CSV, LOG_PATH
 from logs_writer import LogManager
+from path_status import get_path_status
 from favorites_manager import FavoritesManager
 from datetime import datetime
 import shutil
@@ -129,14 +130,15 @@ class DeletionManager:
         """
         file_status_dict = self.read_csv_file()
         updated = False
+        exists = dict(zip(file_status_dict, get_path_status().exists_many(file_status_dict)))
 
         for file_path, metadata in file_status_dict.items():
-            if metadata['status'] == 'Deleted' and os.path.exists(file_path):
+            if metadata['status'] == 'Deleted' and exists[file_path]:
                 # File marked as deleted but still exists, reset status
                 file_status_dict[file_path]['status'] = 'ToDelete'
                 updated = True
                 print(f"File {file_path} exists. Status reset to 'ToDelete'.")
-            elif metadata['status'] == 'ToDelete' and not os.path.exists(file_path):
+            elif metadata['status'] == 'ToDelete' and not exists[file_path]:
                 file_status_dict[file_path]['status'] = 'Deleted'
                 updated = True
                 print(f"File {file_path} doesn't exist. Status set to 'Deleted'.")
@@ -186,6 +188,7 @@ class DeletionManager:
             if os.path.exists(new_path):
                 new_path = rename_if_exists(new_path)
             shutil.move(file_path, new_path)
+            get_path_status().invalidate([file_path, new_path])
             file_status_dict[file_path]["status"] = "Moved to Favorites Backup"
             self.logger.update_logs('[FILE MOVED]', f"{file_path} to {new_path}")
             self.fav_manager.update_favorite_path(file_path, new_path)
@@ -213,6 +216,7 @@ class DeletionManager:
                     return False
             
             send2trash(file_path)
+            get_path_status().invalidate([file_path])
             print(f"[FILE DELETED] {file_path} has been deleted.")
             self.logger.update_logs('[FILE DELETED]', file_path)
             return True
@@ -239,6 +243,30 @@ class DeletionManager:
             pass
         self.write_csv_file(file_status_dict)
 
+    def update_file_names_in_csv(self, path_mapping):
+        """
+        Bulk variant of update_file_name_in_csv: renames every moved file marked 'ToDelete'
+        with a single read and a single rewrite of the CSV.
+
+        Args:
+            path_mapping (dict): Old file path -> new file path.
+
+        Returns:
+            int: Number of entries renamed.
+        """
+        file_status_dict = self.read_csv_file()
+        updated = 0
+        for old_name, new_name in path_mapping.items():
+            old_name = normalise_path(old_name)
+            new_name = normalise_path(new_name)
+            if old_name in file_status_dict and file_status_dict[old_name]['status'] == "ToDelete":
+                file_status_dict[new_name] = file_status_dict.pop(old_name)
+                self.logger.update_logs('[DELETION-LIST UPDATED]: ', f"{old_name} -> {new_name}")
+                updated += 1
+        if updated:
+            self.write_csv_file(file_status_dict)
+        return updated
+
     def refactor_csv(self):
         """Refactors the CSV file to include file size and modification time."""
         temp_file = self.delete_csv + ".tmp"  # Temporary file to store updated CSV content
@@ -3,7 +3,8 @@ import csv
 from datetime import datetime
 from logs_writer import LogManager
 from player_constants import FAV_FILES, LOG_PATH, LOGS_FOLDER
-from static_methods import create_csv_file, get_file_size, normalise_path, ensure_folder_exists
+from size_index import get_size_index
+from static_methods import create_csv_file, normalise_path, ensure_folder_exists
 import hashlib
 from pprint import pprint
 
@@ -105,7 +106,7 @@ class FavoritesManager:
             for row in reader:
                 path = os.path.join(row["Source Path"], row["Video Name"])
                 favorites.append(path)
-                self.total_size += get_file_size(path)
+        self.total_size += get_size_index().total_size(favorites)
         return favorites
     
     def get_favorites_by_name(self) -> dict:
@@ -207,6 +208,56 @@ class FavoritesManager:
             print(f"File {old_path} was not found in favorites.")
             return False
 
+    def update_favorite_paths(self, path_mapping):
+        """
+        Bulk variant of update_favorite_path: updates every moved favorite in a single rewrite of the CSV.
+
+        Args:
+            path_mapping (dict): Old file path -> new file path.
+
+        Returns:
+            int: Number of favorites updated.
+        """
+        moves = {}
+        for old_path, new_path in path_mapping.items():
+            if not old_path or not new_path:
+                continue
+            video_name = os.path.basename(old_path)
+            old_source_path = normalise_path(os.path.dirname(old_path))
+            new_source_path = normalise_path(os.path.dirname(new_path))
+            moves[self.hash_string(video_name + old_source_path)] = (
+                new_source_path, self.hash_string(os.path.basename(new_path) + new_source_path), old_path, new_path
+            )
+        if not moves:
+            return 0
+
+        updated = 0
+        temp_csv = self.fav_csv + ".temp"
+        with open(self.fav_csv, "r", newline="", encoding="utf-8") as file, \
+                open(temp_csv, "w", newline="", encoding="utf-8") as temp_file:
+            reader = csv.DictReader(file)
+            writer = csv.DictWriter(temp_file, fieldnames=reader.fieldnames)
+            writer.writeheader()
+
+            for row in reader:
+                move = moves.get(row["Hash"])
+                if move:
+                    new_source_path, new_hash, old_path, new_path = move
+                    row["Video Name"] = os.path.basename(new_path)
+                    row["Source Path"] = new_source_path
+                    row["Hash"] = new_hash
+                    updated += 1
+                    self.logger.update_logs(f"[FAVORITES UPDATED]", f"{row['Video Name']} changed from {old_path} to {new_path}")
+                writer.writerow(row)
+
+        if updated:
+            os.replace(temp_csv, self.fav_csv)
+            self._hash_cache = None
+            print(f"[UPDATED FAVORITES]: {updated} moved")
+        else:
+            os.remove(temp_csv)
+        return updated
+
     def normalize_favorites_paths_and_hashes(self):
         """
         Normalizes the file paths in the favorites CSV and updates the corresponding hash values.
@@ -1,6 +1,7 @@
 import hashlib
 import os
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pprint import pprint
 
 from static_methods import compare_folders
@@ -12,18 +13,25 @@ except ImportError:
 
 from datetime import datetime
 from logs_writer import LogManager
-from player_constants import CSV_FOLDER, LOG_PATH, SCREENSHOTS_FOLDER, SKIP_FOLDERS
+from folder_scanner import IncrementalFolderScanner, scan_roots
+from media_catalog import MediaCatalog
+from path_status import get_path_status
+from player_constants import CSV_FOLDER, INCREMENTAL_RESCAN, LOG_PATH, SCAN_STATE_FOLDER, SCAN_WORKERS, SCREENSHOTS_FOLDER, SKIP_FOLDERS, USE_MEDIA_CATALOG
 
 class VideoFileLoader:
     """A class for loading video files from folders or CSV files."""
 
-    def __init__(self, csv_folder=None, media_extensions=[".avi", ".mov",".mp4", ".mkv", ".m4v", ".webm", ".wmv", ".flv"]):
+    def __init__(self, csv_folder=None, media_extensions=[".avi", ".mov",".mp4", ".mkv", ".m4v", ".webm", ".wmv", ".flv"], incremental=INCREMENTAL_RESCAN, use_catalog=USE_MEDIA_CATALOG):
         """
         Initializes the VideoFileLoader.
 
         Args:
             media_extensions (list, optional): List of media file extensions to consider as video files. 
             Defaults to [".avi", ".mp4", ".mkv", ".m4v", ".webm"].
+            incremental (bool, optional): Rescan only changed directories when a folder csv is
+            built or refreshed. Defaults to INCREMENTAL_RESCAN.
+            use_catalog (bool, optional): Sync folder csvs into the SQLite media catalog and
+            read folders back from it. Defaults to USE_MEDIA_CATALOG.
             sets the var of total_size in bytes
         """
         self.csv_folder = os.path.dirname(os.path.abspath(__file__)) if csv_folder is None else csv_folder
@@ -32,6 +40,14 @@ class VideoFileLoader:
         self.refresh = []
         self.logger = LogManager(LOG_PATH)
         self.total_size_in_bytes = 0
+        self.incremental = incremental
+        self.catalog = None
+        if use_catalog:
+            try:
+                self.catalog = MediaCatalog()
+            except Exception as e:
+                print(f"Media catalog unavailable, reading folder csvs instead: {e}")
+                self.logger.error_logs(f"{e} While Opening Media Catalog")
 
     @staticmethod
     def load_image_files():
@@ -74,57 +90,122 @@ class VideoFileLoader:
 
         Returns:
             list: List of video file paths.
+
+        Note:
+            The folders are walked concurrently (see folder_scanner.scan_roots) and merged
+            in the given order.
         """
-        video_files = []
-        for folder_path in folder_paths:
-            try:
-                # if not skip_check and not os.path.exists(folder_path):
-                #     print(f"Folder '{folder_path}' does not exist.")
-                #     continue
-                if not os.path.exists(folder_path):
-                    continue
-                
-                for root, dirs, files in os.walk(folder_path):
-                    for file in files:
-                        if file.endswith(tuple(self.video_extensions)):
-                            video_files.append(os.path.join(root, file))
-            except Exception as e:
-                print(f"An error occurred while retrieving video files from folder '{folder_path}': {e}")
-                self.logger.error_logs(f"{e} While Retrieving {folder_path}")
-        return video_files
-    
+        folder_paths = [folder_path.strip() for folder_path in folder_paths if folder_path.strip()]
+        return scan_roots(folder_paths, self.video_extensions, max_workers=SCAN_WORKERS)
+
+    def get_scan_state_path(self, folder):
+        """Returns the path of the incremental scan snapshot kept for a folder."""
+        folder = self.ensure_trailing_backslash(folder)
+        return os.path.join(self.csv_folder, SCAN_STATE_FOLDER, f"Scan_{self.hash_string(folder, hash_length=32)}.json")
+
+    def get_folder_csv_path(self, folder):
+        """Returns the path of the Testing csv kept for a folder."""
+        folder = self.ensure_trailing_backslash(self.normalise_path(folder))
+        return os.path.join(self.csv_folder, CSV_FOLDER, f"Testing_{self.hash_string(folder, hash_length=32)}.csv")
+
+    def sync_catalog(self, folder, csv_file):
+        """Replaces the catalog rows of a folder with the rows of its freshly written csv."""
+        if self.catalog is None:
+            return
+        try:
+            self.catalog.sync_folder_from_csv(folder, csv_file)
+        except Exception as e:
+            print(f"Failed to sync {folder} into the media catalog: {e}")
+            self.logger.error_logs(f"{e} While Syncing {folder} Into Media Catalog")
+
+    def rescan_folder(self, folder, csv_file):
+        """
+        Incrementally rescans a folder and patches its csv with the added, removed and modified files.
+
+        Args:
+            folder (str): Path of the folder.
+            csv_file (str): Path of the folder's Testing csv.
+
+        Returns:
+            dict: Counts of added, removed and modified rows.
+        """
+        scanner = IncrementalFolderScanner(
+            folder, self.video_extensions, csv_file, self.get_scan_state_path(folder), skip_folders=SKIP_FOLDERS
+        )
+        return scanner.rescan()
+
+    def _build_folder_csv(self, folder, csv_file, skip_folders=None):
+        if self.incremental:
+            self.rescan_folder(folder, csv_file)
+        elif skip_folders is None:
+            stats = filestatser.FileStatsCollector(folder, self.video_extensions, all_files=False)
+            stats.generate_file_stats_csv(csv_path=csv_file)
+        else:
+            stats = filestatser.FileStatsCollector(folder, self.video_extensions, all_files=False, skip_folders=skip_folders)
+            stats.generate_file_stats_csv(csv_path=csv_file)
+
+    def build_folder_csvs(self, folder_paths, skip_folders=None):
+        """
+        Builds (or rescans) the csv of each folder, walking up to SCAN_WORKERS folders at once.
+
+        Args:
+            folder_paths (list): List of folder paths.
+            skip_folders (set, optional): Folder names to skip for full rebuilds.
+
+        Returns:
+            list: (folder, csv_file) for the folders that were scanned successfully, in the given order.
+        """
+        folders = list(dict.fromkeys(self.ensure_trailing_backslash(folder) for folder in folder_paths))
+        if not folders:
+            return []
+        jobs = [(folder, self.get_folder_csv_path(folder)) for folder in folders]
+        failed = set()
+        workers = max(1, min(SCAN_WORKERS, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._build_folder_csv, folder, csv_file, skip_folders): folder for folder, csv_file in jobs}
+            for done, future in enumerate(as_completed(futures), start=1):
+                folder = futures[future]
+                try:
+                    future.result()
+                    print(f"[Scanned {done}/{len(jobs)}] {folder}")
+                except Exception as e:
+                    failed.add(folder)
+                    print(f"An error occurred while storing file data: {e}")
+                    self.logger.error_logs(f"{e} While Storing {folder}")
+        return [(folder, csv_file) for folder, csv_file in jobs if folder not in failed]
+
     def add_folder_data_csv(self, folder_paths=[]):
+        """
+        Builds the csv of each folder, syncs it into the media catalog and records it in Log_Folders.csv.
+        The folders are scanned concurrently; the catalog and Log_Folders.csv are updated afterwards in the given order.
+
+        Returns:
+            list: Paths of the csv files built.
+        """
         try:
-            # folders_without_csv, _ = self.seg_with_without_csv(folder_paths)
-            # for folder in folders_without_csv:
             csv_files = []
-            for folder in folder_paths:
-                folder = self.ensure_trailing_backslash(folder)
-                stats = filestatser.FileStatsCollector(folder, self.video_extensions, all_files=False)
-                # testing_csv_path = os.path.join(self.csv_folder, CSV_FOLDER, f"Testing_{os.path.basename(folder)}.csv")
-                testing_csv_path = os.path.join(self.csv_folder, CSV_FOLDER, f"Testing_{self.hash_string(folder, hash_length=32)}.csv")
-                stats.generate_file_stats_csv(csv_path=testing_csv_path)
+            for folder, testing_csv_path in self.build_folder_csvs(folder_paths):
+                self.sync_catalog(folder, testing_csv_path)
                 self.add_to_csv_file(folder, testing_csv_path)
                 csv_files.append(testing_csv_path)
             return csv_files
         except Exception as e:
             print(f"An error occurred while storing file data: {e}")
-            self.logger.error_logs(f"{e} While Storing {folder}")
+            self.logger.error_logs(f"{e} While Storing {folder_paths}")
             return []
 
     def update_folder_data_csv(self, folder_paths=[]):
         """
         Update folder data CSV files for the specified folder paths.
+        With incremental rescans enabled only the changed directories are listed again
+        and the csv is patched instead of being rebuilt. The folders are scanned concurrently.
 
         Args:
             folder_paths (list): List of folder paths to update CSV files.
         """
         try:
-            for folder in folder_paths:
-                folder = self.ensure_trailing_backslash(folder)
-                csv_file = os.path.join(self.csv_folder, CSV_FOLDER, f"Testing_{self.hash_string(folder, hash_length=32)}.csv")
-                stats = filestatser.FileStatsCollector(folder, self.video_extensions, all_files=False, skip_folders=SKIP_FOLDERS)
-                stats.generate_file_stats_csv(csv_path=csv_file)
+            for folder, csv_file in self.build_folder_csvs(folder_paths, skip_folders=SKIP_FOLDERS):
+                self.sync_catalog(folder, csv_file)
                 # Update CSV path in Log_Folders.csv
                 self.add_to_csv_file(folder, csv_file)
         except Exception as e:
@@ -144,6 +225,8 @@ class VideoFileLoader:
             if csvfile.tell() == 0:
                 csv_writer.writerow(["Folder Path", "Csv Path", "Date"])  # Header
             csv_writer.writerow([folder_path, testing_csv_path, datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        # the folder and its csv may be cached as missing by show_paths and the other existence checks
+        get_path_status().invalidate([folder_path, testing_csv_path, self.csv_path])
 
     def check_folders_path(self, folder_path):
         """
@@ -171,13 +254,14 @@ class VideoFileLoader:
         return folder_path
     
     def clean_input_paths(self, paths=[]):
-        csv_files = set()
-        folders = set()
+        # dicts instead of sets so the roots keep the order they were given in
+        csv_files = {}
+        folders = {}
         for ipath in paths:
             if ".csv" in ipath:
-                csv_files.add(ipath)
+                csv_files[ipath] = None
             else:
-                folders.add(ipath)
+                folders[ipath] = None
         return list(folders), list(csv_files)
     
     def seg_with_without_csv(self, folder_paths=[]):
@@ -216,17 +300,17 @@ class VideoFileLoader:
         return folders, csv_files
 
     
-    def get_videos_from_csv(self, csv_files=[]):
+    def iter_videos_from_csv(self, csv_files=[]):
         """
-        Retrieves video files listed in CSV files.
+        Yields video files listed in CSV files as the rows are parsed.
+        total_size_in_bytes grows as the files are yielded.
 
         Args:
             csv_files (list, optional): List of CSV file paths. Defaults to [].
 
-        Returns:
-            list: List of video file paths extracted from the CSV files.
+        Yields:
+            str: Path of a video file.
         """
-        video_files = []
         for csv_file in csv_files:
             try:
                 with open(csv_file, "r", encoding="utf-8") as file:
@@ -236,8 +320,8 @@ class VideoFileLoader:
                             source_folder = row.get("Source Folder", "")
                             file_name = row.get("File Name", "")
                             if source_folder and file_name:
-                                video_files.append(os.path.join(source_folder, file_name))
                                 self.total_size_in_bytes += float(row.get("File Size (Bytes)", 0))
+                                yield os.path.join(source_folder, file_name)
             except (FileNotFoundError, csv.Error) as e:
                 print(f"Error reading CSV file '{csv_file}': {e}")
             except TypeError as e:
@@ -245,8 +329,51 @@ class VideoFileLoader:
             except Exception as e:
                 print(f"Exception {e} Occurred. File Might Not Exists")
                 continue
-        return video_files
+
+    def get_videos_from_csv(self, csv_files=[]):
+        """
+        Retrieves video files listed in CSV files.
+
+        Args:
+            csv_files (list, optional): List of CSV file paths. Defaults to [].
+
+        Returns:
+            list: List of video file paths extracted from the CSV files.
+        """
+        return list(self.iter_videos_from_csv(csv_files))
     
+    def iter_videos_from_catalog(self, folder_paths=[]):
+        """
+        Yields video files of the given folders from the media catalog.
+        Folders whose csv is not in the catalog yet (or changed since) are synced first.
+
+        Args:
+            folder_paths (list, optional): List of scanned folder paths. Defaults to [].
+
+        Yields:
+            str: Path of a video file found under the folders.
+        """
+        for folder in folder_paths:
+            csv_file = self.get_folder_csv_path(folder)
+            if os.path.exists(csv_file) and not self.catalog.is_folder_synced(folder, csv_file):
+                self.sync_catalog(folder, csv_file)
+
+        for file_path, size in self.catalog.iter_media(folder_paths, extensions=self.video_extensions):
+            self.total_size_in_bytes += size
+            yield file_path
+
+    def get_videos_from_catalog(self, folder_paths=[]):
+        """
+        Retrieves video files of the given folders from the media catalog.
+
+        Args:
+            folder_paths (list, optional): List of scanned folder paths. Defaults to [].
+
+        Returns:
+            list: List of video file paths found under the folders.
+        """
+        return list(self.iter_videos_from_catalog(folder_paths))
+
     def ensure_trailing_backslash(self, path) -> str:
         """Ensure the path ends with a backslash if it's a directory."""
         if path and not path.endswith("\\"):
@@ -269,16 +396,19 @@ class VideoFileLoader:
     
     def check_to_refresh(self, folder_paths=[]):
         folders = []
+        to_update = []
         for folder in folder_paths:
             try:
                 if "--update" in folder:
                     folder = self.normalise_path(folder.replace("--update", "").strip())
                     # folders.append(folder.replace("--update", ""))
-                    self.update_folder_data_csv([folder])
+                    to_update.append(folder)
                 folders.append(self.ensure_trailing_backslash(folder))
             except Exception as e:
                 self.logger.error_logs(f"{e} While refreshing {folder}")
                 print(f"{e} While refreshing {folder}")
+        if to_update:
+            self.update_folder_data_csv(to_update)
         return folders
     
     def refresh_folders(self, folder_paths):
@@ -292,19 +422,17 @@ class VideoFileLoader:
         """
         if isinstance(folder_paths, str):
             folder_paths = [folder_paths]
+        folders = [self.normalise_path(folder) for folder in folder_paths]
+        try:
+            self.update_folder_data_csv(folders)
+        except Exception as e:
+            print(f"Failed to refresh {folders}: {e}")
+            self.logger.error_logs(f"{e} While refreshing {folders}")
+            return []
         refreshed_csvs = []
-        for folder in folder_paths:
-            try:
-                folder = self.normalise_path(folder)
-                self.update_folder_data_csv([folder])
-                csv_file = os.path.join(
-                    self.csv_folder, CSV_FOLDER, f"Testing_{self.hash_string(folder, hash_length=32)}.csv"
-                )
-                refreshed_csvs.append(csv_file)
-                print(f"Refreshed: {folder}")
-            except Exception as e:
-                print(f"Failed to refresh {folder}: {e}")
-                self.logger.error_logs(f"{e} While refreshing {folder}")
+        for folder in folders:
+            refreshed_csvs.append(self.get_folder_csv_path(folder))
+            print(f"Refreshed: {folder}")
         return refreshed_csvs
 
     
@@ -326,15 +454,50 @@ class VideoFileLoader:
             4. Updates the folder data CSV files.
             5. Combines all CSV files into a single list.
             6. Retrieves video files from the combined CSV file paths.
+            With the media catalog enabled, steps 5 and 6 query the catalog for the
+            folders instead, and only the given CSV paths are read directly.
         """
         final_paths = self.strip_string_by_comma(input_string)
         folder_inputs, csv_inputs = self.clean_input_paths(final_paths)
         refreshed_folders = self.check_to_refresh(folder_inputs)
         undocumented_folders, folders_csv = self.seg_with_without_csv(refreshed_folders)
         updated_csv_files = self.add_folder_data_csv(folder_paths=undocumented_folders)
+        if self.catalog is not None and folder_inputs:
+            size_before = self.total_size_in_bytes
+            try:
+                existing_folders = [folder for folder in refreshed_folders if os.path.exists(folder)]
+                return self.get_videos_from_catalog(existing_folders) + self.get_videos_from_csv(csv_inputs)
+            except Exception as e:
+                print(f"Media catalog query failed, reading folder csvs instead: {e}")
+                self.logger.error_logs(f"{e} While Querying Media Catalog")
+                self.total_size_in_bytes = size_before
         total_csvs = updated_csv_files + folders_csv + csv_inputs
         final_videos = self.get_videos_from_csv(total_csvs)
         return final_videos
+
+    def stream_start_here(self, input_string):
+        """
+        Streaming variant of start_here. Folders are scanned (or refreshed) up front as
+        in start_here, then the video files are yielded as the catalog or the CSVs are read,
+        so a player can start on the first file while the rest are still being loaded.
+
+        Args:
+            input_string (str): A comma-separated string containing paths to folders and CSV files.
+
+        Yields:
+            str: Path of a video file.
+        """
+        final_paths = self.strip_string_by_comma(input_string)
+        folder_inputs, csv_inputs = self.clean_input_paths(final_paths)
+        refreshed_folders = self.check_to_refresh(folder_inputs)
+        undocumented_folders, folders_csv = self.seg_with_without_csv(refreshed_folders)
+        updated_csv_files = self.add_folder_data_csv(folder_paths=undocumented_folders)
+        if self.catalog is not None and folder_inputs:
+            existing_folders = [folder for folder in refreshed_folders if os.path.exists(folder)]
+            yield from self.iter_videos_from_catalog(existing_folders)
+            yield from self.iter_videos_from_csv(csv_inputs)
+            return
+        yield from self.iter_videos_from_csv(updated_csv_files + folders_csv + csv_inputs)
     
 
     
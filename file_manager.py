@@ -1,16 +1,18 @@
+import io
 import os
-import shutil
 import csv
 from datetime import datetime
 from player_constants import FILE_TRANSFER_LOG, LOG_PATH
 from favorites_manager import FavoritesManager
 from deletion_manager import DeletionManager
 from logs_writer import LogManager
-from static_methods import create_csv_file, ensure_folder_exists, rename_if_exists, compare_folders, normalise_path
+from static_methods import create_csv_file, ensure_folder_exists, rename_if_exists, remove_number_suffix, compare_folders, normalise_path
 from category_manager import CategoryManager
 from stats_manager import VideoStatsManager
 from file_loader import VideoFileLoader
 from notes_manager import NotesManager
+from transfer_engine import TransferEngine
+from transfer_lineage import get_transfer_lineage
 import threading
 
 
@@ -24,6 +26,7 @@ class FileManager:
         self.video_stats_manager = video_stats_manager or VideoStatsManager()
         self.file_loader = VideoFileLoader()
         self.notes_manager = notes_manager or NotesManager()
+        self.transfer_engine = TransferEngine()
         if parent_window:
             self.deletes.set_parent_window(parent_window)
         self.logger = LogManager(LOG_PATH)
@@ -35,7 +38,8 @@ class FileManager:
             if dest_path is None:
                 return False
 
-            shutil.move(src, dest_path)
+            if not self.transfer_engine.move(src, dest_path):
+                return False
             dest_src = normalise_path(dest) # currently no use
             self._apply_post_move_hooks(src, normalise_path(dest_path), dest_src)
             # print(f"File moved from {src} to {normalise_path(dest_path)}")
@@ -57,10 +61,11 @@ class FileManager:
             return False
 
         
-    def _validate_and_prepare(self, src: str, dest_dir: str) -> str | None:
+    def _validate_and_prepare(self, src: str, dest_dir: str, reserved: set | None = None) -> str | None:
         """
         Returns the final destination path if valid, or None if the move should be skipped
         (e.g., same source and destination folder).
+        reserved holds destination paths already claimed by other files of the same batch.
         """
         if not os.path.isfile(src):
             # raise FileNotFoundError(f"Source file not found: {src}")
@@ -79,6 +84,13 @@ class FileManager:
 
         if os.path.exists(dest_path):
             dest_path = rename_if_exists(dest_path)
+        if reserved:
+            base_name, extension = os.path.splitext(dest_path)
+            base_name = remove_number_suffix(base_name)
+            counter = 1
+            while normalise_path(dest_path) in reserved or os.path.exists(dest_path):
+                dest_path = f"{base_name}({counter}){extension}"
+                counter += 1
 
         return normalise_path(dest_path)
 
@@ -138,41 +150,98 @@ class FileManager:
         ).start()
 
 
-    def move_files(self, src_files, dest_folder):
+    def move_files(self, src_files, dest_folder, progress_callback=None, reload_folders=True):
         """
         Move multiple files to the destination folder, with error handling for each.
-        Reloads the folder only once at the end for performance.
+
+        The filesystem moves are done first through the transfer engine (a rename for
+        same-drive moves, pooled copies for cross-drive ones), collecting an old -> new path
+        mapping; the deletion list, favorites, categories, stats, notes and transfer log are
+        then updated with one bulk write each instead of once per file. Reloads the folders
+        only once at the end, unless reload_folders is False.
+
+        Args:
+            src_files (list): Paths of the files to move.
+            dest_folder (str): Destination folder.
+            progress_callback (callable, optional): Receives the transfer progress dict
+                (files, bytes and bytes/s), see TransferEngine.
+            reload_folders (bool, optional): Rescan the destination and source folders in the
+                background, which also records them in Log_Folders.csv. Defaults to True.
+
+        Returns:
+            dict: Old path -> new path of every file that was moved.
         """
         src_folders = set()
-        any_success = False
-        for idx, file in enumerate(src_files):
+        jobs = []
+        reserved = set()
+        for file in src_files:
             src_folders.add(normalise_path(os.path.dirname(file)))
-            print(f"[Moving] {idx + 1}/ {len(src_files)}")
-            success = self.move_file(file, dest_folder)
-            if success:
-                any_success = True
-
-        folders_to_reload = [normalise_path(dest_folder)] + list(src_folders)
-        # print(folders_to_reload)
-        if any_success:
+            dest_path = self._validate_and_prepare(file, dest_folder, reserved)
+            if dest_path:
+                reserved.add(dest_path)
+                jobs.append((file, dest_path))
+
+        print(f"[Moving] {len(jobs)} file(s) to {dest_folder}")
+        engine = TransferEngine(progress_callback=progress_callback) if progress_callback else self.transfer_engine
+        moved = {src: normalise_path(dest_path) for src, dest_path in engine.move_many(jobs).items()}
+
+        if moved:
+            self._apply_bulk_post_move_hooks(moved)
+        if moved and reload_folders:
+            folders_to_reload = [normalise_path(dest_folder)] + list(src_folders)
             threading.Thread(
                 target=self.file_loader.add_folder_data_csv,
                 args=(folders_to_reload,),
                 daemon=True
             ).start()
+        return moved
+
+    def _apply_bulk_post_move_hooks(self, moved):
+        for hook in [
+            self._log_moves,
+            self.log_transfers,
+            self.deletes.update_file_names_in_csv,
+            self.favorites.update_favorite_paths,
+            self.categories.move_files_in_categories,
+            self.video_stats_manager.move_stats,
+            self._update_notes_keys,
+        ]:
+            try:
+                hook(moved)
+            except Exception as e:
+                self.logger.error_logs(f"{hook.__name__} failed: {e}")
 
+    def _log_moves(self, moved):
+        for old_src, new_src in moved.items():
+            self.logger.update_logs('[FILE MOVED]', f"{old_src} -> {new_src}")
+
+    def _update_notes_keys(self, moved):
+        if self.notes_manager:
+            self.notes_manager.update_note_keys(moved)
 
     def log_transfer(self, src, dest, action="MOVED"):
         """
         Log the file transfer details into a CSV file. If the log file doesn't exist, create it.
         """
+        self.log_transfers({src: dest}, action=action)
+
+    def log_transfers(self, moved, action="MOVED"):
+        """
+        Logs several file transfers (old path -> new path) with a single write to the CSV log.
+        The transfer lineage index is updated with the same rows.
+        """
         try:
-            with open(self.log_file, mode='a', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow([src, dest, action, datetime.now()])
+            now = datetime.now()
+            rows = io.StringIO()
+            csv.writer(rows).writerows([src, dest, action, now] for src, dest in moved.items())
+            get_transfer_lineage(self.log_file).record(moved, rows.getvalue(), self._append_to_log)
         except Exception as e:
-            self.logger.error_logs(f"Error logging the file transfer: {e}")
-            print(f"Error logging the file transfer: {e}")
+            self.logger.error_logs(f"Error logging the file transfers: {e}")
+            print(f"Error logging the file transfers: {e}")
+
+    def _append_to_log(self, rows_text):
+        with open(self.log_file, mode='a', newline='', encoding='utf-8') as file:
+            file.write(rows_text)
 
     def ensure_csv_headers(self):
         """
@@ -0,0 +1,312 @@
+import csv
+import json
+import ntpath
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from logs_writer import LogManager
+from player_constants import LOG_PATH, SCAN_WORKERS, SKIP_FOLDERS
+from static_methods import MEDIA_CSV_HEADER, convert_bytes, ensure_folder_exists, normalise_path
+
+
+def _strip_trailing_separators(path):
+    """Drops trailing backslashes, except from a drive or share root ("D:\\" alone would mean D:'s current directory)."""
+    if ntpath.splitdrive(path)[1] in ("\\", ""):
+        return path
+    return path.rstrip("\\")
+
+
+class IncrementalFolderScanner:
+    """
+    Rescans a folder incrementally and patches its Testing_<hash>.csv in place.
+
+    A JSON snapshot remembers the mtime of every directory under the folder together
+    with the (size, mtime) of the media files it contained. On the next rescan only the
+    directories whose mtime changed are listed again in full; unchanged directories reuse
+    their snapshotted subdirectories and only have the sizes and mtimes of their known
+    media files refreshed, from one scandir each. The folder CSV is then patched with just
+    the added, removed and modified rows.
+
+    Note:
+        A directory's mtime only changes when entries are added, removed or renamed in it,
+        which is why files rewritten in place (re-encoded or trimmed) are looked at even in
+        unchanged directories.
+    """
+
+    def __init__(self, folder, media_extensions, csv_path, state_path, skip_folders=SKIP_FOLDERS):
+        """
+        Args:
+            folder (str): Root folder to scan.
+            media_extensions (list): Extensions (with the leading dot) to keep.
+            csv_path (str): Path of the folder's Testing_<hash>.csv.
+            state_path (str): Path of the JSON snapshot for this folder.
+            skip_folders (set, optional): Folder names or trailing paths to skip. Defaults to SKIP_FOLDERS.
+        """
+        self.folder = _strip_trailing_separators(normalise_path(folder))
+        self.media_extensions = {ext.lower() for ext in media_extensions}
+        self.csv_path = csv_path
+        self.state_path = state_path
+        self.skip_names = {item.lower() for item in skip_folders if "\\" not in item}
+        self.skip_suffixes = tuple("\\" + item.lower() for item in skip_folders if "\\" in item)
+        self.logger = LogManager(LOG_PATH)
+
+    def _is_skipped(self, dir_path, dir_name):
+        if dir_name.lower() in self.skip_names:
+            return True
+        return normalise_path(dir_path).lower().endswith(self.skip_suffixes) if self.skip_suffixes else False
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state.get("dirs", {})
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable scan snapshot {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self, dirs):
+        ensure_folder_exists(os.path.dirname(self.state_path))
+        temp_path = self.state_path + ".temp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"folder": self.folder, "dirs": dirs}, f)
+        os.replace(temp_path, self.state_path)
+
+    def _load_rows(self):
+        rows = {}
+        if not os.path.exists(self.csv_path):
+            return rows
+        with open(self.csv_path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                source_folder = row.get("Source Folder", "")
+                file_name = row.get("File Name", "")
+                if source_folder and file_name:
+                    rows[normalise_path(os.path.join(source_folder, file_name))] = row
+        return rows
+
+    def _list_directory(self, dir_path):
+        """Lists one directory, returning its media files as {name: [size, mtime, ctime]} and its subdirectories."""
+        files = {}
+        subdirs = []
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self._is_skipped(entry.path, entry.name):
+                            subdirs.append(normalise_path(entry.path))
+                    elif os.path.splitext(entry.name)[1].lower() in self.media_extensions:
+                        st = entry.stat()
+                        files[entry.name] = [st.st_size, st.st_mtime, st.st_ctime]
+                except OSError as e:
+                    self.logger.error_logs(f"{e} While Scanning {entry.path}")
+        return files, sorted(subdirs)
+
+    def _restat_files(self, dir_path, known_files):
+        """Returns known_files ({name: [size, mtime, ctime]}) with the current stats of the files still there."""
+        files = {}
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.name not in known_files:
+                        continue
+                    try:
+                        # free on Windows, where scandir already returned the stats
+                        st = entry.stat()
+                        files[entry.name] = [st.st_size, st.st_mtime, st.st_ctime]
+                    except OSError as e:
+                        self.logger.error_logs(f"{e} While Scanning {entry.path}")
+                        files[entry.name] = known_files[entry.name]
+        except OSError as e:
+            self.logger.error_logs(f"{e} While Scanning {dir_path}")
+            return known_files
+        return files
+
+    @staticmethod
+    def _build_row(dir_path, file_name, size, mtime, ctime):
+        return {
+            "File Name": file_name,
+            "File Type": os.path.splitext(file_name)[1].lower(),
+            "File Size (Bytes)": size,
+            "File Size (Human Readable)": convert_bytes(size),
+            "Creation Date": datetime.fromtimestamp(ctime).strftime("%Y-%m-%d %H:%M:%S"),
+            "Modification Date": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S"),
+            "Source Folder": dir_path,
+        }
+
+    def rescan(self):
+        """
+        Walks the folder, descending into changed directories only, and patches the CSV.
+
+        Returns:
+            dict: Counts of "added", "removed", "modified" and "scanned_dirs" for this rescan.
+        """
+        previous_dirs = self._load_state()
+        current_dirs = {}
+        current_files = {}
+        changed_paths = set()
+        scanned_dirs = 0
+
+        stack = [self.folder]
+        while stack:
+            dir_path = stack.pop()
+            try:
+                dir_mtime = os.stat(dir_path).st_mtime
+            except OSError:
+                continue
+
+            snapshot = previous_dirs.get(dir_path)
+            old_files = snapshot["files"] if snapshot else {}
+            if snapshot and snapshot["mtime"] == dir_mtime:
+                # same entries as last time, but a file may have been rewritten in place
+                files, subdirs = self._restat_files(dir_path, old_files), snapshot["subdirs"]
+            else:
+                try:
+                    files, subdirs = self._list_directory(dir_path)
+                except OSError as e:
+                    self.logger.error_logs(f"{e} While Scanning {dir_path}")
+                    continue
+                scanned_dirs += 1
+            for name, info in files.items():
+                old = old_files.get(name)
+                if old is None or old[0] != info[0] or old[1] != info[1]:
+                    changed_paths.add(normalise_path(os.path.join(dir_path, name)))
+
+            current_dirs[dir_path] = {"mtime": dir_mtime, "files": files, "subdirs": subdirs}
+            for name, info in files.items():
+                current_files[normalise_path(os.path.join(dir_path, name))] = (dir_path, name, info)
+            stack.extend(subdirs)
+
+        rows = self._load_rows()
+        removed = [path for path in rows if path not in current_files]
+        to_write = {path for path in current_files if path not in rows} | (changed_paths & current_files.keys())
+        added = sum(1 for path in to_write if path not in rows)
+        modified = len(to_write) - added
+
+        if removed or modified or not os.path.exists(self.csv_path):
+            for path in removed:
+                rows.pop(path, None)
+            for path in to_write:
+                dir_path, name, (size, mtime, ctime) = current_files[path]
+                rows[path] = self._build_row(dir_path, name, size, mtime, ctime)
+            self._write_rows(rows.values(), mode="w")
+        elif to_write:
+            new_rows = []
+            for path in sorted(to_write):
+                dir_path, name, (size, mtime, ctime) = current_files[path]
+                new_rows.append(self._build_row(dir_path, name, size, mtime, ctime))
+            self._write_rows(new_rows, mode="a")
+
+        self._save_state(current_dirs)
+        changes = {"added": added, "removed": len(removed), "modified": modified, "scanned_dirs": scanned_dirs}
+        print(f"[Rescanned] {self.folder}: {changes}")
+        return changes
+
+    def _write_rows(self, rows, mode="w"):
+        ensure_folder_exists(os.path.dirname(self.csv_path))
+        if mode == "a":
+            with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=MEDIA_CSV_HEADER, extrasaction="ignore")
+                writer.writerows(rows)
+            return
+        temp_path = self.csv_path + ".temp"
+        with open(temp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=MEDIA_CSV_HEADER, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(temp_path, self.csv_path)
+
+
+def _walk_root(root, media_extensions, skip_names, skip_suffixes):
+    """Walks one root with os.scandir, returning its media files in a stable (sorted, depth-first) order."""
+    files = []
+    errors = []
+    stack = [root]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            errors.append(f"{e} While Scanning {dir_path}")
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.lower() in skip_names:
+                        continue
+                    if skip_suffixes and normalise_path(entry.path).lower().endswith(skip_suffixes):
+                        continue
+                    subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in media_extensions:
+                    files.append(entry.path)
+            except OSError as e:
+                errors.append(f"{e} While Scanning {entry.path}")
+        stack.extend(reversed(subdirs))
+    return files, errors
+
+
+def scan_roots(roots, media_extensions, skip_folders=(), max_workers=SCAN_WORKERS, progress_callback=None):
+    """
+    Walks several root folders concurrently and merges their media files.
+
+    Each root is walked on its own worker of a bounded thread pool, so roots on different
+    drives are scanned side by side instead of one after another. The merged list keeps the
+    order of the given roots, and each root's files are in sorted depth-first order, so the
+    result does not depend on which worker finishes first.
+
+    Args:
+        roots (list): Root folders to walk. Missing folders are skipped.
+        media_extensions (list): Extensions (with the leading dot) to keep.
+        skip_folders (set, optional): Folder names or trailing paths to skip. Defaults to none.
+        max_workers (int, optional): Maximum number of roots walked at once. Defaults to SCAN_WORKERS.
+        progress_callback (callable, optional): Called as progress_callback(root, file_count, done, total)
+            as each root finishes. Defaults to printing a line per root.
+
+    Returns:
+        list: Paths of the media files found under all roots.
+    """
+    extensions = {ext.lower() for ext in media_extensions}
+    skip_names = {item.lower() for item in skip_folders if "\\" not in item}
+    skip_suffixes = tuple("\\" + item.lower() for item in skip_folders if "\\" in item)
+    roots = [root for root in dict.fromkeys(roots) if os.path.isdir(root)]
+    if not roots:
+        return []
+
+    def report(root, count, done, elapsed):
+        if progress_callback is not None:
+            progress_callback(root, count, done, len(roots))
+        else:
+            print(f"[Scanned {done}/{len(roots)}] {root}: {count} files in {elapsed:.2f}s")
+
+    def walk(root):
+        start = time.perf_counter()
+        files, errors = _walk_root(root, extensions, skip_names, skip_suffixes)
+        return files, errors, time.perf_counter() - start
+
+    logger = LogManager(LOG_PATH)
+    results = {}
+    workers = max(1, min(max_workers, len(roots)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(walk, root): root for root in roots}
+        for done, future in enumerate(as_completed(futures), start=1):
+            root = futures[future]
+            try:
+                files, errors, elapsed = future.result()
+            except Exception as e:
+                print(f"An error occurred while scanning '{root}': {e}")
+                logger.error_logs(f"{e} While Retrieving {root}")
+                files, errors, elapsed = [], [], 0.0
+            for error in errors:
+                logger.error_logs(error)
+            results[root] = files
+            report(root, len(files), done, elapsed)
+
+    merged = []
+    for root in roots:
+        merged.extend(results.get(root, []))
+    return merged
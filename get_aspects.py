@@ -4,14 +4,20 @@ import os
 import json
 from logs_writer import LogManager
 from player_constants import STATS_LOG_PATH
+from probe_cache import get_probe_cache
 
 class VideoProcessor:
-    def __init__(self, video_files=None, max_workers=None):
+    def __init__(self, video_files=None, max_workers=None, probe_cache=None):
         self.video_files = video_files or []
         self.logger = LogManager(STATS_LOG_PATH)
         self.max_workers = max_workers or max(1, (os.cpu_count() or 4) - 4)
+        # ffprobe results are reused while a file's size and mtime are unchanged
+        self.cache = probe_cache or get_probe_cache()
 
     def is_video_vertical(self, video_file):
+        orientation = self.cache.get_orientation(video_file)
+        if orientation is not None:
+            return orientation == "Vertical"
         try:
             result = subprocess.run(
                 [
@@ -26,23 +32,41 @@ class VideoProcessor:
                 text=True
             )
             width, height = map(int, result.stdout.strip().split(','))
+            self.cache.set_orientation(video_file, "Vertical" if height > width else "Horizontal")
             return height > width
         except Exception as e:
             print(f"Error checking orientation for {video_file}: {e}")
             self.logger.error_logs(f"Error checking orientation for {video_file}: {e}")
             return False
 
+    def _get_orientations(self):
+        """Returns is_vertical for every video file, probing only the files missing from the cache."""
+        results = {}
+        to_probe = []
+        for file in self.video_files:
+            orientation = self.cache.get_orientation(file)
+            if orientation is None:
+                to_probe.append(file)
+            else:
+                results[file] = orientation == "Vertical"
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results.update(zip(to_probe, executor.map(self.is_video_vertical, to_probe)))
+            self.cache.save()
+        return [results[file] for file in self.video_files]
+
     def get_vertical_videos(self):
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            results = list(executor.map(self.is_video_vertical, self.video_files))
+        results = self._get_orientations()
         return [file for file, is_vertical in zip(self.video_files, results) if is_vertical]
 
     def get_horizontal_videos(self):
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            results = list(executor.map(self.is_video_vertical, self.video_files))
+        results = self._get_orientations()
         return [file for file, is_vertical in zip(self.video_files, results) if not is_vertical]
 
     def probe_video(self, video_file):
+        metadata = self.cache.get_metadata(video_file)
+        if metadata is not None:
+            return metadata
         try:
             result = subprocess.run(
                 [
@@ -94,7 +118,7 @@ class VideoProcessor:
             orientation = "Vertical" if height and width and height > width else "Horizontal"
             frame_rate_val = eval(frame_rate) if frame_rate and "/" in frame_rate else frame_rate
 
-            return {
+            metadata = {
                 "Duration (s)": duration,
                 "Resolution": resolution,
                 "Aspect Ratio": aspect_ratio,
@@ -110,6 +134,8 @@ class VideoProcessor:
                 "Audio Channels": channels,
                 "Audio Sample Rate": sample_rate,
             }
+            self.cache.set_metadata(video_file, metadata)
+            return metadata
 
         except Exception as e:
             print(f"Error probing {video_file}: {e}")
@@ -120,6 +146,7 @@ class VideoProcessor:
     def process_videos(self, video_files):
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             results = list(executor.map(self._process_single, video_files))
+        self.cache.save()
         return results
 
     def _process_single(self, video_file):
@@ -7,13 +7,20 @@ import threading
 import tkinter as tk
 from tkinter import Toplevel, filedialog, messagebox, ttk
 
+import numpy as np
+import pandas as pd
+
 import file_loader
 from deletion_manager import DeletionManager
 from favorites_manager import FavoritesManager
 from file_loader import VideoFileLoader
 from file_manager import FileManager
+from history_parsing import NAT, datetime_to_s, durations_seconds, parse_timestamps_s
 from get_aspects import VideoProcessor
+from stats_manager import VideoStatsManager
+from stats_query import StatsQueryError
 from image_player import ImageViewer
+from buffered_writer import flush_all
 from logs_writer import LogManager
 from player_constants import (
     Colors,
@@ -23,18 +30,26 @@ from player_constants import (
     LOG_PATH,
     REPORTS_FOLDER,
     SCREENSHOTS_FOLDER,
+    SEARCH_DEBOUNCE_MS,
+    SIZE_STAT_REFRESH,
+    TABLE_FILL_CHUNK_SIZE,
     WATCHED_HISTORY_LOG_PATH,
     DEMO_WATCHED_HISTORY,
     VIDEO_SNIPPETS_FOLDER,
 )
+from search_index import PathSearchIndex
 from settings_manager import SettingsWindow
-from static_methods import create_csv_file, ensure_folder_exists, gather_all_media, get_file_size, normalise_path
+from size_index import get_size_index
+from task_runner import TaskRunner
+from path_status import get_path_status
+from static_methods import create_csv_file, ensure_folder_exists, get_all_media_files, normalise_path
 from videoplayer import MediaPlayerApp
 
 import player_constants
 from media_dashboard import DashboardWindow
 from category_manager import CategoryManager
 from category_window import CategoryWindow
+from virtual_table import VirtualTable
 # from pprint import pprint
 # import cProfile
 
@@ -53,6 +68,11 @@ class FileExplorerApp:
         self.total_duration_watched = 0.0
         self.search_size = 0
         self.video_files = []
+        self.search_index = None
+        self._search_after_id = None
+        self._typed_search_text = ""
+        # searches and other slow queries run here, a new one cancels the one in flight
+        self.tasks = TaskRunner(self.root)
 
         ensure_folder_exists(FILES_FOLDER)
         ensure_folder_exists(SCREENSHOTS_FOLDER)
@@ -64,6 +84,7 @@ class FileExplorerApp:
         self.fav_manager = FavoritesManager()
         self.logger = LogManager(LOG_PATH)
         self.video_processor = VideoProcessor
+        self.stats_manager = None
         self.category_manager = CategoryManager()
         
         create_csv_file(["File Path", "Delete_Status", "File Size", "Modification Time"], DELETE_FILES_CSV)
@@ -82,6 +103,7 @@ class FileExplorerApp:
     def _keybinding(self):
         self.entry.bind('<Return>', self.on_enter_pressed)
         self.search_entry.bind('<Return>', self.on_search_pressed)
+        self.search_entry.bind('<KeyRelease>', self.on_search_typed)
         self.file_table.bind('<Double-1>', self.on_double_click)
 
         self.file_table.bind("<Button-3>", self.on_right_click)
@@ -107,22 +129,22 @@ class FileExplorerApp:
         self.file_table.bind('<Shift-KeyPress-A>', self.add_to_category)
 
     def get_selected_video(self):
-        selected_item = self.file_table.selection()
-        if not selected_item:
+        selected_rows = self.file_table.selected_rows()
+        if not selected_rows:
             messagebox.showinfo("No Selection", "Please select files to mark for deletion.")
             return -1
         file_path = []
-        for selection in selected_item:
-            file_path.append(self.file_table.item(selection, "values")[2])
+        for row in selected_rows:
+            file_path.append(row[2])
         return file_path
     
     def remove_from_favorites(self, event=None):
-        selected_items = self.file_table.selection()
+        selected_items = self.file_table.selected_rows()
         if not selected_items:
             messagebox.showinfo("No Selection", "Select a File To Remove from Favs.")
             return
-        for item in selected_items:
-            file_path = normalise_path(self.file_table.item(item, "values")[2])
+        for row in selected_items:
+            file_path = normalise_path(row[2])
             try:
                 if self.fav_manager.check_favorites(file_path):
                     self.fav_manager.delete_from_favorites(file_path)
@@ -135,7 +157,7 @@ class FileExplorerApp:
         messagebox.showinfo("File Removed From Favorites", f"{len(selected_items)} unfavorited successfully.")
 
     def add_to_favorites(self, event=None):
-        selected_items = self.file_table.selection()
+        selected_items = self.file_table.selected_rows()
         if not selected_items:
             messagebox.showinfo("No Selection", "Select a File To Add-To Favs.")
             return
@@ -144,8 +166,8 @@ class FileExplorerApp:
         if not confirm:
             return
         
-        for item in selected_items:
-            file_path = normalise_path(self.file_table.item(item, "values")[2])
+        for row in selected_items:
+            file_path = normalise_path(row[2])
             try:
                 if not self.fav_manager.check_favorites(file_path):
                     self.fav_manager.add_to_favorites(file_path)
@@ -166,7 +188,7 @@ class FileExplorerApp:
         # self.context_menu.add_command(label="Properties", command=self.show_properties)
 
     def move_selected_files(self, event=None):
-        selected_items = self.file_table.selection()
+        selected_items = self.file_table.selected_rows()
         if not selected_items:
             messagebox.showinfo("No Selection", "Please select files to move.")
             return
@@ -175,32 +197,52 @@ class FileExplorerApp:
         if not dest_folder:
             return
         file_manager = FileManager(parent_window=self.root)
-        for item in selected_items:
-            file_path = self.file_table.item(item, "values")[2]
+        row_paths = [(row, row[2]) for row in selected_items]
+        base_title = self.root.title()
+
+        def show_progress(progress):
+            text = (
+                f"{base_title} - Moving {progress['files_done']}/{progress['total_files']} "
+                f"({self.convert_bytes(progress['bytes_done'])}/{self.convert_bytes(progress['total_bytes'])}, "
+                f"{self.convert_bytes(progress['bytes_per_sec'])}/s)"
+            )
+            self.root.after(0, lambda: self.root.title(text))
+
+        def on_done(moved, error=None):
+            self.root.title(base_title)
+            if error is not None:
+                messagebox.showerror("Error", f"An error occurred: {error}")
+                return
+            failed = [file_path for row, file_path in row_paths if file_path not in moved]
+            self.file_table.remove_rows([row for row, file_path in row_paths if file_path in moved])
+            if self.search_index is not None:
+                self.search_index.move(moved)
+            if failed:
+                messagebox.showerror("Move Failed", "Failed to move file(s):\n" + "\n".join(failed[:10]))
+            messagebox.showinfo("Move Complete", f"{len(moved)} file(s) moved successfully.")
+
+        def worker():
             try:
-                if file_manager.move_file(file_path, dest_folder): 
-                    self.file_table.delete(item)
-                else:
-                    messagebox.showerror("Move Failed", f"Failed to move file: {file_path}")
+                # moves everything first, then updates each csv store once
+                # like the per-file moves it replaced, the explorer doesn't register or rescan the folders
+                moved = file_manager.move_files(
+                    [file_path for row, file_path in row_paths], dest_folder,
+                    progress_callback=show_progress, reload_folders=False,
+                )
+                self.root.after(0, lambda: on_done(moved))
             except Exception as e:
-                messagebox.showerror("Error", f"An error occurred: {e}")
+                self.root.after(0, lambda err=e: on_done({}, err))
 
-        messagebox.showinfo("Move Complete", f"{len(selected_items)} file(s) moved successfully.")
+        threading.Thread(target=worker, daemon=True).start()
         
     def treeview_sort_column(self, col, reverse):
-        data = [(self.file_table.set(k, col), k) for k in self.file_table.get_children('')]
-        try:
-            data.sort(key=lambda t: int(t[0]), reverse=reverse)
-        except ValueError:
-            data.sort(key=lambda t: t[0].lower(), reverse=reverse)
-        for index, (val, k) in enumerate(data):
-            self.file_table.move(k, '', index)
+        self.file_table.sort(col, reverse)
         self.file_table.heading(col, command=lambda: self.treeview_sort_column(col, not reverse))
 
 
     def delete_selected_files(self, direct_delete=False, event=None):
         """Marks selected files from the file table for deletion or deletes them directly."""
-        selected_items = self.file_table.selection()
+        selected_items = self.file_table.selected_rows()
         status = "ToDelete"
         if not selected_items:
             messagebox.showinfo("No Selection", "Please select files to mark for deletion.")
@@ -213,23 +255,24 @@ class FileExplorerApp:
         if not confirm:
             return
 
-        for item in selected_items:
-            file_path = self.file_table.item(item, "values")[2]
+        for row in selected_items:
+            file_path = row[2]
             self.deletion_manager.mark_for_deletion(file_path, status)
         
         # Not currently deleting files directly
         if direct_delete:
             self.deletion_manager.delete_files_in_csv(skip_confirmation=True)
+            self.drop_deleted_from_search()
         
         messagebox.showinfo("Deletion Marked", f"{len(selected_items)} file(s) marked for deletion.")
 
     def remove_from_deletion(self, file, event=None):
-        selected_items = self.file_table.selection()
+        selected_items = self.file_table.selected_rows()
         if not selected_items:
             messagebox.showinfo("No Selection", "Please select files to move.")
             return
-        for item in selected_items:
-            file_path = self.file_table.item(item, "values")[2]
+        for row in selected_items:
+            file_path = row[2]
             try:
                 self.deletion_manager.remove_from_deletion(file_path)      
             except Exception as e:
@@ -241,6 +284,7 @@ class FileExplorerApp:
         entry_text = self.entry.get().strip().lower()
         if entry_text == "show deletes":
             self.deletion_manager.delete_files_in_csv()
+            self.drop_deleted_from_search()
         else:
             self.update_entry_text("show deletes")
             self.show_deletes()
@@ -524,7 +568,8 @@ class FileExplorerApp:
         table_frame = tk.Frame(self.root, bg="black")
         table_frame.pack(side="top", fill="both", expand=True, padx=20, pady=(0, 10))
 
-        self.file_table = ttk.Treeview(
+        # only the rows on screen are Treeview items, the rest stay in file_table.rows
+        self.file_table = VirtualTable(
             table_frame, columns=("#", "File Name", "Folder Path"), show="headings", selectmode="extended"
         )
         self.file_table.heading("#", text="#", command=lambda: self.treeview_sort_column("#", False))
@@ -538,16 +583,11 @@ class FileExplorerApp:
         self.file_table.tag_configure("evenrow", background="#222", foreground="white")
         self.file_table.tag_configure("oddrow", background="#333", foreground="white")
 
-        self.file_table.pack(side="left", fill="both", expand=True)
-
         self.file_table.bind("<<TreeviewSelect>>", self.update_selected_files_label)
-
-        self.scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.file_table.yview)
-        self.scrollbar.pack(side="right", fill="y")
-        self.file_table.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar = self.file_table.scrollbar
 
     def update_selected_files_label(self, event=None):
-        selected_count = len(self.file_table.selection())
+        selected_count = len(self.file_table.selected_rows())
         self.selected_files_label.config(text=f"Selected: {selected_count}")
 
     def show_info(self):
@@ -587,6 +627,9 @@ class FileExplorerApp:
             "• Enter a folder path Or Browse it using '📁' and click 'Get' to list media files.\n"
             "• You can enter multiple folder paths separated by commas.\n"
             "• Use 'Search' to filter files by name.\n"
+            "• Start a search with '?' to filter by video stats, e.g.\n"
+            "    ?duration>10m and codec=h264 and orientation=Vertical\n"
+            "    (fields: orientation, codec, format, audio, resolution, duration, bitrate, fps)\n"
             "• Use '🔼' to search only in the top-level folder.\n"
             "• Use '★' and'Snaps' to view favorite files and screenshots taken respectively.\n"
             "• Double-click/Enter a file to play it.\n"
@@ -631,12 +674,12 @@ class FileExplorerApp:
             # Refresh selected folders if any, else refresh all folders in the table
             if not hasattr(self, "folders") or not self.folders:
                 self.show_paths()
-            selected_items = self.file_table.selection()
+            selected_items = self.file_table.selected_rows()
             if selected_items:
                 # Get selected folder paths from the table
                 folder_paths = []
-                for item in selected_items:
-                    folder_path = self.file_table.item(item, "values")[1]
+                for row in selected_items:
+                    folder_path = row[1]
                     folder_paths.append(folder_path.strip())
                 msg = f"Refreshed {len(folder_paths)} selected folder(s)."
             else:
@@ -653,39 +696,30 @@ class FileExplorerApp:
 
     def show_all_media(self):
         """Gathers all media and displays File Name and Source Folder in the table."""
-        csv_path = gather_all_media()
-        if not csv_path:
-            messagebox.showerror("Error", "Failed to gather all media.")
-            return
-
         self.reset_search_option()
 
-        file_list = set()
-        total_size_bytes = 0
-        try:
-            with open(csv_path, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for idx, row in enumerate(reader):
-                    file_name = row.get("File Name", "")
-                    source_folder = row.get("Source Folder", "")
-                    file_path = os.path.join(source_folder, file_name)
-                    if os.path.exists(file_path) and source_folder:
-                        file_list.add(file_path)
-                        size_str = row.get("File Size (Bytes)", "0")
-                        try:
-                            total_size_bytes += int(size_str)
-                        except (ValueError, TypeError):
-                            pass
-            self.video_files = list(file_list)
-            # print(f"Some Files {file_list[:3]}")
-            self.insert_to_table(self.file_path_tuple(file_list))
-            self.total_files = len(file_list)
+        def load(task):
+            media_files = get_all_media_files()
+            if media_files is None:
+                return None
+            sizes = dict(media_files)
+            video_files = self.existing_files(task, list(sizes))
+            total_size_bytes = sum(sizes[file_path] for file_path in video_files)
+            self.stream_to_table(task, self.file_path_tuple(video_files))
+            return video_files, total_size_bytes
+
+        def on_done(result):
+            if result is None:
+                messagebox.showerror("Error", "Failed to gather all media.")
+                return
+            self.video_files, total_size_bytes = result
+            self.total_files = len(self.video_files)
             self.total_size = self.convert_bytes(total_size_bytes)
             self.update_stats()
             self.update_entry_text("All Media Files")
-            messagebox.showinfo("All Media", f"Total media files found: {len(file_list)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load all media: {e}")
+            messagebox.showinfo("All Media", f"Total media files found: {len(self.video_files)}")
+
+        self.tasks.run(load, on_done, on_error=lambda e: messagebox.showerror("Error", f"Failed to load all media: {e}"))
 
     def open_media_stats(self):
         """Open the media stats window."""
@@ -695,6 +729,7 @@ class FileExplorerApp:
             stats_window = tk.Toplevel(self.root)
             stats_window.lift()
             stats_window.focus_force()
+            flush_all()  # rows logged by an open player may still be queued
             app = DashboardWindow(stats_window, WATCHED_HISTORY_LOG_PATH)
             # app = DashboardWindow(stats_window, DEMO_WATCHED_HISTORY)
             self._set_styles()
@@ -739,33 +774,57 @@ class FileExplorerApp:
         Args:
             files (list|tuple): List of tuples containing file name and file path.
         """
-        self.file_table.delete(*self.file_table.get_children())
-        for idx, (file, file_path) in enumerate(files):
-            tags = ("evenrow",) if idx % 2 == 0 else ("oddrow",)  # Apply alternate colors to rows
-            self.file_table.insert("", tk.END, values=(idx, file, file_path), tags=tags)
+        self.tasks.cancel()  # a query still in flight must not overwrite these rows
+        self.file_table.set_rows((idx, file, file_path) for idx, (file, file_path) in enumerate(files))
 
-    def filter_existing_files(self, file_list, callback):
-        """Filter files that exist and call the callback with the result."""
-        def worker():
-            existing = [f for f in file_list if os.path.exists(f)]
-            self.root.after(0, lambda: callback(existing))
-        threading.Thread(target=worker, daemon=True).start()
+    def stream_to_table(self, task, files):
+        """
+        Fills the table from a background task, TABLE_FILL_CHUNK_SIZE rows per Tk callback.
+        Args:
+            task (Task): The running task; nothing more is shown once it is cancelled.
+            files (list): List of tuples containing file name and file path.
+        """
+        for start in range(0, len(files) or 1, TABLE_FILL_CHUNK_SIZE):
+            task.check()
+            chunk = files[start:start + TABLE_FILL_CHUNK_SIZE]
+            rows = [(idx, file, file_path) for idx, (file, file_path) in enumerate(chunk, start)]
+            task.post(self.file_table.set_rows if start == 0 else self.file_table.extend_rows, rows)
 
-    def on_enter_pressed(self, event=None):
+    @staticmethod
+    def existing_files(task, file_list):
+        """Returns the files of file_list that exist, checking task for cancellation between chunks."""
+        path_status = get_path_status()
+        existing = []
+        for start in range(0, len(file_list), TABLE_FILL_CHUNK_SIZE):
+            task.check()
+            existing.extend(path_status.filter_existing(file_list[start:start + TABLE_FILL_CHUNK_SIZE]))
+        return existing
+
+    def on_enter_pressed(self, event=None, on_loaded=None):
+        """
+        Loads the folder or runs the command typed in the entry box.
+        Args:
+            on_loaded (callable, optional): Called once the table holds the loaded files.
+        """
         folder_path_string = self.entry.get()
         vf_loader = VideoFileLoader()
         self.reset_search_option()
         try:
             if folder_path_string == "play favs":
                 favs = FavoritesManager()
-                all_favs = favs.get_favorites()
-                def after_filter(existing_files):
-                    self.video_files = sorted(existing_files)
+                def load_favs(task):
+                    video_files = sorted(self.existing_files(task, favs.get_favorites()))
+                    self.stream_to_table(task, self.file_path_tuple(video_files))
+                    # summed over the favorites that exist, now that their folders are listed
+                    return video_files, get_size_index().total_size(video_files)
+                def after_load(result):
+                    self.video_files, total_size = result
                     self.total_files = len(self.video_files)
-                    self.total_size = self.convert_bytes(favs.total_size)
+                    self.total_size = self.convert_bytes(total_size)
                     self.update_stats()
-                    self.insert_to_table(self.file_path_tuple(self.video_files))
-                self.filter_existing_files(all_favs, after_filter)
+                    if on_loaded is not None:
+                        on_loaded()
+                self.tasks.run(load_favs, after_load)
                 return
             
             elif folder_path_string == "show paths":
@@ -778,10 +837,20 @@ class FileExplorerApp:
                 self.show_deletes(deleted=True)
 
             elif folder_path_string == "show history":
-                self.video_files = self.get_history_files()
-                self.total_files = len(self.video_files)
-                self.update_stats()
-                self.total_duration_watched = 0
+                def load_history(task):
+                    video_files = self.get_history_files()
+                    self.stream_to_table(task, sorted(self.file_path_tuple(video_files)))
+                    return video_files
+                def after_load(video_files):
+                    self.video_files = video_files
+                    self.total_files = len(self.video_files)
+                    self.update_stats()
+                    self.total_duration_watched = 0
+                    print(f"Total Videos Found: {len(self.video_files)}")
+                    if on_loaded is not None:
+                        on_loaded()
+                self.tasks.run(load_history, after_load, on_error=lambda e: print(f"An Unknown Error Occurred {e}"))
+                return
 
             elif folder_path_string == "show categories":
                 self.show_categories()
@@ -809,19 +878,24 @@ class FileExplorerApp:
         elif self.play_category:
             print(f"Total Categories: {self.total_files}")
             # self.insert_to_table_custom(self.categories)
+        if on_loaded is not None:
+            on_loaded()
 
     def show_paths(self):
         """Show only those folder/csv pairs where both the folder and the CSV file exist."""
         self.reset_search_option(folder=True)
-        valid_folders = []
+        pairs = []
         try:
             with open(FOLDER_LOGS, "r", encoding="utf-8") as file:
                 reader = csv.DictReader(file)
                 for row in reader:
-                    folder_path = normalise_path(row["Folder Path"])
-                    csv_path = normalise_path(row["Csv Path"])
-                    if os.path.isdir(folder_path) and os.path.isfile(csv_path):
-                        valid_folders.append((folder_path, csv_path))
+                    pairs.append((normalise_path(row["Folder Path"]), normalise_path(row["Csv Path"])))
+            statuses = get_path_status().statuses([path for pair in pairs for path in pair])
+            valid_folders = []
+            for i, pair in enumerate(pairs):
+                folder_status, csv_status = statuses[2 * i], statuses[2 * i + 1]
+                if folder_status is not None and folder_status[0] and csv_status is not None and not csv_status[0]:
+                    valid_folders.append(pair)
             self.folders = list(set(valid_folders))
             # self.video_files = []
             # self.insert_to_table(sorted(self.folders))
@@ -839,13 +913,13 @@ class FileExplorerApp:
     def on_right_click(self, event):
         """ Handle right-click to open context menu """
         # Check if the file is already selected
-        item = self.file_table.identify_row(event.y)
+        row = self.file_table.row_at(event.y)
         
-        if item not in self.file_table.selection():
+        if row is not None and not self.file_table.is_selected(row):
             # If the item is not part of the current selection, keep the old selection
-            self.file_table.selection_set(item)
+            self.file_table.select_row(row)
 
-        self.selected_item = item
+        self.selected_item = row
         try:
             self.context_menu.post(event.x_root, event.y_root)
         except IndexError:
@@ -885,37 +959,108 @@ class FileExplorerApp:
         self.total_size = self.convert_bytes(self.total_size)
         return delete_files
 
-    def on_search_pressed(self, event=None):
+    def get_search_index(self, files):
+        """Returns the search index of files, building it if files is a new result set."""
+        if self.search_index is None or self.search_index.source is not files:
+            self.search_index = PathSearchIndex(files)
+        return self.search_index
+
+    def drop_deleted_from_search(self):
+        """Removes the files the DeletionManager has deleted from the search index."""
+        if self.search_index is None:
+            return
+        deleted = [path for path, metadata in self.deletion_manager.read_csv_file().items() if metadata['status'] == "Deleted"]
+        self.search_index.remove(deleted)
+
+    def on_search_typed(self, event=None):
+        """Searches once typing pauses for SEARCH_DEBOUNCE_MS."""
+        if event is not None and event.keysym in ("Return", "Escape", "Tab"):
+            return
+        # arrows, Shift, Ctrl and the like don't change the text
+        text = self.search_entry.get()
+        if text == self._typed_search_text:
+            return
+        self._typed_search_text = text
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, lambda: self.on_search_pressed(live=True))
+
+    def on_search_pressed(self, event=None, live=False):
+        """
+        Filters the table to the files containing every word of the search box.
+
+        Args:
+            live (bool, optional): Search-as-you-type; skips stats queries and the
+                per-file search size, which run when Enter is pressed. Defaults to False.
+        """
+        self._search_after_id = None
+        if self.search_entry.get().startswith("?"):
+            if not live:
+                self.filter_by_stats(self.search_entry.get()[1:])
+            return
         query = self.search_entry.get().lower()
-        self.file_table.delete(*self.file_table.get_children())
-        file_list = []
         try:
             search_files = self.image_files if self.play_images else self.video_files
-            top_level_only = getattr(self, "top_level_only_on", False)
-            folder_input = normalise_path(self.entry.get()).rstrip("\\/")
-            for file in search_files:
+        except AttributeError as e:
+            print("No videos found to search from.")
+            print(f"An Exception is raised {e}")
+            messagebox.showerror("Attribute Error", f"Error in Search Pressed: {e}")
+            return
+        top_level_only = getattr(self, "top_level_only_on", False)
+        folder_input = normalise_path(self.entry.get()).rstrip("\\/")
+        size_wanted = not live and not (query == '' and not top_level_only) and not self.entry.get() in ["show deleted"]
+        search_index = self.get_search_index(search_files)
+
+        def search(task):
+            file_list = []
+            # results come back sorted by (file name, path)
+            for i, file in enumerate(search_index.search(query)):
+                if i % TABLE_FILL_CHUNK_SIZE == 0:
+                    task.check()
                 if top_level_only:
                     if os.path.dirname(normalise_path(file)).rstrip("\\/") != folder_input:
                         continue
-                if query in file.lower():
-                    file_name = os.path.basename(file)
-                    file_list.append((file_name, file))
-            print(f"Total Files for {query}: {len(file_list)}")
+                file_list.append((os.path.basename(file), file))
+            search_size = self.get_search_size([file[1] for file in file_list]) if size_wanted else None
+            self.stream_to_table(task, file_list)
+            return len(file_list), search_size
+
+        def on_done(result):
+            total_results, search_size = result
+            if not live:
+                print(f"Total Files for {query}: {total_results}")
             if query == '' and not top_level_only:
                 self.search_size = self.total_size
-            elif not self.entry.get() in ["show deleted"]:
-                self.update_search_size([file[1] for file in file_list])
-            self.total_search_results = len(file_list)
+            elif search_size is not None:
+                self.search_size = search_size
+            self.total_search_results = total_results
             self.update_stats()
-            self.insert_to_table(sorted(file_list))
-        except AttributeError as e:
-            print("No videos found to search from.")
-            print(f"An Exception is raised {e}")
-            messagebox.showerror("Attribute Error", f"Error in Search Pressed: {e}")
-        except Exception as e:
+
+        def on_error(e):
             print(f"An Error {e} Occurred")
             messagebox.showerror("Error", f"Exception in Search Pressed: {e}")
 
+        self.tasks.run(search, on_done, on_error)
+
+    def filter_by_stats(self, expression):
+        """Filters the table with a stats query (e.g. "duration>10m and codec=h264") using Video_Stats, without ffprobe."""
+        try:
+            if self.stats_manager is None:
+                self.stats_manager = VideoStatsManager()
+            files = self.stats_manager.query(expression, self.get_files_from_table())
+        except StatsQueryError as e:
+            messagebox.showerror("Invalid Query", f"{e}\n\nExample: ?duration>10m and codec=h264 and orientation=Vertical")
+            return
+        except Exception as e:
+            print(f"An Error {e} Occurred")
+            messagebox.showerror("Error", f"Exception in Stats Query: {e}")
+            return
+        print(f"Total Files for {expression}: {len(files)}")
+        self.total_search_results = len(files)
+        self.update_search_size(files)
+        self.update_stats()
+        self.insert_to_table(self.file_path_tuple(files))
+
     def on_filter_fav(self, event=None):
         files = self.get_files_from_table()
         favs = self.fav_manager
@@ -951,11 +1096,11 @@ class FileExplorerApp:
 
     def on_double_click(self, event=None):
         try:
-            item = self.file_table.selection()[0]
-            file_path = self.file_table.item(item, "values")[2]
+            row = self.file_table.selected_rows()[0]
+            file_path = row[2]
             
             if self.play_folder:
-                folder_path = self.file_table.item(item, "values")[1]
+                folder_path = row[1]
                 vf_load = VideoFileLoader()
                 self.video_files = vf_load.start_here(file_path)
                 self.total_size = self.convert_bytes(vf_load.total_size_in_bytes)
@@ -968,10 +1113,10 @@ class FileExplorerApp:
             
             elif self.play_category:
                 # Get files for the selected category
-                category_name = self.file_table.item(item, "values")[2]
+                category_name = row[2]
                 files = self.category_manager.get_category_files(category_name)
                 existing_files = [f for f in files if os.path.exists(f)]
-                total_size = sum(get_file_size(f) for f in existing_files)
+                total_size = get_size_index().total_size(existing_files)
                 
                 self.video_files = existing_files
                 self.total_files = len(existing_files)
@@ -1012,47 +1157,51 @@ class FileExplorerApp:
             messagebox.showerror("Error", f"{e}")
 
     def update_search_size(self, file_list):
-        self.search_size = 0
-        size = 0
-        for file in file_list:
-             size += get_file_size(file)
+        self.search_size = self.get_search_size(file_list)
 
-        self.search_size = self.convert_bytes(size)
+    def get_search_size(self, file_list):
+        """Returns the total size of file_list as a string; safe to call off the Tk thread."""
+        size_index = get_size_index()
+        size = size_index.total_size(file_list)
+        if SIZE_STAT_REFRESH:
+            size_index.refresh(file_list)
+        return self.convert_bytes(size)
 
     def get_verticals(self):
-        try:
-            file_list = self.get_files_from_table()
-            # pprint(file_list)
-            # video_processor = VideoProcessor(file_list)
-            video_processor = self.video_processor(file_list)
-            verticals = video_processor.get_vertical_videos()
-            print(f"Total Verticals Files: {len(verticals)}")
-            self.total_search_results = len(verticals)
-            self.update_search_size(verticals)
-            self.update_stats()
-            self.insert_to_table(self.file_path_tuple(sorted(verticals)))
-            messagebox.showinfo("Total Files Found", f"Total Vertical Videos Found: {self.total_search_results}")
-        except Exception as e:
-            print(f"An Error {e} Occurred")
-            messagebox.showerror("Error", f"Exception in Getting Vertical Pressed: {e}")
+        self.filter_by_orientation(vertical=True)
 
     def get_horizontals(self):
-        try:
-            file_list = self.get_files_from_table()
+        self.filter_by_orientation(vertical=False)
+
+    def filter_by_orientation(self, vertical):
+        """Keeps the vertical (or horizontal) videos of the table, probing them on the task runner."""
+        file_list = self.get_files_from_table()
+        label = "Vertical" if vertical else "Horizontal"
+
+        def probe(task):
             video_processor = self.video_processor(file_list)
-            horizontals = video_processor.get_horizontal_videos()
-            print(f"Total Verticals Files: {len(horizontals)}")
-            self.total_search_results = len(horizontals)
-            self.update_search_size(horizontals)
+            found = video_processor.get_vertical_videos() if vertical else video_processor.get_horizontal_videos()
+            task.check()
+            search_size = self.get_search_size(found)
+            self.stream_to_table(task, self.file_path_tuple(sorted(found)))
+            return len(found), search_size
+
+        def on_done(result):
+            self.total_search_results, self.search_size = result
+            print(f"Total {label}s Files: {self.total_search_results}")
             self.update_stats()
-            self.insert_to_table(self.file_path_tuple(sorted(horizontals)))
-            messagebox.showinfo("Total Files Found", f"Total Vertical Videos Found: {self.total_search_results}")
-        except Exception as e:
+            messagebox.showinfo("Total Files Found", f"Total {label} Videos Found: {self.total_search_results}")
+
+        def on_error(e):
             print(f"An Error {e} Occurred")
-            messagebox.showerror("Error", f"Exception in Getting Vertical Pressed: {e}")
+            messagebox.showerror("Error", f"Exception in Getting {label} Pressed: {e}")
+
+        self.tasks.run(probe, on_done, on_error)
 
     def random_play(self, event=None):
-        self.on_enter_pressed()
+        self.on_enter_pressed(on_loaded=self._play_table_files)
+
+    def _play_table_files(self):
         self.files = sorted(self.get_files_from_table())
         if self.files:
             # self.root.wm_attributes("-disabled", True)
@@ -1070,85 +1219,40 @@ class FileExplorerApp:
 
     def get_history_files(self, days=30):
         file_path = WATCHED_HISTORY_LOG_PATH
+        flush_all()  # rows logged by an open player may still be queued
         thirty_days_ago = datetime.now() - timedelta(days=days)
         
-        unique_file_names = set()
-        self.total_duration_watched = 0
-        row_count = 0
-        
-        with open(file_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            
-            for row in reader:
-                row_count += 1
-                
-                # Parse the date from the 'Date Watched' column
-                try:
-                    date_watched = datetime.strptime(row['Date Watched'], '%Y-%m-%d %H:%M:%S')  # Adjust format if needed
-                except ValueError:
-                    print(f"Warning: Invalid date format in row {row_count}. Skipping.")
-                    continue
-                
-                # Only calculate for rows watched within the last 'days' days
-                if date_watched >= thirty_days_ago:
-                    # Parse and accumulate the duration watched in seconds
-                    try:
-                        duration_watched = self.calculate_duration_in_seconds(row['Duration Watched'])
-                        self.total_duration_watched += duration_watched
-                    except ValueError:
-                        print(f"Warning: Invalid duration format in row {row_count}. Skipping.")
-                        continue
-                    
-                    unique_file_names.add(row['File Name'])
-                
-                # Show Progrees every 1000 rows
-                if row_count % 1000 == 0:
-                    print(f"Processed {row_count} rows...")
+        # the columns are parsed in one pass each instead of per row
+        history = pd.read_csv(file_path, usecols=["File Name", "Date Watched", "Duration Watched"], dtype=str, keep_default_na=False)
+        row_count = len(history)
+        watched_at = parse_timestamps_s(history["Date Watched"])
+        seconds = durations_seconds(history["Duration Watched"])
+
+        invalid_dates = int((watched_at == NAT).sum())
+        if invalid_dates:
+            print(f"Warning: Skipped {invalid_dates} row(s) with an invalid date format.")
+        recent = (watched_at != NAT) & (watched_at >= datetime_to_s(thirty_days_ago))
+        invalid_durations = int((recent & np.isnan(seconds)).sum())
+        if invalid_durations:
+            print(f"Warning: Skipped {invalid_durations} row(s) with an invalid duration format.")
+        recent &= ~np.isnan(seconds)
+
+        self.total_duration_watched = float(seconds[recent].sum())
+        unique_file_names = set(history["File Name"].to_numpy()[recent])
 
-        
         self.total_duration_watched = round(self.total_duration_watched / 3600, 2)
         print(f"Total rows processed: {row_count}")
         print(f"Total duration watched in the last {days} days: {self.total_duration_watched:.2f} hours")
         
         return unique_file_names
 
-    def calculate_duration_in_seconds(self, duration_str):
-        """
-        Convert a duration string (e.g., '00:10.8' or '00:00:10.8') to seconds.
-        """
-        if '.' in duration_str:
-            duration_parts = duration_str.split('.')
-            if ':' in duration_parts[0]:
-                # case for format HH:MM:SS.microseconds
-                time_part = datetime.strptime(duration_parts[0], '%H:%M:%S')
-            else:
-                # case for format MM:SS.microseconds
-                time_part = datetime.strptime(duration_parts[0], '%M:%S')
-            
-            seconds = time_part.hour * 3600 + time_part.minute * 60 + time_part.second + float(f"0.{duration_parts[1]}")
-        else:
-            if ':' in duration_str:
-                # case for format HH:MM:SS
-                time_part = datetime.strptime(duration_str, '%H:%M:%S')
-            else:
-                # case for format MM:SS
-                time_part = datetime.strptime(duration_str, '%M:%S')
-            
-            seconds = time_part.hour * 3600 + time_part.minute * 60 + time_part.second
-        
-        return seconds
-        
-
     def get_files_from_table(self):
         """
         Get file paths from the file_table.
         Returns a list of file paths.
         """
-        file_paths = []
-        for item in self.file_table.get_children():
-            file_path = self.file_table.item(item, "values")[2]
-            file_paths.append(file_path)
-        return file_paths
+        # read from the table's row list, which also holds the rows that aren't rendered
+        return [row[2] for row in self.file_table.rows]
     
     
     def display_caps(self):
@@ -1159,13 +1263,13 @@ class FileExplorerApp:
 
     def add_to_category(self, event=None):
         """Open category manager for selected files."""
-        selected_items = self.file_table.selection()
+        selected_items = self.file_table.selected_rows()
         if not selected_items:
             messagebox.showinfo("No Selection", "Please select files to add to a category.")
             return
         selected_files = []
-        for item in selected_items:
-            file_path = self.file_table.item(item, "values")[2]
+        for row in selected_items:
+            file_path = row[2]
             selected_files.append(file_path)
 
         category_window = CategoryWindow(self.root, selected_files)
@@ -1178,14 +1282,14 @@ class FileExplorerApp:
         self.reset_search_option(category=True)
         self.play_category = True
         categories = self.category_manager.get_all_categories()
-        self.file_table.delete(*self.file_table.get_children())
+        self.file_table.clear()
         
         category_files = []
         total_size = 0
         for category in sorted(categories):
             files = self.category_manager.get_category_files(category)
             # size = sum(get_file_size(f) for f in files if os.path.exists(f))
-            size = sum(get_file_size(f) for f in files)
+            size = get_size_index().total_size(files)
             total_size += size
             category_files.append((f"Contains {len(files)} Files", category))  # Using category as path for double-click handling
 
@@ -1198,8 +1302,7 @@ class FileExplorerApp:
         self.update_entry_text("show categories")
 
     def insert_to_table_custom(self, files: list|tuple):
-        for file in files:
-            self.file_table.insert("", "end", values=(file[0], file[1], file[2]))
+        self.file_table.extend_rows((file[0], file[1], file[2]) for file in files)
 
 def run_app():
     root = tk.Tk()
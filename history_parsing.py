@@ -0,0 +1,125 @@
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min  # marks an unparsable value in the int64 results
+HISTORY_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _as_strings(values):
+    return pd.Series(values, dtype=object).astype("string").str.strip()
+
+
+def _parse_clean_durations_ms(values):
+    # splits on the last two ":" with numpy string ops; raises ValueError on anything unexpected
+    strings = np.asarray(values, dtype=str)
+    if strings.size == 0:
+        return np.empty(0, dtype=np.int64)
+    head, _, seconds = np.char.rpartition(strings, ":").T
+    hours, _, minutes = np.char.rpartition(head, ":").T
+    hours = np.where(hours == "", "0", hours)
+    total = hours.astype(np.int64) * 3600 + minutes.astype(np.int64) * 60 + seconds.astype(np.float64)
+    return np.rint(total * 1000).astype(np.int64)
+
+
+def parse_durations_ms(values):
+    """
+    Parses a whole column of watch durations to int64 milliseconds in one pass.
+
+    Accepts the formats written to Watched_History.csv: "H:MM:SS.fff" (str(timedelta)),
+    "MM:SS.f", "H:MM:SS" and "1 day, H:MM:SS.fff".
+
+    Args:
+        values (iterable): Duration strings.
+
+    Returns:
+        numpy.ndarray: int64 milliseconds, NAT where a value could not be parsed.
+    """
+    try:
+        return _parse_clean_durations_ms(values)
+    except ValueError:
+        pass
+    # slower path for columns with blanks, day counts or junk
+    durations = _as_strings(values)
+    # "MM:SS.f" has no hours, which to_timedelta would read as "HH:MM"
+    durations = durations.mask(durations.str.count(":") == 1, "0:" + durations)
+    durations = durations.str.replace(r"(\d+) days?, ", r"\1 days ", regex=True)
+    parsed = pd.to_timedelta(durations, errors="coerce")
+    return parsed.to_numpy(dtype="timedelta64[ms]").view(np.int64)
+
+
+def parse_timestamps_s(values, date_format=HISTORY_DATE_FORMAT):
+    """
+    Parses a whole column of "Date Watched" values to int64 seconds in one pass.
+
+    The naive local times are stored as if they were UTC, so the values round-trip
+    through datetime64[s] without any timezone shift.
+
+    Returns:
+        numpy.ndarray: int64 seconds, NAT where a value could not be parsed.
+    """
+    parsed = pd.to_datetime(_as_strings(values), format=date_format, errors="coerce")
+    return parsed.to_numpy(dtype="datetime64[s]").view(np.int64)
+
+
+def durations_seconds(values):
+    """Parses a column of durations to float seconds, NaN where a value could not be parsed."""
+    milliseconds = parse_durations_ms(values)
+    seconds = milliseconds / 1000.0
+    seconds[milliseconds == NAT] = np.nan
+    return seconds
+
+
+def datetime_to_s(value):
+    """Converts a naive datetime to the int64 seconds used by parse_timestamps_s."""
+    return int((value - _EPOCH).total_seconds())
+
+
+def s_to_datetime(seconds):
+    """Converts int64 seconds from parse_timestamps_s back to a naive datetime, None for NAT."""
+    return None if seconds == NAT else _EPOCH + timedelta(seconds=int(seconds))
+
+
+def _rowwise_duration_seconds(duration_str):
+    # the per-row strptime parsing this module replaces, kept for the benchmark
+    if '.' in duration_str:
+        duration_parts = duration_str.split('.')
+        time_format = '%H:%M:%S' if duration_parts[0].count(':') == 2 else '%M:%S'
+        time_part = datetime.strptime(duration_parts[0], time_format)
+        return time_part.hour * 3600 + time_part.minute * 60 + time_part.second + float(f"0.{duration_parts[1]}")
+    time_part = datetime.strptime(duration_str, '%H:%M:%S' if duration_str.count(':') == 2 else '%M:%S')
+    return time_part.hour * 3600 + time_part.minute * 60 + time_part.second
+
+
+def benchmark(rows=1_000_000):
+    """Times row-by-row strptime parsing against the vectorized parsers on a synthetic history."""
+    rng = np.random.default_rng(0)
+    seconds = rng.integers(0, 3 * 3600, rows)
+    millis = rng.integers(0, 1000, rows)
+    durations = [
+        f"{s // 3600}:{s // 60 % 60:02}:{s % 60:02}.{ms:03}" if i % 2 else f"{s // 60 % 60:02}:{s % 60:02}.{ms // 100}"
+        for i, (s, ms) in enumerate(zip(seconds.tolist(), millis.tolist()))
+    ]
+    stamps = pd.to_datetime(rng.integers(1.5e9, 1.8e9, rows), unit="s").strftime(HISTORY_DATE_FORMAT).tolist()
+
+    start = time.perf_counter()
+    expected = [_rowwise_duration_seconds(d) for d in durations]
+    [datetime.strptime(d, HISTORY_DATE_FORMAT) for d in stamps]
+    rowwise = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = durations_seconds(durations)
+    parse_timestamps_s(stamps)
+    vectorized = time.perf_counter() - start
+
+    assert np.allclose(parsed, expected), "vectorized durations differ from the row-wise parser"
+    print(f"{rows:,} rows: row-wise {rowwise:.2f}s, vectorized {vectorized:.2f}s ({rowwise / vectorized:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -4,6 +4,7 @@ from tkinter import *
 # from tkinter import messagebox
 from custom_messagebox import *
 from PIL import Image, ImageTk
+from thumbnail_cache import get_thumbnail_cache
 
 
 class ImageViewer:
@@ -20,6 +21,12 @@ class ImageViewer:
         self.total_files = len(image_files)
         self.icommand = "Forward"
         self.original_image = None
+        self.full_size = None
+        self._full_image = None
+        self._rotated = None
+        self.thumbnail_cache = get_thumbnail_cache()
+        # images are decoded once at screen size; the full image is only read when zoomed in past it
+        self.preview_size = (master.winfo_screenwidth(), master.winfo_screenheight())
         self.fullscreen = fullscreen
         self.master.attributes("-fullscreen", self.fullscreen)
 
@@ -80,11 +87,17 @@ class ImageViewer:
         def worker():
             try:
                 image_path = self.image_files[self.current_index]
-                img = Image.open(image_path)
-
-                self.original_image = img.copy()
+                preview = self.thumbnail_cache.get_preview(image_path, self.preview_size)
+                with Image.open(image_path) as img:
+                    full_size = img.size
+
+                self.original_image = preview
+                self.full_size = full_size
+                self._full_image = None
+                self._rotated = None
                 self.scale_factor = 1.0
                 self.rotation_angle = 0
+                self._prefetch_neighbour()
 
                 self.canvas.after(0, self.display_image)
             except Exception as e:
@@ -98,11 +111,29 @@ class ImageViewer:
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def _prefetch_neighbour(self):
+        step = -1 if self.icommand == "Backward" else 1
+        neighbour = self.current_index + step
+        if 0 <= neighbour < len(self.image_files):
+            self.thumbnail_cache.submit("get_preview", self.image_files[neighbour], self.preview_size)
+
+    def _rotated_image(self, source):
+        # rotating is only redone when the angle or the source image changes, not on every zoom step
+        if self._rotated is None or self._rotated[0] is not source or self._rotated[1] != self.rotation_angle:
+            image = source.rotate(self.rotation_angle, expand=True) if self.rotation_angle != 0 else source
+            self._rotated = (source, self.rotation_angle, image)
+        return self._rotated[2]
+
+    def _load_full_image(self):
+        if self._full_image is None:
+            with Image.open(self.image_files[self.current_index]) as img:
+                img.load()
+                self._full_image = img
+        return self._full_image
+
     def display_image(self):
         try:
-            image = self.original_image.copy()
-            if self.rotation_angle != 0:
-                image = image.rotate(self.rotation_angle, expand=True)
+            image = self._rotated_image(self.original_image)
 
             canvas_width = self.canvas.winfo_width()
             canvas_height = self.canvas.winfo_height()
@@ -119,6 +150,9 @@ class ImageViewer:
             final_width = int(fit_width * self.scale_factor)
             final_height = int(fit_height * self.scale_factor)
 
+            if (final_width > image.width or final_height > image.height) and self.original_image.size != self.full_size:
+                image = self._rotated_image(self._load_full_image())
+
             if final_width > 0 and final_height > 0:
                 image = image.resize((final_width, final_height), Image.Resampling.LANCZOS)
                 self.photo = ImageTk.PhotoImage(image)
@@ -1,5 +1,7 @@
 import datetime
 
+from buffered_writer import get_writer
+
 class LogManager:
     def __init__(self, log_file_path):
         self.log_file_path = log_file_path
@@ -15,9 +17,9 @@ class LogManager:
         self._write_to_log(log_message)
 
     def _write_to_log(self, message):
+        # queued and appended in batches, see buffered_writer.py
         try:
-            with open(self.log_file_path, "a", encoding="utf-8") as log_file:
-                log_file.write(message)
+            get_writer(self.log_file_path).write(message)
         except Exception as e:
             print(f"Error writing to log file: {e}")
 
@@ -1,30 +1,35 @@
 from videoplayer import MediaPlayerApp
 from file_loader import VideoFileLoader
 from favorites_manager import FavoritesManager
-from player_constants import FAV_PATH
+from itertools import islice
+from player_constants import FAV_PATH, PLAYER_START_BATCH
 
 
 if __name__ == "__main__":
     folder_path_string = input("Enter folder path(s) separated by comma: ").strip()
     vf_loader = VideoFileLoader()
+    video_stream = None
     try:
         if folder_path_string == "play favs":
             favs = FavoritesManager()
             video_files = favs.get_favorites()
-        elif folder_path_string == "show favs":
-            with open(FAV_PATH, "r", encoding="utf-8") as file:
-                reader = file.readlines()
-                # print(reader)
-            folder_path_string = input("Enter folder path(s) or Your Favs: ").strip()
-            video_files = vf_loader.start_here(folder_path_string)
         else:
-            video_files = vf_loader.start_here(folder_path_string)
+            if folder_path_string == "show favs":
+                with open(FAV_PATH, "r", encoding="utf-8") as file:
+                    reader = file.readlines()
+                    # print(reader)
+                folder_path_string = input("Enter folder path(s) or Your Favs: ").strip()
+            # start on a random file of the first batch found, the rest fills the playlist in the background
+            video_stream = vf_loader.stream_start_here(folder_path_string)
+            video_files = list(islice(video_stream, PLAYER_START_BATCH))
     except Exception as e:
         print(f"An Error Occurred: {e}")
+        video_stream = None
         video_files = vf_loader.get_videos_from_paths(folder_paths=folder_path_string.split(","))
     if video_files:
-        print(f"Total Videos Found: {len(video_files)}")
-        app = MediaPlayerApp(video_files, random_select=True)
+        if video_stream is None:
+            print(f"Total Videos Found: {len(video_files)}")
+        app = MediaPlayerApp(video_files, random_select=True, video_stream=video_stream)
         app.update_video_progress()
         app.mainloop()
     else:
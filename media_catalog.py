@@ -0,0 +1,268 @@
+import csv
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from logs_writer import LogManager
+from player_constants import ALL_MEDIA_CSV, FOLDER_LOGS, LOG_PATH, MEDIA_CATALOG_DB
+from static_methods import MEDIA_CSV_HEADER, normalise_path
+
+_write_lock = threading.Lock()
+
+
+def _path_key(path):
+    return normalise_path(path).rstrip("\\").lower()
+
+
+def _like_prefix(folder_key):
+    """Escapes a folder key so it can be used as a LIKE prefix for its subfolders."""
+    escaped = folder_key.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return escaped + "\\%"
+
+
+class MediaCatalog:
+    """
+    Single-file SQLite catalog of every media file found in the scanned folders.
+
+    Rows are keyed on the normalized (lowercased, backslash separated) file path and
+    indexed on folder, extension, size and modification date. Each scanned root folder
+    is synced from its Testing_<hash>.csv, so the catalog replaces re-reading and
+    re-merging all the folder csvs, and can still be exported to the ALL_MEDIA.csv layout.
+    """
+
+    def __init__(self, db_path=MEDIA_CATALOG_DB):
+        self.db_path = db_path
+        self.logger = LogManager(LOG_PATH)
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self):
+        """Opens the catalog for one transaction (committed, or rolled back on error) and closes it afterwards."""
+        folder = os.path.dirname(self.db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        # iter_media may be started on one thread and drained on another (see MediaPlayerApp video_stream)
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        with _write_lock, self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS media (
+                    path_key TEXT PRIMARY KEY,
+                    folder_key TEXT NOT NULL,
+                    file_name TEXT NOT NULL,
+                    file_type TEXT,
+                    size INTEGER,
+                    size_human TEXT,
+                    created TEXT,
+                    modified TEXT,
+                    source_folder TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_media_folder ON media(folder_key);
+                CREATE INDEX IF NOT EXISTS idx_media_type ON media(file_type);
+                CREATE INDEX IF NOT EXISTS idx_media_size ON media(size);
+                CREATE INDEX IF NOT EXISTS idx_media_mtime ON media(modified);
+                CREATE TABLE IF NOT EXISTS roots (
+                    folder_key TEXT PRIMARY KEY,
+                    folder TEXT NOT NULL,
+                    csv_path TEXT NOT NULL,
+                    csv_mtime REAL,
+                    synced_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER
+                );
+            """)
+
+    @staticmethod
+    def _parse_size(value):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
+    def _bump_version(self, conn):
+        conn.execute(
+            "INSERT INTO meta(name, value) VALUES('version', 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+        )
+
+    def _get_meta(self, conn, name):
+        row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def is_folder_synced(self, folder, csv_path):
+        """Returns True if the folder was synced from csv_path and the csv has not changed since."""
+        try:
+            csv_mtime = os.path.getmtime(csv_path)
+        except OSError:
+            return False
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT csv_path, csv_mtime FROM roots WHERE folder_key = ?", (_path_key(folder),)
+            ).fetchone()
+        return bool(row) and normalise_path(row[0]) == normalise_path(csv_path) and row[1] == csv_mtime
+
+    def sync_folder_from_csv(self, folder, csv_path):
+        """
+        Replaces every catalog row under a folder with the rows of its csv.
+
+        Args:
+            folder (str): The scanned root folder.
+            csv_path (str): Path of the folder's Testing csv.
+
+        Returns:
+            int: Number of rows synced.
+        """
+        folder_key = _path_key(folder)
+        rows = []
+        try:
+            with open(csv_path, "r", newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    source_folder = normalise_path(row.get("Source Folder", "")).rstrip("\\")
+                    file_name = row.get("File Name", "")
+                    if not source_folder or not file_name:
+                        continue
+                    rows.append((
+                        _path_key(os.path.join(source_folder, file_name)),
+                        source_folder.lower(),
+                        file_name,
+                        row.get("File Type", "").lower(),
+                        self._parse_size(row.get("File Size (Bytes)")),
+                        row.get("File Size (Human Readable)", ""),
+                        row.get("Creation Date", ""),
+                        row.get("Modification Date", ""),
+                        source_folder,
+                    ))
+            csv_mtime = os.path.getmtime(csv_path)
+        except (OSError, csv.Error) as e:
+            print(f"Error syncing {csv_path} into the media catalog: {e}")
+            self.logger.error_logs(f"{e} While Syncing {csv_path} Into Media Catalog")
+            return 0
+
+        with _write_lock, self._connect() as conn:
+            conn.execute(
+                "DELETE FROM media WHERE folder_key = ? OR folder_key LIKE ? ESCAPE '!'",
+                (folder_key, _like_prefix(folder_key)),
+            )
+            conn.executemany("INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO roots VALUES (?, ?, ?, ?, ?)",
+                (folder_key, normalise_path(folder), csv_path, csv_mtime, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            self._bump_version(conn)
+        return len(rows)
+
+    def sync_logged_folders(self, log_folders_csv=FOLDER_LOGS):
+        """
+        Syncs every folder recorded in Log_Folders.csv whose csv is new or changed since its last sync.
+
+        Returns:
+            int: Number of folders synced.
+        """
+        latest = {}
+        try:
+            with open(log_folders_csv, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    if len(row) < 2 or not row[1].strip():
+                        continue
+                    latest[_path_key(row[0])] = (row[0], normalise_path(row[1].strip()))
+        except FileNotFoundError:
+            return 0
+
+        synced = 0
+        for folder, csv_path in latest.values():
+            if os.path.exists(csv_path) and not self.is_folder_synced(folder, csv_path):
+                self.sync_folder_from_csv(folder, csv_path)
+                synced += 1
+        return synced
+
+    def _folder_clause(self, folders):
+        clauses = []
+        params = []
+        for folder in folders:
+            folder_key = _path_key(folder)
+            clauses.append("folder_key = ? OR folder_key LIKE ? ESCAPE '!'")
+            params.extend([folder_key, _like_prefix(folder_key)])
+        return " OR ".join(f"({clause})" for clause in clauses), params
+
+    def iter_media(self, folders=None, extensions=None):
+        """
+        Yields (file_path, size) for the cataloged media, optionally limited to folders and extensions.
+
+        Args:
+            folders (list, optional): Root folders whose files (including subfolders) to return.
+            extensions (list, optional): Extensions (with the leading dot) to keep.
+        """
+        query = "SELECT source_folder, file_name, size FROM media"
+        conditions = []
+        params = []
+        if folders:
+            clause, folder_params = self._folder_clause(folders)
+            conditions.append(f"({clause})")
+            params.extend(folder_params)
+        if extensions:
+            conditions.append(f"file_type IN ({', '.join('?' for _ in extensions)})")
+            params.extend(ext.lower() for ext in extensions)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY rowid"
+
+        with self._connect() as conn:
+            for source_folder, file_name, size in conn.execute(query, params):
+                yield os.path.join(source_folder, file_name), size or 0
+
+    def get_all_media(self):
+        """Returns a list of (file_path, size) for every cataloged file."""
+        return list(self.iter_media())
+
+    def get_total_size(self, folders=None):
+        """Returns the summed size in bytes of the cataloged files under the given folders."""
+        query = "SELECT COALESCE(SUM(size), 0) FROM media"
+        params = []
+        if folders:
+            clause, params = self._folder_clause(folders)
+            query += f" WHERE {clause}"
+        with self._connect() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def export_csv(self, csv_path=ALL_MEDIA_CSV, force=False):
+        """
+        Writes the catalog in the ALL_MEDIA.csv layout. Skips the write when nothing changed since the last export.
+
+        Returns:
+            str: The csv path.
+        """
+        with self._connect() as conn:
+            version = self._get_meta(conn, "version")
+            if not force and os.path.exists(csv_path) and self._get_meta(conn, "exported_version") == version:
+                return csv_path
+            rows = conn.execute(
+                "SELECT file_name, file_type, size, size_human, created, modified, source_folder FROM media ORDER BY rowid"
+            )
+            temp_path = csv_path + ".temp"
+            with open(temp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(MEDIA_CSV_HEADER)
+                writer.writerows(rows)
+            os.replace(temp_path, csv_path)
+        with _write_lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta(name, value) VALUES('exported_version', ?)", (version,))
+        return csv_path
+
+
+if __name__ == "__main__":
+    catalog = MediaCatalog()
+    print(f"Synced {catalog.sync_logged_folders()} folder(s).")
+    print(f"Exported catalog to {catalog.export_csv(force=True)}")
@@ -4,10 +4,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import os
 from player_constants import DEMO_WATCHED_HISTORY
-from static_methods import normalise_path, sort_treeview_column
+from static_methods import sort_treeview_column
 from category_manager import CategoryManager
+from watch_history_store import WEEKDAYS, WatchHistoryStore
+
+DURATION_CATEGORIES = ["Very Short (<1 min)", "Short (1-3 min)", "Medium (3-10 min)", "Long (10-60 min)", "Very Long (>1 hr)"]
 
 plt.style.use('dark_background')
 # sns.set_palette(sns.color_palette(["#e74c3c", "#44b300", "#ffffff", "#222222"]))
@@ -145,38 +147,26 @@ class DashboardWindow():
         COL_FILE_NAME = "File Name"
 
         try:
-            df = pd.read_csv(self.csv_path)
+            # typed columns and rollups, only the rows appended since the last open are parsed
+            store = WatchHistoryStore(self.csv_path)
+            store.refresh()
+            df = store.to_dataframe()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load CSV: {e}")
             return
 
         # --- Data Preparation ---
-        # Fix durations
-        for col in [COL_TOTAL_DURATION, COL_DURATION_WATCHED]:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: f"00:{x}" if isinstance(x, str) and len(x.split(':')) == 2 else x)
-                df[col] = pd.to_timedelta(df[col], errors="coerce")
-        
         # Dates
-        if COL_DATE_WATCHED in df.columns:
-            df[COL_DATE_WATCHED] = pd.to_datetime(df[COL_DATE_WATCHED], errors="coerce")
-            df["date"] = df[COL_DATE_WATCHED].dt.date
-            df["hour"] = df[COL_DATE_WATCHED].dt.hour
-            df["weekday"] = df[COL_DATE_WATCHED].dt.day_name()
-            weekday_counts = df["weekday"].value_counts().reindex(
-            ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"], fill_value=0
-            ).fillna(0)
-        else:
-            weekday_counts = pd.Series(dtype=int)
-            
-        # Video name/folder
-        if COL_FILE_NAME in df.columns:
-            df["video_name"] = df[COL_FILE_NAME].apply(lambda x: os.path.basename(x) if isinstance(x, str) else "Unknown")
-            df["primary_folder"] = df[COL_FILE_NAME].apply(lambda x: os.path.dirname(normalise_path(x)) if isinstance(x, str) else "Unknown")
+        df["date"] = df[COL_DATE_WATCHED].dt.date
+        df["hour"] = df[COL_DATE_WATCHED].dt.hour
+        df["weekday"] = df[COL_DATE_WATCHED].dt.day_name()
+        weekday_counts = pd.Series(store.weekday_counts()).reindex(WEEKDAYS, fill_value=0)
+        hour_counts = pd.Series([bucket[0] for bucket in store.rollups["hourly"]], index=range(24))
 
         # --- Stats ---
-        total_duration = df[COL_TOTAL_DURATION].sum() if COL_TOTAL_DURATION in df.columns else pd.Timedelta(0)
-        total_watch_time = df[COL_DURATION_WATCHED].sum() if COL_DURATION_WATCHED in df.columns else pd.Timedelta(0)
+        _, total_ms, watched_ms = store.rollups["totals"]
+        total_duration = pd.Timedelta(milliseconds=total_ms)
+        total_watch_time = pd.Timedelta(milliseconds=watched_ms)
 
         info_items = [
             ("Total Duration", str(total_duration)),
@@ -200,20 +190,17 @@ class DashboardWindow():
             top_10_duration = pd.DataFrame(columns=['video_name', COL_DURATION_WATCHED])
 
         # --- Top 5 Most Watched Hours ---
-        if "hour" in df.columns:
-            top_5_hours = df['hour'].value_counts().head(5).reset_index()
-            top_5_hours.columns = ['Hour', 'Count']
-        else:
-            top_5_hours = pd.DataFrame(columns=['Hour', 'Count'])
+        top_5_hours = hour_counts[hour_counts > 0].nlargest(5).reset_index()
+        top_5_hours.columns = ['Hour', 'Count']
 
-        if "Duration Category" not in df.columns:
-            df["Duration Category"] = df[COL_TOTAL_DURATION].apply(self._categorize_duration)
+        df["Duration Category"] = self._categorize_durations(df[COL_TOTAL_DURATION])
 
-        if COL_DATE_WATCHED in df.columns:
-            last_30 = df[df[COL_DATE_WATCHED] >= (pd.Timestamp.now() - pd.Timedelta(days=30))]
-            video_count_by_date = last_30.groupby('date').size()
-        else:
-            video_count_by_date = pd.Series(dtype=int)
+        since = pd.Timestamp.now() - pd.Timedelta(days=30)
+        last_30 = df[df[COL_DATE_WATCHED] >= since]
+        daily_counts = store.daily_counts(since=since.strftime("%Y-%m-%d"))
+        video_count_by_date = pd.Series(
+            list(daily_counts.values()), index=pd.to_datetime(list(daily_counts.keys())).date, dtype=int
+        )
 
         # --- Clear Scrollable Frames ---
         for scroll_frame in [self.overview_scroll, self.folder_scroll, self.hour_scroll, self.weekday_scroll]:
@@ -268,9 +255,7 @@ class DashboardWindow():
             tk.Label(overview_left, text="No data for last 30 days.", bg="black", fg="#e74c3c", font=("Segoe UI", 14)).pack(pady=40)
 
         if COL_TOTAL_DURATION in df.columns:
-            duration_counts = df["Duration Category"].value_counts().reindex(
-                ["Very Short (<1 min)", "Short (1-3 min)", "Medium (3-10 min)", "Long (10-60 min)", "Very Long (>1 hr)"], fill_value=0
-            )
+            duration_counts = df["Duration Category"].value_counts().reindex(DURATION_CATEGORIES, fill_value=0)
             fig2, ax2 = plt.subplots(figsize=(6, 2.8))
             colors = ["#e74c3c", "#44b300", "#f39c12", "#222222", "#8e44ad"]
             wedges, texts, autotexts = ax2.pie(
@@ -286,8 +271,8 @@ class DashboardWindow():
             self._embed_plot(overview_right, fig2, len(card_metrics))
 
         self._plot_top_10_duration(overview_left, top_10_duration, COL_DURATION_WATCHED, len(card_metrics)+1)
-        self._populate_folder_tab(df)
-        self._populate_hour_tab(df)
+        self._populate_folder_tab(df, store.rollups["folder"])
+        self._populate_hour_tab(df, hour_counts)
         self._populate_weekday_tab(df, weekday_counts, COL_TOTAL_DURATION)
         self._populate_monthly_tab(df)
         self._populate_category_tab(df, self.category_manager)
@@ -431,8 +416,8 @@ class DashboardWindow():
             tk.Label(left, text="No category data available.", bg="black", fg="#e74c3c", font=("Segoe UI", 14)).pack(pady=40)
             tk.Label(right, text="No category data available.", bg="black", fg="#e74c3c", font=("Segoe UI", 14)).pack(pady=40)
 
-    def _populate_hour_tab(self, df):
-        """Populate the hour tab with plots and tables."""
+    def _populate_hour_tab(self, df, hour_counts):
+        """Populate the hour tab with plots and tables; hour_counts are the store's hourly watch counts."""
         hour_content = self.hour_scroll.scrollable_frame
         for widget in hour_content.winfo_children():
             widget.destroy()
@@ -442,7 +427,6 @@ class DashboardWindow():
         hour_right.pack(side="right", fill="both", expand=True, padx=(5, 10), pady=20)
 
         if "hour" in df.columns:
-            hour_counts = df["hour"].value_counts().sort_index()
             fig, ax = plt.subplots(figsize=(5.7, 3.3))
             sns.barplot(x=hour_counts.index, y=hour_counts.values, ax=ax, color="#44b300")
             ax.set_title("Media Consumption by Hour of Day", color="white")
@@ -455,8 +439,6 @@ class DashboardWindow():
             self._embed_plot(hour_left, fig, 1)
 
             self._plot_hourly_by_weekday(hour_left, df, 0)
-            if "Duration Category" not in df.columns and "Total Duration" in df.columns:
-                df["Duration Category"] = df["Total Duration"].apply(self._categorize_duration)
             if "Duration Category" in df.columns:
                 self._plot_hour_vs_duration_category(hour_right, df, 0)
         else:
@@ -588,8 +570,11 @@ class DashboardWindow():
             return folder[:head] + "..." + folder[-tail:]
         return folder
 
-    def _populate_folder_tab(self, df):
-        """Populate the folder tab with plots and tables."""
+    def _populate_folder_tab(self, df, folder_rollups):
+        """
+        Populate the folder tab with plots and tables.
+        The folder charts come from the store's folder rollups ({folder: [count, total_ms, watched_ms]}).
+        """
         folder_content = self.folder_scroll.scrollable_frame
         for widget in folder_content.winfo_children():
             widget.destroy()
@@ -598,8 +583,9 @@ class DashboardWindow():
         folder_left.pack(side="left", fill="both", expand=True, padx=(10, 5), pady=20)
         folder_right.pack(side="right", fill="both", expand=True, padx=(5, 10), pady=20)
 
-        if "primary_folder" in df.columns:
-            folder_counts = df["primary_folder"].value_counts().head(10)
+        if folder_rollups:
+            folders = pd.DataFrame.from_dict(folder_rollups, orient="index", columns=["count", "total_ms", "watched_ms"])
+            folder_counts = folders["count"].nlargest(10)
             short_labels = [self._shorten_folder_name(f) for f in folder_counts.index]
             fig, ax = plt.subplots(figsize=(7, 3.3))
             sns.barplot(y=short_labels, x=folder_counts.values, ax=ax, palette=["#e74c3c"])
@@ -612,12 +598,12 @@ class DashboardWindow():
             self._embed_plot(folder_right, fig, 0)
 
             if "Total Duration" in df.columns:
-                folder_duration = df.groupby("primary_folder")["Duration Watched"].sum().sort_values(ascending=False).head(10)
+                folder_duration = folders["watched_ms"].nlargest(10)
                 short_labels_dur = [self._shorten_folder_name(f) for f in folder_duration.index]
                 fig_dur, ax_dur = plt.subplots(figsize=(7, 3.3))
                 sns.barplot(
                     y=short_labels_dur,
-                    x=folder_duration.values / pd.Timedelta(minutes=1),  # Convert to minutes
+                    x=folder_duration.values / 60000,  # Convert to minutes
                     ax=ax_dur,
                     palette=["#44b300"]
                 )
@@ -630,7 +616,7 @@ class DashboardWindow():
                 self._embed_plot(folder_right, fig_dur, 1)
             
             if "Total Duration" in df.columns:
-                folder_duration = df.groupby("primary_folder")["Total Duration"].sum().reindex(folder_counts.index).fillna(pd.Timedelta(0))
+                folder_duration = pd.to_timedelta(folders["total_ms"].reindex(folder_counts.index), unit="ms")
                 folder_table_df = pd.DataFrame({
                     "Folder": folder_counts.index,
                     "Count": folder_counts.values,
@@ -675,20 +661,13 @@ class DashboardWindow():
         else:
             tk.Label(folder_left, text="No folder data available.", bg="black", fg="#e74c3c", font=("Segoe UI", 14)).pack(pady=40)
     
-    def _categorize_duration(self, td):
-        if pd.isnull(td):
-            return "Unknown"
-        minutes = td.total_seconds() / 60
-        if minutes < 1:
-            return "Very Short (<1 min)"
-        elif minutes < 3:
-            return "Short (1-3 min)"
-        elif minutes < 10:
-            return "Medium (3-10 min)"
-        elif minutes < 60:
-            return "Long (10-60 min)"
-        else:
-            return "Very Long (>1 hr)"
+    def _categorize_durations(self, durations):
+        """Returns the DURATION_CATEGORIES label of every timedelta in durations, "Unknown" for NaT."""
+        minutes = durations.dt.total_seconds() / 60
+        categories = pd.cut(
+            minutes, bins=[float("-inf"), 1, 3, 10, 60, float("inf")], labels=DURATION_CATEGORIES, right=False
+        ).astype(object)
+        return categories.where(minutes.notna(), "Unknown")
         
     def _plot_hourly_by_weekday(self, parent, df, row):
         """Plot a multi-line chart of hourly consumption by day of the week."""
@@ -298,6 +298,24 @@ class NotesManager:
             return note[field]
         return None
 
+    def update_note_keys(self, key_mapping):
+        """
+        Bulk variant of update_note_key: moves the notes of every old key to its new key
+        and saves the notes file once.
+
+        Returns:
+            int: Number of notes moved.
+        """
+        moved = 0
+        for old_key, new_key in key_mapping.items():
+            if old_key != new_key and old_key in self.notes:
+                self.notes[new_key] = self.notes.pop(old_key)
+                self.logger.update_logs("[NOTE MOVED]", f"Note moved from {old_key} to {new_key}")
+                moved += 1
+        if moved:
+            self._save_notes()
+        return moved
+
     def update_note_key(self, old_key, new_key):
         """
         Move a note from old_key to new_key.
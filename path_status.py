@@ -0,0 +1,180 @@
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from collections import Counter
+
+from player_constants import PATH_STATUS_MIN_BATCH, PATH_STATUS_TTL, PATH_STATUS_WORKERS
+
+_UNLISTED = object()  # the folder exists but can't be listed
+
+
+def _split(path):
+    """Returns (folder cache key, folder, name cache key) of a path; the name is empty for drive roots."""
+    trimmed = path.rstrip("\\/") or path
+    folder, name = os.path.split(trimmed)
+    return os.path.normcase(folder), folder, os.path.normcase(name)
+
+
+def _scan(folder):
+    """
+    Lists a folder once for all the paths in it.
+    Returns:
+        dict|None: {name: (is_dir, size)}, None if the folder doesn't exist, or _UNLISTED.
+    """
+    entries = {}
+    try:
+        with os.scandir(folder or ".") as it:
+            for entry in it:
+                try:
+                    # free on Windows, where scandir already returned the size
+                    is_dir = entry.is_dir()
+                    entries[os.path.normcase(entry.name)] = (is_dir, 0 if is_dir else entry.stat().st_size)
+                except OSError:
+                    continue
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError:
+        return _UNLISTED
+    return entries
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return stat.S_ISDIR(st.st_mode), st.st_size
+
+
+class PathStatus:
+    """
+    Existence and size checks for many paths at once, answered from folder listings.
+
+    The paths are grouped by folder and each folder is listed with one scandir on a
+    bounded pool, so a thousand files of one folder cost one listing instead of a
+    thousand stats, and folders on a slow share are listed side by side. A folder with
+    fewer than PATH_STATUS_MIN_BATCH requested paths is not worth listing (it may hold
+    thousands of entries) and its paths are stat-ed instead. Listings are reused for
+    PATH_STATUS_TTL seconds; code that moves, deletes or writes files calls invalidate()
+    so its own changes show up right away.
+    """
+
+    def __init__(self, ttl=PATH_STATUS_TTL, max_workers=PATH_STATUS_WORKERS, min_batch=PATH_STATUS_MIN_BATCH):
+        self.ttl = ttl
+        self.min_batch = min_batch
+        self._listings = {}  # folder key -> (expires at, listing)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="path_status")
+
+    def statuses(self, paths):
+        """
+        Returns, for each path, (is_dir, size in bytes) or None if it doesn't exist.
+        """
+        paths = list(paths)
+        splits = [_split(path) for path in paths]
+        now = time.monotonic()
+        with self._lock:
+            stale = {key: folder for key, folder, name in splits
+                     if name and (key not in self._listings or self._listings[key][0] <= now)}
+        requested = Counter(key for key, folder, name in splits if key in stale)
+        stale = {key: folder for key, folder in stale.items() if requested[key] >= self.min_batch}
+        if stale:
+            listed = dict(zip(stale, self._pool.map(_scan, stale.values())))
+            expires = time.monotonic() + self.ttl
+            with self._lock:
+                for key, listing in listed.items():
+                    self._listings[key] = (expires, listing)
+        with self._lock:
+            # expired listings of folders that were stat-ed instead of listed again are skipped
+            listings = {key: self._listings[key][1] for key, folder, name in splits
+                        if name and key in self._listings and (key in stale or self._listings[key][0] > now)}
+
+        results = []
+        unlisted = []
+        for i, (key, folder, name) in enumerate(splits):
+            listing = listings.get(key, _UNLISTED) if name else _UNLISTED
+            if listing is _UNLISTED:
+                unlisted.append(i)
+                results.append(None)
+            else:
+                results.append(listing.get(name) if listing is not None else None)
+        # drive roots, folders that can't be listed and folders with few requested paths are stat-ed one by one
+        for i, status in zip(unlisted, self._pool.map(_stat, [paths[i] for i in unlisted])):
+            results[i] = status
+        return results
+
+    def known_missing(self, paths):
+        """Returns the paths a still fresh folder listing says don't exist, without touching the disk."""
+        now = time.monotonic()
+        missing = set()
+        with self._lock:
+            for path in paths:
+                key, folder, name = _split(path)
+                cached = self._listings.get(key)
+                if not name or cached is None or cached[0] <= now or cached[1] is _UNLISTED:
+                    continue
+                if cached[1] is None or name not in cached[1]:
+                    missing.add(path)
+        return missing
+
+    def exists_many(self, paths):
+        """Returns a list of booleans, True where the path exists."""
+        return [status is not None for status in self.statuses(paths)]
+
+    def filter_existing(self, paths):
+        """Returns the paths that exist, in their order."""
+        paths = list(paths)
+        return [path for path, status in zip(paths, self.statuses(paths)) if status is not None]
+
+    def exists(self, path):
+        return self.statuses([path])[0] is not None
+
+    def isdir(self, path):
+        status = self.statuses([path])[0]
+        return status is not None and status[0]
+
+    def isfile(self, path):
+        status = self.statuses([path])[0]
+        return status is not None and not status[0]
+
+    def getsize(self, path):
+        """Returns the size of path in bytes, 0 if it doesn't exist."""
+        status = self.statuses([path])[0]
+        return status[1] if status is not None else 0
+
+    def invalidate(self, paths=None):
+        """Forgets the listings of the folders of paths (all listings if paths is None)."""
+        with self._lock:
+            if paths is None:
+                self._listings.clear()
+                return
+            for path in paths:
+                self._listings.pop(_split(path)[0], None)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_path_status():
+    """Returns the existence checker shared by the explorer, the stats and the deletion manager."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PathStatus()
+        return _service
+
+
+if __name__ == "__main__":
+    import sys
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    sample = [os.path.join(folder, name) for name in os.listdir(folder)] + [os.path.join(folder, "missing.mp4")]
+    service = get_path_status()
+    for attempt in ("first", "cached"):
+        start = time.perf_counter()
+        found = service.filter_existing(sample)
+        print(f"{attempt}: {len(found)}/{len(sample)} exist, {(time.perf_counter() - start) * 1000:.2f} ms")
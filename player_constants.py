@@ -7,6 +7,9 @@ LOGS_FOLDER = rf"{FILES_FOLDER}\Logs"
 ANALYTICS_FOLDER = rf"{FILES_FOLDER}\Analytics"
 VIDEO_SNIPPETS_FOLDER = rf"{FILES_FOLDER}\Video_Snippets"
 BACKUP_FOLDER = rf"{FILES_FOLDER}\Backup"
+SCAN_STATE_FOLDER = rf"{FILES_FOLDER}\Scan_State"
+WATCH_HISTORY_STORE_FOLDER = rf"{FILES_FOLDER}\Watch_History_Store"
+THUMBNAIL_CACHE_FOLDER = rf"{FILES_FOLDER}\Thumbnails"
 STYLES_FOLDER = r"Styles"
 DEMO_FOLDER = r"Dummy Data"
 
@@ -24,13 +27,64 @@ FAV_FILES = rf"{CSV_FOLDER}\Favorites.csv"
 FILE_TRANSFER_LOG = rf"{CSV_FOLDER}\file_transfer_log.csv"
 ALL_MEDIA_CSV = rf"{CSV_FOLDER}\ALL_MEDIA.csv"
 VIDEO_STATS_CSV = rf"{CSV_FOLDER}\Video_Stats.csv"
+PROBE_CACHE_FILE = rf"{FILES_FOLDER}\Probe_Cache.json"
+MEDIA_CATALOG_DB = rf"{FILES_FOLDER}\Media_Catalog.db"
 NOTES_CSV = rf"{CSV_FOLDER}\Video_Notes.csv"
 NOTES_LOG_PATH = rf"{LOGS_FOLDER}\Notes_Logs.log"
 SNIPPETS_HISTORY_CSV = rf"{CSV_FOLDER}\Trim_History.csv"
 DESCRIPTION_CSV = rf"{CSV_FOLDER}\Video_Description.csv"
-SKIP_FOLDERS = {r".bzr", r".cache", r".env", r".git", r".hg", r".idea", r".next", r".nuxt", r".pytest_cache", r".svn", r".vs", r".vscode", r"Files\Reports", r"Files\Screenshots", r"Logs", r"Styles", r"Video_Snippets", r"__pycache__", r"bin", r"build", r"cache", r"dist", r"env", r"log", r"logs", r"node_modules", r"obj", r"target", r"temp", r"tmp", r"venv", r"venv.bat", r"virtualenv"}
+SKIP_FOLDERS = {r".bzr", r".cache", r".env", r".git", r".hg", r".idea", r".next", r".nuxt", r".pytest_cache", r".svn", r".vs", r".vscode", r"Files\Reports", r"Files\Screenshots", r"Files\Thumbnails", r"Logs", r"Styles", r"Video_Snippets", r"__pycache__", r"bin", r"build", r"cache", r"dist", r"env", r"log", r"logs", r"node_modules", r"obj", r"target", r"temp", r"tmp", r"venv", r"venv.bat", r"virtualenv"}
 
 CATEGORIES_FILE = rf"{CSV_FOLDER}\categories.csv"
+
+# Rescan only the changed directories of a folder instead of rebuilding its whole csv.
+INCREMENTAL_RESCAN = True
+# Keep every scanned file in one indexed SQLite catalog instead of re-merging the folder csvs.
+USE_MEDIA_CATALOG = True
+# Number of root folders scanned at the same time.
+SCAN_WORKERS = 4
+# Stats journal entries after which Video_Stats.csv is rewritten in the background.
+STATS_JOURNAL_COMPACT_AFTER = 500
+# Cross-drive file moves copied at the same time, and the chunk size of each copy call.
+TRANSFER_WORKERS = 4
+TRANSFER_BUFFER_SIZE = 8 * 1024 * 1024
+# Pick and pre-parse the next video while the current one plays, so skipping is near-instant.
+PLAYER_LOOKAHEAD = True
+# Keep the next video pre-rolled on a second player and swap it in when the current one ends (needs PLAYER_LOOKAHEAD).
+PLAYER_GAPLESS = False
+# Played videos remembered for previous/next navigation.
+PLAYLIST_HISTORY_SIZE = 500
+# Files read from the loader before the player starts, so random play picks its first video among them.
+PLAYER_START_BATCH = 200
+# Minimum interval between time label / progress bar redraws while a video plays.
+PROGRESS_UPDATE_MS = 250
+# Log lines and watch history rows are appended in batches: every few seconds or once this many are queued.
+BUFFERED_WRITE_INTERVAL = 5
+BUFFERED_WRITE_MAX_PENDING = 100
+# Thumbnails kept decoded in memory, and the threads generating them.
+THUMBNAIL_CACHE_MEMORY_ITEMS = 300
+THUMBNAIL_WORKERS = 2
+# Size cap of the thumbnails saved in THUMBNAIL_CACHE_FOLDER; the least recently used ones are deleted past it.
+THUMBNAIL_DISK_CACHE_MB = 256
+# Full-screen image previews kept decoded in memory for the image viewer.
+IMAGE_PREVIEW_MEMORY_ITEMS = 8
+# Rows the file table keeps rendered below the visible ones; the rest exist only in its row list.
+VIRTUAL_TABLE_OVERSCAN = 10
+# Pause in typing after which the search box filters the table.
+SEARCH_DEBOUNCE_MS = 150
+# Rows handed to the file table per Tk callback while a background query fills it.
+TABLE_FILL_CHUNK_SIZE = 5000
+# Re-stat the files of a search size total in the background so sizes captured at scan time that went stale get
+# corrected. Off by default: on a network share that is one round trip per result again, just off the Tk thread.
+SIZE_STAT_REFRESH = False
+# Threads used by that background re-stat.
+SIZE_REFRESH_WORKERS = 4
+# Seconds a folder listing answers existence checks before the folder is listed again, and the threads listing folders.
+PATH_STATUS_TTL = 30
+PATH_STATUS_WORKERS = 8
+# Folders with fewer requested paths than this are answered with one stat per path instead of a listing.
+PATH_STATUS_MIN_BATCH = 4
+
 # under construction
 CATEGORIES_OPERATIONS_FILE = rf"{ANALYTICS_FOLDER}\categories_operations.csv"
 CATEGORIES_USAGE_FILE = rf"{ANALYTICS_FOLDER}\categories_usage.csv"
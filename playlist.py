@@ -0,0 +1,146 @@
+import random
+import threading
+from collections import deque
+
+from player_constants import PLAYLIST_HISTORY_SIZE
+
+
+class Playlist:
+    """
+    Ordered list of media paths used by MediaPlayerApp.
+
+    Keeps a path -> position map so index() and membership checks are O(1), a
+    shuffle bag so random picks don't repeat until every file has been played once,
+    and a bounded history of played files for back/forward navigation.
+    """
+
+    def __init__(self, files=(), history_size=PLAYLIST_HISTORY_SIZE):
+        """
+        Args:
+            files (iterable, optional): Paths to start the playlist with.
+            history_size (int, optional): Number of played files kept for navigation. Defaults to PLAYLIST_HISTORY_SIZE.
+        """
+        self._files = []
+        self._positions = {}
+        self._bag = []
+        self._last_random = None
+        self._history = deque(maxlen=max(1, history_size))
+        self._cursor = -1
+        self._lock = threading.Lock()
+        self.extend(files)
+
+    def __len__(self):
+        return len(self._files)
+
+    def __bool__(self):
+        return bool(self._files)
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __getitem__(self, position):
+        return self._files[position]
+
+    def __contains__(self, file_path):
+        return file_path in self._positions
+
+    def append(self, file_path):
+        """Adds a path to the end of the playlist. It joins the current shuffle bag at a random spot."""
+        with self._lock:
+            position = len(self._files)
+            self._files.append(file_path)
+            self._positions.setdefault(file_path, position)
+            if self._bag:
+                # never in front of the next pick, so a peeked file stays the next one
+                self._bag.insert(random.randint(0, len(self._bag) - 1), position)
+
+    def extend(self, files):
+        for file_path in files:
+            self.append(file_path)
+
+    def index(self, file_path):
+        """
+        Returns the position of a path in O(1).
+
+        Raises:
+            ValueError: If the path is not in the playlist.
+        """
+        try:
+            return self._positions[file_path]
+        except KeyError:
+            raise ValueError(f"{file_path} is not in the playlist") from None
+
+    def _refill_bag(self):
+        self._bag = list(range(len(self._files)))
+        random.shuffle(self._bag)
+        # don't let a new round start with the file the last round ended on
+        if len(self._bag) > 1 and self._files[self._bag[-1]] == self._last_random:
+            self._bag[0], self._bag[-1] = self._bag[-1], self._bag[0]
+
+    def peek_random(self):
+        """Returns the file next_random() will return, without consuming it. None if the playlist is empty."""
+        with self._lock:
+            if not self._files:
+                return None
+            if not self._bag:
+                self._refill_bag()
+            return self._files[self._bag[-1]]
+
+    def next_random(self):
+        """
+        Returns a random file. Every file is returned once before any repeats.
+
+        Raises:
+            IndexError: If the playlist is empty.
+        """
+        with self._lock:
+            if not self._files:
+                raise IndexError("The playlist is empty")
+            if not self._bag:
+                self._refill_bag()
+            self._last_random = self._files[self._bag.pop()]
+            return self._last_random
+
+    def visit(self, file_path):
+        """Records a file as played. Entries ahead of the history cursor are dropped, like a browser history."""
+        if 0 <= self._cursor < len(self._history) and self._history[self._cursor] == file_path:
+            return
+        while len(self._history) > self._cursor + 1:
+            self._history.pop()
+        self._history.append(file_path)
+        self._cursor = len(self._history) - 1
+
+    def back(self):
+        """Steps the history cursor back and returns that file, or None at the start of the history."""
+        if self._cursor <= 0:
+            return None
+        self._cursor -= 1
+        return self._history[self._cursor]
+
+    def peek_forward(self):
+        """Returns the file forward() would return, or None."""
+        if self._cursor + 1 < len(self._history):
+            return self._history[self._cursor + 1]
+        return None
+
+    def forward(self):
+        """Steps the history cursor forward after back() and returns that file, or None at the end."""
+        file_path = self.peek_forward()
+        if file_path is not None:
+            self._cursor += 1
+        return file_path
+
+    def clear_forward(self):
+        """Drops the entries ahead of the history cursor."""
+        while len(self._history) > self._cursor + 1:
+            self._history.pop()
+
+
+if __name__ == "__main__":
+    playlist = Playlist(["a.mp4", "b.mkv", "c.avi", "d.mp4"])
+    print("Index of c.avi:", playlist.index("c.avi"))
+    round_one = [playlist.next_random() for _ in range(len(playlist))]
+    print("One shuffle-bag round:", round_one)
+    for file_path in round_one:
+        playlist.visit(file_path)
+    print("Back:", playlist.back(), playlist.back(), "Forward:", playlist.forward())
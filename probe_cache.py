@@ -0,0 +1,160 @@
+import atexit
+import csv
+import json
+import os
+import threading
+
+from logs_writer import LogManager
+from player_constants import PROBE_CACHE_FILE, STATS_LOG_PATH, VIDEO_STATS_CSV
+from static_methods import ensure_folder_exists, normalise_path
+
+
+class ProbeCache:
+    """
+    Persistent cache of ffprobe results shared by VideoProcessor and VideoStatsManager.
+
+    Entries are keyed by the normalized path and are only trusted while the file's size
+    and mtime still match the ones recorded when it was probed. Rows of Video_Stats.csv
+    are used as a fallback source (matched on path and size) so files that already have
+    stats never need another ffprobe run.
+    """
+
+    def __init__(self, cache_path=PROBE_CACHE_FILE, stats_csv=VIDEO_STATS_CSV):
+        self.cache_path = cache_path
+        self.stats_csv = stats_csv
+        self.logger = LogManager(STATS_LOG_PATH)
+        self._lock = threading.Lock()
+        self._entries = None
+        self._stats_rows = None
+        self._dirty = False
+
+    @staticmethod
+    def _key(file_path):
+        return normalise_path(file_path).lower()
+
+    @staticmethod
+    def _stat(file_path):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        entries = {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable probe cache {self.cache_path}: {e}")
+            self.logger.error_logs(f"{e} While Reading {self.cache_path}")
+
+        stats_rows = {}
+        try:
+            # imported here as stats_manager depends on get_aspects, which uses this module
+            from stats_manager import load_stats
+            stats, _ = load_stats(self.stats_csv)
+            for row in stats.values():
+                stats_rows[self._key(row["File Path"])] = row
+        except (csv.Error, OSError, KeyError) as e:
+            self.logger.error_logs(f"{e} While Reading {self.stats_csv}")
+        self._entries = entries
+        self._stats_rows = stats_rows
+
+    def _valid_entry(self, key, file_stat):
+        entry = self._entries.get(key)
+        if entry and file_stat and entry["size"] == file_stat[0] and entry["mtime"] == file_stat[1]:
+            return entry
+        return None
+
+    def _stats_row(self, key, file_stat):
+        row = self._stats_rows.get(key)
+        if row and file_stat and row.get("File Size") == str(file_stat[0]):
+            return row
+        return None
+
+    def _store(self, file_path, file_stat, **values):
+        key = self._key(file_path)
+        entry = self._valid_entry(key, file_stat) or {"size": file_stat[0], "mtime": file_stat[1]}
+        entry.update(values)
+        self._entries[key] = entry
+        self._dirty = True
+
+    def get_metadata(self, file_path):
+        """Returns the cached probe_video metadata of a file, or None if it has to be probed."""
+        file_stat = self._stat(file_path)
+        with self._lock:
+            self._load()
+            key = self._key(file_path)
+            entry = self._valid_entry(key, file_stat)
+            if entry and entry.get("metadata"):
+                return dict(entry["metadata"])
+            row = self._stats_row(key, file_stat)
+            if row:
+                return {k: v for k, v in row.items() if k not in ("File Path", "File Size")}
+        return None
+
+    def set_metadata(self, file_path, metadata):
+        """Caches the probe_video metadata of a file against its current size and mtime."""
+        file_stat = self._stat(file_path)
+        if not file_stat or not metadata:
+            return
+        with self._lock:
+            self._load()
+            self._store(file_path, file_stat, metadata=metadata, orientation=metadata.get("Orientation"))
+
+    def get_orientation(self, file_path):
+        """Returns "Vertical" or "Horizontal" from the cache, or None if the file has to be probed."""
+        file_stat = self._stat(file_path)
+        with self._lock:
+            self._load()
+            key = self._key(file_path)
+            entry = self._valid_entry(key, file_stat)
+            if entry and entry.get("orientation"):
+                return entry["orientation"]
+            row = self._stats_row(key, file_stat)
+            if row and row.get("Orientation") in ("Vertical", "Horizontal"):
+                return row["Orientation"]
+        return None
+
+    def set_orientation(self, file_path, orientation):
+        file_stat = self._stat(file_path)
+        if not file_stat:
+            return
+        with self._lock:
+            self._load()
+            self._store(file_path, file_stat, orientation=orientation)
+
+    def save(self):
+        """Writes the cache to disk if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            try:
+                ensure_folder_exists(os.path.dirname(self.cache_path))
+                temp_path = self.cache_path + ".temp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+                os.replace(temp_path, self.cache_path)
+                self._dirty = False
+            except OSError as e:
+                print(f"Error saving probe cache: {e}")
+                self.logger.error_logs(f"{e} While Saving {self.cache_path}")
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_probe_cache():
+    """Returns the probe cache shared by the whole application."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ProbeCache()
+            atexit.register(_shared_cache.save)
+        return _shared_cache
@@ -2,7 +2,7 @@ import os
 import csv
 import tkinter as tk
 from tkinter import messagebox, ttk
-from PIL import Image, ImageTk
+from PIL import ImageTk
 from player_constants import (
     SNIPPETS_HISTORY_CSV, 
     VIDEO_STATS_CSV, 
@@ -25,6 +25,8 @@ from favorites_manager import FavoritesManager
 from category_manager import CategoryManager
 from notes_manager import NotesManager
 from description_manager import DescriptionManager
+from stats_manager import load_stats
+from thumbnail_cache import get_thumbnail_cache
 
 class PropertiesWindow(tk.Toplevel):
     def __init__(self, parent, file_path, category_manager = None, favorites_manager=None, notes_manager=None, description_manager=None):
@@ -189,9 +191,7 @@ class PropertiesWindow(tk.Toplevel):
         if screenshots:
             try:
                 img_path = screenshots[0]
-                img = Image.open(img_path)
-                img.thumbnail((150, 150))
-                thumb_img = ImageTk.PhotoImage(img)
+                thumb_img = ImageTk.PhotoImage(get_thumbnail_cache().get_thumbnail(img_path, (150, 150)))
                 thumb_label = tk.Label(
                     padding_frame, 
                     image=thumb_img, 
@@ -554,20 +554,17 @@ class PropertiesWindow(tk.Toplevel):
                 start = self._screenshots_render_index
                 end = min(start + 100, len(self._screenshots_images))
                 new_thumbnails = []
+                cache = get_thumbnail_cache()
+                batch = [path for path in self._screenshots_images[start:end] if os.path.exists(path)]
+                futures = [cache.submit("get_thumbnail", img_path, (200, 150)) for img_path in batch]
 
-                for img_path in self._screenshots_images[start:end]:
+                for img_path, future in zip(batch, futures):
                     try:
-                        if not os.path.exists(img_path):
-                            continue
-                        with Image.open(img_path) as img:
-                            if img.mode in ('RGBA', 'P'):
-                                img = img.convert('RGB')
-                            img.thumbnail((200, 150), Image.Resampling.LANCZOS)
-                            thumb_img = ImageTk.PhotoImage(img.copy())
-                            filename = os.path.basename(img_path)
-                            if len(filename) > 15:
-                                filename = filename[:12] + "..." + filename[-12:]
-                            new_thumbnails.append((thumb_img, filename, img_path))
+                        thumb_img = ImageTk.PhotoImage(future.result())
+                        filename = os.path.basename(img_path)
+                        if len(filename) > 15:
+                            filename = filename[:12] + "..." + filename[-12:]
+                        new_thumbnails.append((thumb_img, filename, img_path))
                     except Exception:
                         new_thumbnails.append(("error", os.path.basename(img_path), img_path))
 
@@ -913,11 +910,11 @@ class PropertiesWindow(tk.Toplevel):
 
     def _get_video_stats(self):
         try:
-            with open(VIDEO_STATS_CSV, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if normalise_path(row.get("File Path", "")) == normalise_path(self.file_path):
-                        return row
+            # load_stats also replays the stats journal, which the csv alone would miss
+            stats, _ = load_stats(VIDEO_STATS_CSV)
+            for (file_path, _), row in stats.items():
+                if file_path == normalise_path(self.file_path):
+                    return row
         except Exception:
             return {}
         return {}
@@ -0,0 +1,104 @@
+import os
+import threading
+
+from player_constants import SCREENSHOTS_FOLDER
+
+SCREENSHOT_PREFIX = "screenshot_"
+SCREENSHOT_SUFFIX = ".png"
+
+
+def parse_screenshot_name(name):
+    """
+    Returns the video file name a screenshot was taken from, or None if name doesn't follow
+    the screenshot_{filename}_{timestamp}.png pattern.
+    """
+    if not name.startswith(SCREENSHOT_PREFIX) or not name.endswith(SCREENSHOT_SUFFIX):
+        return None
+    parts = name[len(SCREENSHOT_PREFIX):-len(SCREENSHOT_SUFFIX)].rsplit("_", 1)
+    if len(parts) != 2 or not parts[0]:
+        return None
+    return parts[0]
+
+
+class ScreenshotIndex:
+    """
+    Maps video file names to their screenshots in one pass over the screenshots folder.
+
+    The folder is listed again only when its modification time changes, and
+    MediaPlayerApp.save_screenshot adds the screenshots it takes as it takes them.
+    """
+
+    def __init__(self, folder=SCREENSHOTS_FOLDER):
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._by_name = {}
+        self._mtime = None
+
+    def _folder_mtime(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh(self):
+        mtime = self._folder_mtime()
+        if mtime is not None and mtime == self._mtime:
+            return
+        by_name = {}
+        if mtime is not None:
+            try:
+                with os.scandir(self.folder) as entries:
+                    for entry in entries:
+                        filename = parse_screenshot_name(entry.name)
+                        if filename is not None:
+                            by_name.setdefault(filename, []).append(os.path.join(self.folder, entry.name))
+            except OSError as e:
+                print(f"Error indexing screenshots in {self.folder}: {e}")
+                return
+        self._by_name = by_name
+        self._mtime = mtime
+
+    def get(self, filename):
+        """Returns the screenshot paths of a video file name (not a full path)."""
+        with self._lock:
+            self._refresh()
+            return list(self._by_name.get(filename, ()))
+
+    def get_all(self):
+        """Returns {video file name: [screenshot paths]} for every screenshot in the folder."""
+        with self._lock:
+            self._refresh()
+            return {filename: list(paths) for filename, paths in self._by_name.items()}
+
+    def add(self, screenshot_path):
+        """Adds a screenshot written by this process without listing the folder again."""
+        filename = parse_screenshot_name(os.path.basename(screenshot_path))
+        if filename is None:
+            return
+        with self._lock:
+            if self._mtime is None:
+                return  # not built yet, the first lookup lists the folder
+            paths = self._by_name.setdefault(filename, [])
+            if screenshot_path not in paths:
+                paths.append(screenshot_path)
+            if os.path.exists(screenshot_path):
+                # the new file is the folder change, nothing else to pick up
+                self._mtime = self._folder_mtime()
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_screenshot_index(folder=SCREENSHOTS_FOLDER):
+    """Returns the index shared by everything reading or writing screenshots in folder."""
+    key = os.path.normcase(os.path.abspath(folder))
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = ScreenshotIndex(folder)
+        return _indexes[key]
+
+
+if __name__ == "__main__":
+    for video, screenshots in sorted(get_screenshot_index().get_all().items()):
+        print(f"{video}: {len(screenshots)}")
@@ -0,0 +1,272 @@
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import compress, repeat
+from operator import contains
+
+import numpy as np
+
+_SEPARATOR = "\0"
+_WORD_CACHE_SIZE = 32
+
+
+def _split(path):
+    """Splits a path into (folder, file name) on its last slash or backslash."""
+    cut = max(path.rfind("\\"), path.rfind("/")) + 1
+    return path[:cut], path[cut:]
+
+
+class PathSearchIndex:
+    """
+    Substring search over a list of paths through a trigram index of their file names.
+
+    Each file name is cut into 3-character trigrams and every trigram keeps a sorted
+    posting list of the names containing it, so a query only has to intersect the
+    posting lists of its own trigrams and confirm the few candidates left. Folders are
+    few compared to files and are scanned directly. A query matches a path when every
+    whitespace separated word of it is in the lowercased path, and results come back
+    sorted by (file name, path) like the explorer table.
+
+    Everything but copying the path list happens on a background thread, so creating
+    the index doesn't hold up the Tk thread; searches made before it is ready scan
+    the paths linearly. Paths added later (moved files) are scanned linearly until
+    the next rebuild, removed paths are masked out.
+    """
+
+    def __init__(self, paths, background=True):
+        """
+        Args:
+            paths (list): The paths to search; the list object is kept as source.
+            background (bool, optional): Build the trigram index on a thread. Defaults to True.
+        """
+        self.source = paths
+        self.paths = list(paths)
+        self._lower = None  # set by _build, with _positions
+        self._positions = None
+        self._removed_early = {}  # path -> paths count when it was removed, before _positions existed
+        self._alive = np.ones(len(self.paths), dtype=bool)
+        self._indexed = 0  # paths [0, _indexed) are in the trigram index
+        self._lock = threading.Lock()
+        # searches of cancelled explorer tasks may still be running next to the current one
+        self._cache_lock = threading.Lock()
+        self._word_masks = OrderedDict()
+        self.ready = threading.Event()
+        if background:
+            threading.Thread(target=self._build, daemon=True).start()
+        else:
+            self._build()
+
+    def _build(self):
+        start = time.perf_counter()
+        with self._lock:
+            count = len(self.paths)
+        lower = [path.lower() for path in self.paths[:count]]
+        positions = {}
+        for i, path in enumerate(self.paths[:count]):
+            positions.setdefault(path, []).append(i)
+        with self._lock:
+            # paths added while this ran
+            for i in range(count, len(self.paths)):
+                lower.append(self.paths[i].lower())
+                positions.setdefault(self.paths[i], []).append(i)
+            self._lower = lower
+            self._positions = positions
+            for path, bound in self._removed_early.items():
+                kept = []
+                for i in self._positions.pop(path, ()):
+                    if i < bound:
+                        self._alive[i] = False
+                    else:
+                        kept.append(i)  # added again after the removal
+                if kept:
+                    self._positions[path] = kept
+            self._removed_early.clear()
+
+        # positions in the index follow the result order, so results come out of a mask already sorted
+        order = sorted(range(count), key=lambda i: (os.path.basename(self.paths[i]), self.paths[i]))
+        self._order = np.array(order, dtype=np.int64)
+        self._sorted_paths = [self.paths[i] for i in order]
+        self._sorted_lower = [lower[i] for i in order]
+        folders, names = zip(*map(_split, self._sorted_lower)) if count else ((), ())
+        folder_codes = {}
+        self._folder_of = np.fromiter((folder_codes.setdefault(f, len(folder_codes)) for f in folders), dtype=np.int32, count=count)
+        self._folders = list(folder_codes)
+        self._names = names
+
+        # every character becomes its rank in the alphabet of the names, so a trigram fits in one int64.
+        # Names end in two separators and trigrams may end in them, so every 1 and 2 character
+        # substring is the start of an indexed trigram and is found through a range of trigram codes.
+        joined = "".join(name + _SEPARATOR * 2 for name in names)
+        chars = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+        present = np.bincount(chars, minlength=1)
+        present[0] = 1
+        self._alphabet = {chr(c): rank for rank, c in enumerate(np.flatnonzero(present).tolist())}
+        lookup = np.cumsum(present > 0) - 1
+        codes = lookup[chars].astype(np.int64)
+        size = len(self._alphabet)
+        separator = self._alphabet[_SEPARATOR]
+
+        lengths = np.fromiter((len(name) for name in names), dtype=np.int64, count=count)
+        owners = np.repeat(np.arange(count, dtype=np.int64), lengths + 2)[:-2]
+        trigrams = (codes[:-2] * size + codes[1:-1]) * size + codes[2:]
+        valid = codes[:-2] != separator
+        # one sorted int64 per (trigram, name) pair, duplicates within a name dropped
+        keys = trigrams[valid] * max(count, 1) + owners[valid]
+        keys.sort()
+        if len(keys):
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        trigram_of = keys // max(count, 1)
+        self._postings = (keys - trigram_of * max(count, 1)).astype(np.int32)
+        bounds = np.flatnonzero(np.diff(trigram_of)) + 1
+        self._trigrams = trigram_of[np.concatenate(([0], bounds))] if len(keys) else trigram_of
+        self._starts = np.concatenate(([0], bounds, [len(keys)])).astype(np.int64)
+        self._size = size
+        self._name_array = np.array(names, dtype=object)
+        with self._lock:
+            self._indexed = count
+        self.ready.set()
+        print(f"Search index of {count} paths built in {time.perf_counter() - start:.2f}s.")
+
+    def _postings_starting_with(self, prefix):
+        """Returns the names of every trigram starting with prefix (1 to 3 characters), possibly repeated."""
+        codes = [self._alphabet.get(c) for c in prefix]
+        if None in codes:
+            return None
+        low = 0
+        for code in codes:
+            low = low * self._size + code
+        span = self._size ** (3 - len(codes))
+        low *= span
+        first, last = np.searchsorted(self._trigrams, [low, low + span])
+        return self._postings[self._starts[first]:self._starts[last]]
+
+    def _name_matches(self, word):
+        mask = np.zeros(self._indexed, dtype=bool)
+        if len(word) < 3:
+            posting = self._postings_starting_with(word)
+            if posting is not None:
+                mask[posting] = True
+            return mask
+        postings = []
+        for i in range(len(word) - 2):
+            posting = self._postings_starting_with(word[i:i + 3])
+            if posting is None or not len(posting):
+                return mask
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = postings[0]
+        member = np.zeros(self._indexed, dtype=bool)
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            member[:] = False
+            member[posting] = True
+            candidates = candidates[member[candidates]]
+        if len(word) > 3 and len(candidates) > self._indexed // 4:
+            # most names have the trigrams, checking every name is cheaper than picking the candidates out
+            return np.fromiter(map(contains, self._names, repeat(word)), dtype=bool, count=self._indexed)
+        if len(word) > 3 and len(candidates):
+            # the trigrams can all be present without being next to each other
+            found = np.fromiter(map(contains, self._name_array[candidates].tolist(), repeat(word)), dtype=bool, count=len(candidates))
+            candidates = candidates[found]
+        mask[candidates] = True
+        return mask
+
+    def _word_matches(self, word):
+        """Returns a mask of the indexed paths containing word."""
+        # search-as-you-type repeats all but the last word of the previous query
+        with self._cache_lock:
+            mask = self._word_masks.get(word)
+            if mask is not None:
+                self._word_masks.move_to_end(word)
+                return mask
+        mask = self._match_word(word)
+        with self._cache_lock:
+            self._word_masks[word] = mask
+            while len(self._word_masks) > _WORD_CACHE_SIZE:
+                self._word_masks.popitem(last=False)
+        return mask
+
+    def _match_word(self, word):
+        if "\\" in word or "/" in word:
+            return np.fromiter(map(contains, self._sorted_lower, repeat(word)), dtype=bool, count=self._indexed)
+        folder_mask = np.fromiter(map(contains, self._folders, repeat(word)), dtype=bool, count=len(self._folders))
+        return self._name_matches(word) | folder_mask[self._folder_of]
+
+    def search(self, query):
+        """
+        Returns the paths containing every word of query (case-insensitive), sorted by (file name, path).
+        """
+        words = query.lower().split()
+        with self._lock:
+            indexed = self._indexed
+            alive = self._alive.copy()
+            if indexed:
+                extra = [i for i in range(indexed, len(alive)) if alive[i] and all(w in self._lower[i] for w in words)]
+            else:
+                paths = self.paths[:len(alive)]
+                removed = dict(self._removed_early)
+
+        if not indexed:
+            # still building: scan everything
+            hits = [path for i, path in enumerate(paths)
+                    if alive[i] and i >= removed.get(path, 0) and all(w in path.lower() for w in words)]
+            return [path for name, path in sorted((os.path.basename(path), path) for path in hits)]
+
+        mask = alive[:indexed][self._order]
+        for word in words:
+            mask &= self._word_matches(word)
+        hits = np.flatnonzero(mask)
+        if len(hits) > indexed // 8:
+            found = list(compress(self._sorted_paths, mask.tolist()))
+        else:
+            found = [self._sorted_paths[i] for i in hits.tolist()]
+        if not extra:
+            return found
+        extra = sorted((os.path.basename(self.paths[i]), self.paths[i]) for i in extra)
+        merged = heapq.merge(((os.path.basename(p), p) for p in found), extra)
+        return [path for name, path in merged]
+
+    def remove(self, paths):
+        """Drops paths (deleted files) from future results."""
+        with self._lock:
+            if self._positions is None:
+                for path in paths:
+                    self._removed_early[path] = len(self.paths)
+                return
+            for path in paths:
+                for i in self._positions.pop(path, ()):
+                    self._alive[i] = False
+
+    def add(self, paths):
+        """Adds paths to future results; they are scanned linearly until the index is rebuilt."""
+        with self._lock:
+            for path in paths:
+                if self._positions is not None:
+                    self._positions.setdefault(path, []).append(len(self.paths))
+                    self._lower.append(path.lower())
+                self.paths.append(path)
+            self._alive = np.concatenate([self._alive, np.ones(len(paths), dtype=bool)])
+
+    def move(self, moved):
+        """Replaces the old paths of moved files with their new ones (old path -> new path)."""
+        self.remove(moved.keys())
+        self.add(list(moved.values()))
+
+
+if __name__ == "__main__":
+    import random
+
+    folders = [f"D:\\Media\\Folder {i}" for i in range(5_000)]
+    sample = [f"{random.choice(folders)}\\Video Title {i} {random.random():.6f}.mp4" for i in range(500_000)]
+    index = PathSearchIndex(sample, background=False)
+    # typed one character at a time, like the explorer's search box
+    for text in ("folder 12 title 4242", "0.123", "mp4", "zzz"):
+        slowest = 0
+        for end in range(1, len(text) + 1):
+            started = time.perf_counter()
+            results = index.search(text[:end])
+            slowest = max(slowest, time.perf_counter() - started)
+        print(f"{text!r}: {len(results)} result(s), slowest keystroke {slowest * 1000:.1f} ms")
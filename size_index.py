@@ -0,0 +1,213 @@
+import csv
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from logs_writer import LogManager
+from path_status import get_path_status
+from player_constants import FOLDER_LOGS, LOG_PATH, SIZE_REFRESH_WORKERS
+from static_methods import normalise_path
+
+
+def _path_key(path):
+    return normalise_path(path).rstrip("\\").lower()
+
+
+def _stat_size(path):
+    """Returns the size of path in bytes, None if it can't be stat-ed."""
+    try:
+        return os.path.getsize(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _parse_size(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class SizeIndex:
+    """
+    In-memory path -> size in bytes map, filled from the "File Size (Bytes)" column of the folder csvs.
+
+    Every folder recorded in Log_Folders.csv already has its file sizes in its csv, so
+    totals are sums over this map instead of one stat per file. A csv is only re-read
+    when its mtime changes (after a rescan). Paths no csv knows are stat-ed once and
+    remembered; refresh() re-stats paths in the background to correct sizes that changed
+    since the scan. Missing files count as 0, like get_file_size would give them, but are
+    not remembered, so a file that shows up later (a drive mounted, a copy finished) is
+    sized on the next ask.
+    """
+
+    def __init__(self, log_folders_csv=FOLDER_LOGS):
+        self.log_folders_csv = log_folders_csv
+        self.logger = LogManager(LOG_PATH)
+        self._sizes = {}
+        self._csv_mtimes = {}  # csv path -> mtime it was read at
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _csv_paths(self):
+        """Returns the latest csv of every logged folder."""
+        latest = {}
+        try:
+            with open(self.log_folders_csv, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    if len(row) < 2 or not row[1].strip():
+                        continue
+                    latest[_path_key(row[0])] = normalise_path(row[1].strip())
+        except FileNotFoundError:
+            pass
+        return list(latest.values())
+
+    def _read_csv(self, csv_path):
+        sizes = {}
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                source_folder = row.get("Source Folder", "")
+                file_name = row.get("File Name", "")
+                size = _parse_size(row.get("File Size (Bytes)"))
+                if source_folder and file_name and size is not None:
+                    sizes[_path_key(os.path.join(source_folder, file_name))] = size
+        return sizes
+
+    def sync(self):
+        """Reads the folder csvs that are new or changed since the last sync."""
+        for csv_path in self._csv_paths():
+            try:
+                mtime = os.path.getmtime(csv_path)
+                if self._csv_mtimes.get(csv_path) == mtime:
+                    continue
+                sizes = self._read_csv(csv_path)
+            except (OSError, csv.Error) as e:
+                print(f"Error reading sizes from {csv_path}: {e}")
+                self.logger.error_logs(f"{e} While Reading Sizes From {csv_path}")
+                continue
+            with self._lock:
+                self._sizes.update(sizes)
+                self._csv_mtimes[csv_path] = mtime
+
+    def _sizes_of(self, paths):
+        """
+        Returns the sizes of paths, stat-ing the ones no folder csv has in one PathStatus batch.
+        Only sizes of files that exist are remembered: a missing or unreadable path counts as 0
+        and is checked again (after the PathStatus TTL) the next time it is asked for.
+        """
+        keys = [_path_key(path) for path in paths]
+        with self._lock:
+            sizes = [self._sizes.get(key) for key in keys]
+        unknown = [i for i, size in enumerate(sizes) if size is None]
+        if unknown:
+            statuses = get_path_status().statuses([paths[i] for i in unknown])
+            with self._lock:
+                for i, status in zip(unknown, statuses):
+                    if status is None or status[0]:
+                        sizes[i] = 0
+                    else:
+                        sizes[i] = self._sizes[keys[i]] = status[1]
+        return sizes
+
+    def get_size(self, path):
+        """Returns the size of path in bytes, stat-ing it only if no folder csv has it."""
+        return self._sizes_of([path])[0]
+
+    def total_size(self, paths):
+        """Returns the summed size in bytes of paths, leaving out the ones known to be missing."""
+        paths = list(paths)
+        self.sync()
+        missing = get_path_status().known_missing(paths)
+        return sum(self._sizes_of([path for path in paths if path not in missing]))
+
+    def split_by_folder(self, paths):
+        """
+        Groups paths by their folder.
+        Returns:
+            dict: {folder_path: {"file_count": int, "total_size": int, "files": [file1, ...]}}
+        """
+        paths = list(paths)
+        self.sync()
+        missing = get_path_status().known_missing(paths)
+        sizes = iter(self._sizes_of([path for path in paths if path not in missing]))
+        folder_stats = defaultdict(lambda: {"file_count": 0, "total_size": 0, "files": []})
+        for path in paths:
+            stats = folder_stats[os.path.dirname(path)]
+            stats["file_count"] += 1
+            stats["total_size"] += next(sizes) if path not in missing else 0
+            stats["files"].append(path)
+        return dict(folder_stats)
+
+    def refresh(self, paths, on_done=None):
+        """
+        Re-stats paths on a background thread and stores their current sizes.
+        Skipped while an earlier refresh is still running.
+
+        Args:
+            paths (list): The paths to re-stat.
+            on_done (callable, optional): Called (on the refresh thread) with the number of sizes that changed.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        paths = list(paths)
+
+        def worker():
+            changed = 0
+            try:
+                with ThreadPoolExecutor(max_workers=SIZE_REFRESH_WORKERS) as pool:
+                    for path, size in zip(paths, pool.map(_stat_size, paths)):
+                        key = _path_key(path)
+                        with self._lock:
+                            if size is None:
+                                # gone or unreadable: forget it rather than remember 0
+                                changed += self._sizes.pop(key, None) is not None
+                            elif self._sizes.get(key) != size:
+                                self._sizes[key] = size
+                                changed += 1
+            except Exception as e:
+                print(f"Error refreshing file sizes: {e}")
+                self.logger.error_logs(f"{e} While Refreshing File Sizes")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+            if changed:
+                print(f"Corrected {changed} stale file size(s).")
+            if on_done is not None:
+                on_done(changed)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_size_index():
+    """Returns the size index shared by the explorer, the favorites and the folder stats."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SizeIndex()
+        return _index
+
+
+if __name__ == "__main__":
+    import time
+
+    index = get_size_index()
+    start = time.perf_counter()
+    index.sync()
+    print(f"Loaded {len(index._sizes)} sizes in {time.perf_counter() - start:.2f}s.")
+    sample = list(index._sizes)[:1000]
+    start = time.perf_counter()
+    total = index.total_size(sample)
+    print(f"Total of {len(sample)} files: {total} bytes in {(time.perf_counter() - start) * 1000:.1f} ms.")
+    done = threading.Event()
+    index.refresh(sample, on_done=lambda changed: done.set())
+    done.wait()
@@ -1,14 +1,24 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import csv
 from datetime import datetime
 import os
 import re
-from player_constants import ALL_MEDIA_CSV, DELETE_FILES_CSV, FILE_TRANSFER_LOG, FILES_FOLDER, FOLDER_LOGS, LOG_PATH, SCREENSHOTS_FOLDER, SNIPPETS_HISTORY_CSV, WATCHED_HISTORY_LOG_PATH
+from player_constants import ALL_MEDIA_CSV, DELETE_FILES_CSV, FILE_TRANSFER_LOG, FILES_FOLDER, FOLDER_LOGS, LOG_PATH, SCREENSHOTS_FOLDER, SNIPPETS_HISTORY_CSV, USE_MEDIA_CATALOG, WATCHED_HISTORY_LOG_PATH
 from logs_writer import LogManager
+from screenshot_index import get_screenshot_index
 from collections import defaultdict, deque
 
 logger = LogManager(LOG_PATH)
 
+MEDIA_CSV_HEADER = [
+    "File Name",
+    "File Type",
+    "File Size (Bytes)",
+    "File Size (Human Readable)",
+    "Creation Date",
+    "Modification Date",
+    "Source Folder"
+]
+
 def create_csv_file(headers=None, filename="New_CSV.csv"):
     if os.path.exists(filename):
         # print(f"{filename} File Exists...")
@@ -159,19 +169,17 @@ def gather_all_media():
     try:
         LOG_FOLDERS_CSV = FOLDER_LOGS
         OUTPUT_CSV = ALL_MEDIA_CSV
-        HEADER = [
-            "File Name",
-            "File Type",
-            "File Size (Bytes)",
-            "File Size (Human Readable)",
-            "Creation Date",
-            "Modification Date",
-            "Source Folder"
-        ]
+        HEADER = MEDIA_CSV_HEADER
         if not os.path.exists(LOG_FOLDERS_CSV):
             create_csv_file(headers=["Folder Path","Csv Path","Date"], filename=LOG_FOLDERS_CSV)
             create_csv_file(headers=HEADER, filename=OUTPUT_CSV)
             return OUTPUT_CSV
+        if USE_MEDIA_CATALOG:
+            # imported here as media_catalog itself depends on this module
+            from media_catalog import MediaCatalog
+            catalog = MediaCatalog()
+            catalog.sync_logged_folders(LOG_FOLDERS_CSV)
+            return catalog.export_csv(OUTPUT_CSV)
         seen = set()
         csv_paths = set()
         with open(LOG_FOLDERS_CSV, newline='', encoding='utf-8') as logf:
@@ -210,6 +218,38 @@ def gather_all_media():
         print(f"Error gathering all media: {e}")
         return None
 
+def get_all_media_files():
+    """
+    Returns (file_path, size in bytes) for every file of the scanned folders.
+    Reads the media catalog when it is enabled, and ALL_MEDIA.csv otherwise.
+    """
+    if USE_MEDIA_CATALOG:
+        try:
+            from media_catalog import MediaCatalog
+            catalog = MediaCatalog()
+            catalog.sync_logged_folders(FOLDER_LOGS)
+            return catalog.get_all_media()
+        except Exception as e:
+            logger.error_logs(f"Error reading media catalog: {e}")
+            print(f"Error reading media catalog, falling back to {ALL_MEDIA_CSV}: {e}")
+
+    csv_path = gather_all_media()
+    if not csv_path:
+        return None
+    media_files = []
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            source_folder = row.get("Source Folder", "")
+            if not source_folder:
+                continue
+            try:
+                size = int(float(row.get("File Size (Bytes)", 0)))
+            except (ValueError, TypeError):
+                size = 0
+            media_files.append((os.path.join(source_folder, row.get("File Name", "")), size))
+    return media_files
+
 def seconds_to_hhmmss(seconds):
         hours = int(seconds) // 3600
         minutes = (int(seconds) % 3600) // 60
@@ -275,17 +315,14 @@ def get_screenshots_for_file(filename):
     If no screenshots are found, returns an empty list.
     Handles errors gracefully.
     """
-    screenshots = []
     if not filename:
         print("No filename provided.")
-        return screenshots
+        return []
     try:
         if not os.path.exists(SCREENSHOTS_FOLDER):
             print(f"Screenshots folder does not exist: {SCREENSHOTS_FOLDER}")
-            return screenshots
-        for file in os.listdir(SCREENSHOTS_FOLDER):
-            if file.startswith(f"screenshot_{filename}_") and file.endswith(".png"):
-                screenshots.append(os.path.join(SCREENSHOTS_FOLDER, file))
+            return []
+        screenshots = get_screenshot_index(SCREENSHOTS_FOLDER).get(filename)
         if not screenshots:
             print(f"No screenshots found for file: {filename}")
         return screenshots
@@ -330,26 +367,11 @@ def get_file_transfer_history(file_path):
     Returns:
         dict: {'previous': <previous_path or None>, 'current': <file_path>, 'destination': <destination_path or None>}
     """
-    previous = None
-    destination = None
-    if not os.path.exists(FILE_TRANSFER_LOG):
-        print(f"Transfer log not found: {FILE_TRANSFER_LOG}")
-        return {'previous': None, 'current': normalise_path(file_path), 'destination': None}
+    # imported here as transfer_lineage depends on this module
+    from transfer_lineage import get_transfer_lineage
+
     try:
-        with open(FILE_TRANSFER_LOG, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                src = row.get("Source Path")
-                dst = row.get("Destination Path")
-                if src and os.path.normcase(src) == os.path.normcase(file_path):
-                    destination = dst
-                if dst and os.path.normcase(dst) == os.path.normcase(file_path):
-                    previous = src
-        return {
-            'previous': normalise_path(previous) if previous else None,
-            'current': normalise_path(file_path),
-            'destination': normalise_path(destination) if destination else None
-        }
+        return get_transfer_lineage(FILE_TRANSFER_LOG).get_history(file_path)
     except Exception as e:
         print(f"Error reading transfer log: {e}")
         return {'previous': None, 'current': normalise_path(file_path), 'destination': None}
@@ -404,94 +426,37 @@ def get_watch_stats_for_filenames(file_paths):
     Efficiently get combined watch stats for a set of filenames
     derived from related file paths.
     Matches only by filename, not full path.
+    Served from the per-file aggregates in watch_stats_index.py instead of scanning the history.
     """
-    filenames = set(os.path.basename(p).lower() for p in file_paths)
-
-    watch_count = 0
-    total_seconds = 0
-    last_watched = None
+    # imported here as watch_stats_index depends on this module
+    from watch_stats_index import get_watch_stats_index
 
     try:
-        with open(WATCHED_HISTORY_LOG_PATH, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                row_filename = os.path.basename(row.get("File Name", "")).lower()
-                if row_filename in filenames:
-                    watch_count += 1
-
-                    try:
-                        total_seconds += calculate_duration_in_seconds(row.get("Duration Watched", "0:00.0"))
-                    except Exception:
-                        pass
-
-                    try:
-                        dt = datetime.strptime(row.get("Date Watched", ""), "%Y-%m-%d %H:%M:%S")
-                        if not last_watched or dt > last_watched:
-                            last_watched = dt
-                    except Exception:
-                        pass
+        return get_watch_stats_index(WATCHED_HISTORY_LOG_PATH).get_stats(file_paths)
     except Exception as e:
         print("Error reading watch log:", e)
-
-    return {
-        "watch_count": watch_count,
-        "total_seconds": total_seconds,
-        "last_watched": last_watched.strftime("%Y-%m-%d %H:%M:%S") if last_watched else "Never"
-    }
+        return {"watch_count": 0, "total_seconds": 0, "last_watched": "Never"}
 
 
 
 def calculate_duration_in_seconds(duration_str):
         """
         Convert a duration string (e.g., '00:10.8' or '00:00:10.8') to seconds.
+        Columns of durations should use history_parsing.durations_seconds instead.
         """
-        if '.' in duration_str:
-            duration_parts = duration_str.split('.')
-            if ':' in duration_parts[0]:
-                # case for format HH:MM:SS.microseconds
-                time_part = datetime.strptime(duration_parts[0], '%H:%M:%S')
-            else:
-                # case for format MM:SS.microseconds
-                time_part = datetime.strptime(duration_parts[0], '%M:%S')
-            
-            seconds = time_part.hour * 3600 + time_part.minute * 60 + time_part.second + float(f"0.{duration_parts[1]}")
-        else:
-            if ':' in duration_str:
-                # case for format HH:MM:SS
-                time_part = datetime.strptime(duration_str, '%H:%M:%S')
-            else:
-                # case for format MM:SS
-                time_part = datetime.strptime(duration_str, '%M:%S')
-            
-            seconds = time_part.hour * 3600 + time_part.minute * 60 + time_part.second
-        
-        return seconds
+        from history_parsing import durations_seconds
 
+        seconds = durations_seconds([duration_str])[0]
+        if seconds != seconds:
+            raise ValueError(f"Invalid duration: {duration_str}")
+        return float(seconds)
 
-def get_all_related_paths(target_path):
-    graph = defaultdict(set)
-    
-    with open(FILE_TRANSFER_LOG, newline='', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            src = normalise_path(row['Source Path'])
-            dst = normalise_path(row['Destination Path'])
-            graph[src].add(dst)
-            graph[dst].add(src)
-
-    target_path = normalise_path(target_path)
-    visited = set()
-    queue = deque([target_path])
-    related_paths = []
 
-    while queue:
-        path = queue.popleft()
-        if path not in visited:
-            visited.add(path)
-            related_paths.append(path)
-            queue.extend(graph[path] - visited)
+def get_all_related_paths(target_path):
+    """Returns every path the file was moved from or to (transitively), including target_path, sorted."""
+    from transfer_lineage import get_transfer_lineage
 
-    return sorted(related_paths)
+    return get_transfer_lineage(FILE_TRANSFER_LOG).get_related_paths(target_path)
 
 def get_split_stats_by_folder(file_paths):
     """
@@ -500,26 +465,17 @@ def get_split_stats_by_folder(file_paths):
     Returns:
         dict: {folder_path: {"file_count": int, "total_size": int, "files": [file1, ...]}}
     """
-    from collections import defaultdict
-    folder_stats = defaultdict(lambda: {"file_count": 0, "total_size": 0, "files": []})
-    for path in file_paths:
-        folder = os.path.dirname(path)
-        try:
-            size = os.path.getsize(path)
-        except Exception:
-            size = 0
-        folder_stats[folder]["file_count"] += 1
-        folder_stats[folder]["total_size"] += size
-        folder_stats[folder]["files"].append(path)
-    return dict(folder_stats)
+    # sizes come from the folder csvs; size_index imports this module
+    from size_index import get_size_index
+
+    return get_size_index().split_by_folder(file_paths)
 
 def get_video_and_screenshots_map():
     """
-    Efficiently maps video file paths to screenshot paths using threading and optimization.
+    Maps video file paths to screenshot paths with one pass over the screenshots folder.
     Returns:
         dict: {video_path: [screenshot_path1, screenshot_path2, ...]}
     """
-    MAX_WORKERS = 2
     video_to_screenshots = {}
 
     if not os.path.exists(ALL_MEDIA_CSV):
@@ -527,24 +483,13 @@ def get_video_and_screenshots_map():
         return video_to_screenshots
 
     try:
+        by_name = get_screenshot_index(SCREENSHOTS_FOLDER).get_all()
         with open(ALL_MEDIA_CSV, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
-            video_rows = [normalise_path(row["File Name"]) for row in reader if row.get("File Name")]
-
-        def process_video(video_path):
-            try:
-                filename = os.path.basename(video_path)
-                screenshots = get_screenshots_for_file(filename)
-                return (video_path, screenshots)
-            except Exception as e:
-                print(f"Error processing {video_path}: {e}")
-                return (video_path, [])
-
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_path = {executor.submit(process_video, path): path for path in video_rows}
-            for future in as_completed(future_to_path):
-                video_path, screenshots = future.result()
-                video_to_screenshots[video_path] = screenshots
+            for row in reader:
+                if row.get("File Name"):
+                    video_path = normalise_path(row["File Name"])
+                    video_to_screenshots[video_path] = by_name.get(os.path.basename(video_path), [])
 
     except Exception as e:
         print(f"Error reading {ALL_MEDIA_CSV}: {e}")
@@ -1,12 +1,93 @@
+import atexit
 import csv
 import os
+import threading
+from path_status import get_path_status
 from static_methods import gather_all_media, normalise_path
-from player_constants import ALL_MEDIA_CSV, VIDEO_STATS_CSV, STATS_LOG_PATH
+from player_constants import ALL_MEDIA_CSV, STATS_JOURNAL_COMPACT_AFTER, VIDEO_STATS_CSV, STATS_LOG_PATH
 from logs_writer import LogManager
 from get_aspects import VideoProcessor
+from stats_query import StatsIndex
 
 logger = LogManager(STATS_LOG_PATH)
 
+# Guards the stats csv and its journal; shared by every VideoStatsManager in the process.
+_journal_lock = threading.RLock()
+_journals_in_use = set()
+
+JOURNAL_UPSERT = "U"
+JOURNAL_DELETE = "D"
+
+
+def get_journal_path(stats_csv):
+    """Returns the path of the write-ahead journal kept next to a stats csv."""
+    return os.path.splitext(stats_csv)[0] + "_Journal.csv"
+
+
+def load_stats(stats_csv=VIDEO_STATS_CSV):
+    """
+    Loads the stats csv and replays its journal on top of it.
+
+    Returns:
+        tuple: (stats dict keyed by (normalised path, size), number of journal entries replayed)
+    """
+    stats = {}
+    with _journal_lock:
+        if os.path.exists(stats_csv):
+            with open(stats_csv, newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    stats[(normalise_path(row["File Path"]), row["File Size"])] = row
+
+        entries = 0
+        journal_path = get_journal_path(stats_csv)
+        if os.path.exists(journal_path):
+            with open(journal_path, newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    op = row.pop("Op", None)
+                    if not row.get("File Path"):
+                        continue
+                    key = (normalise_path(row["File Path"]), row["File Size"])
+                    if op == JOURNAL_DELETE:
+                        stats.pop(key, None)
+                    elif op == JOURNAL_UPSERT:
+                        stats[key] = row
+                    entries += 1
+    return stats, entries
+
+
+def compact_stats(stats_csv=VIDEO_STATS_CSV):
+    """
+    Folds the journal into the stats csv and empties the journal.
+    The merge is re-read from disk, so journal entries of every manager instance are kept.
+    """
+    journal_path = get_journal_path(stats_csv)
+    with _journal_lock:
+        if not os.path.exists(journal_path) or os.path.getsize(journal_path) == 0:
+            return
+        try:
+            stats, entries = load_stats(stats_csv)
+            temp_path = stats_csv + ".temp"
+            with open(temp_path, "w", newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=VideoStatsManager.STATS_HEADER, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(stats.values())
+            os.replace(temp_path, stats_csv)
+            os.remove(journal_path)
+            print(f"[Stats Compacted] {entries} journal entries merged into {stats_csv}")
+        except Exception as e:
+            print(f"Error compacting stats journal: {e}")
+            logger.error_logs(f"{e} While Compacting {journal_path}")
+
+
+def _compact_at_exit():
+    for stats_csv in list(_journals_in_use):
+        compact_stats(stats_csv)
+
+
+atexit.register(_compact_at_exit)
+
 class VideoStatsManager:
     STATS_HEADER = [
         "File Path", "File Size", "Duration (s)", "Resolution", "Aspect Ratio", "Orientation",
@@ -14,21 +95,52 @@ class VideoStatsManager:
         "Profile", "Level", "Audio Codec", "Audio Channels", "Audio Sample Rate"
     ]
 
-    def __init__(self, stats_csv=VIDEO_STATS_CSV):
+    def __init__(self, stats_csv=VIDEO_STATS_CSV, probe_cache=None, compact_after=STATS_JOURNAL_COMPACT_AFTER):
+        """
+        Args:
+            stats_csv (str, optional): Path of the stats csv. Defaults to VIDEO_STATS_CSV.
+            probe_cache (ProbeCache, optional): Cache consulted before spawning ffprobe.
+            compact_after (int, optional): Journal entries after which the journal is folded
+                into the stats csv in the background. Defaults to STATS_JOURNAL_COMPACT_AFTER.
+        """
         self.stats_csv = stats_csv
-        self.stats = self._load_existing_stats()
-        self.processor = VideoProcessor()
+        self.journal_path = get_journal_path(stats_csv)
+        self.compact_after = compact_after
+        self._compacting = False
+        self.stats, self._journal_entries = load_stats(stats_csv)
+        _journals_in_use.add(stats_csv)
+        self.index = StatsIndex(self.stats)
+        # the processor consults the shared probe cache before spawning ffprobe
+        self.processor = VideoProcessor(probe_cache=probe_cache)
 
     def _load_existing_stats(self):
-        stats = {}
-        if not os.path.exists(self.stats_csv):
-            return stats
-        with open(self.stats_csv, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                key = (normalise_path(row["File Path"]), row["File Size"])
-                stats[key] = row
-        return stats
+        return load_stats(self.stats_csv)[0]
+
+    def _append_journal(self, entries):
+        """
+        Appends (op, row) entries to the journal; an O(1) write per mutated file.
+        Triggers a background compaction once the journal grows past compact_after entries.
+        """
+        with _journal_lock:
+            file_exists = os.path.exists(self.journal_path)
+            with open(self.journal_path, "a", newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=["Op"] + self.STATS_HEADER, extrasaction="ignore")
+                if not file_exists:
+                    writer.writeheader()
+                for op, row in entries:
+                    writer.writerow({**row, "Op": op})
+            self._journal_entries += len(entries)
+            if self._journal_entries >= self.compact_after and not self._compacting:
+                self._compacting = True
+                threading.Thread(target=self.compact, daemon=True).start()
+
+    def compact(self):
+        """Folds the journal into the stats csv."""
+        try:
+            compact_stats(self.stats_csv)
+            self._journal_entries = 0
+        finally:
+            self._compacting = False
 
     def create_stats(self):
         all_media_csv = gather_all_media()
@@ -36,17 +148,18 @@ class VideoStatsManager:
             logger.error_logs("All media CSV not found or failed to generate.")
             return
 
-        files_to_process = []
         with open(all_media_csv, newline='', encoding='utf-8') as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                file_path = normalise_path(os.path.join(row["Source Folder"], row["File Name"]))
-                if not os.path.exists(file_path):
-                    continue
-                file_size = str(os.path.getsize(file_path))
-                key = (file_path, file_size)
-                if key not in self.stats:
-                    files_to_process.append(file_path)
+            file_paths = [normalise_path(os.path.join(row["Source Folder"], row["File Name"])) for row in reader]
+
+        # one folder listing answers the existence and size of all its files
+        files_to_process = []
+        for file_path, status in zip(file_paths, get_path_status().statuses(file_paths)):
+            if status is None:
+                continue
+            key = (file_path, str(status[1]))
+            if key not in self.stats:
+                files_to_process.append(file_path)
 
         if not files_to_process:
             print("No new files to process.")
@@ -61,77 +174,117 @@ class VideoStatsManager:
         print(f"Processed {len(new_stats)} new files.")
 
     def _write_stats(self, new_stats):
-        file_exists = os.path.exists(self.stats_csv)
-        with open(self.stats_csv, "a", newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.STATS_HEADER)
-            if not file_exists:
-                writer.writeheader()
-            for row in new_stats:
-                writer.writerow(row)
-                key = (normalise_path(row["File Path"]), row["File Size"])
-                self.stats[key] = row
+        self._append_journal([(JOURNAL_UPSERT, row) for row in new_stats])
+        for row in new_stats:
+            key = (normalise_path(row["File Path"]), row["File Size"])
+            self.stats[key] = row
+            self.index.add(key, row)
 
     def read_stats(self, filters=None):
-        results = []
-        with open(self.stats_csv, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if not filters or all(row.get(k) == v for k, v in filters.items()):
-                    results.append(row)
-        return results
+        """
+        Returns the stats rows matching every column/value pair in filters.
+        Served from memory; Orientation and Video Codec filters go through the index.
+        """
+        keys = None
+        for column, field in (("Orientation", "orientation"), ("Video Codec", "codec")):
+            if filters and column in filters:
+                matched = self.index.lookup(field, filters[column])
+                keys = matched if keys is None else keys & matched
+        rows = self.stats.values() if keys is None else (self.stats[key] for key in sorted(keys) if key in self.stats)
+        return [dict(row) for row in rows if not filters or all(row.get(k) == v for k, v in filters.items())]
+
+    def query(self, expression, file_paths=None):
+        """
+        Returns the paths of the videos whose stats match a query expression, without any ffprobe calls.
+
+        Args:
+            expression (str): e.g. "duration>600 and codec=h264 and orientation=Vertical" (see stats_query.parse_query).
+            file_paths (list, optional): Only return paths from this list (e.g. the files of the current table).
+
+        Returns:
+            list: Matching file paths, in the order of file_paths when given.
+
+        Raises:
+            StatsQueryError: If the expression cannot be parsed.
+        """
+        keys = self.index.query(expression)
+        if file_paths is None:
+            return sorted(self.stats[key]["File Path"] for key in keys)
+        matched = {key[0] for key in keys}
+        return [file_path for file_path in file_paths if normalise_path(file_path) in matched]
 
     def update_stat(self, file_path, file_size, updates: dict):
-        updated = False
-        rows = []
-        with open(self.stats_csv, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if (normalise_path(row["File Path"]), row["File Size"]) == (normalise_path(file_path), str(file_size)):
-                    row.update(updates)
-                    updated = True
-                rows.append(row)
-        with open(self.stats_csv, "w", newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.STATS_HEADER)
-            writer.writeheader()
-            writer.writerows(rows)
-        if updated:
-            self.stats[(normalise_path(file_path), str(file_size))] = updates
-        return updated
+        key = (normalise_path(file_path), str(file_size))
+        if key not in self.stats:
+            return False
+        row = {**self.stats[key], **updates}
+        self._append_journal([(JOURNAL_UPSERT, row)])
+        self.stats[key] = row
+        self.index.add(key, row)
+        return True
 
     def delete_stat(self, file_path, file_size):
-        deleted = False
-        rows = []
-        with open(self.stats_csv, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if (normalise_path(row["File Path"]), row["File Size"]) == (normalise_path(file_path), str(file_size)):
-                    deleted = True
-                    continue
-                rows.append(row)
-        with open(self.stats_csv, "w", newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.STATS_HEADER)
-            writer.writeheader()
-            writer.writerows(rows)
-        if deleted:
-            logger.update_logs("[STATS DELETED]", file_path)
-            self.stats.pop((normalise_path(file_path), str(file_size)), None)
-        return deleted
+        key = (normalise_path(file_path), str(file_size))
+        row = self.stats.get(key)
+        if row is None:
+            return False
+        self._append_journal([(JOURNAL_DELETE, {"File Path": row["File Path"], "File Size": row["File Size"]})])
+        self.stats.pop(key, None)
+        self.index.remove(key)
+        logger.update_logs("[STATS DELETED]", file_path)
+        return True
+
+    def move_stats(self, path_mapping):
+        """
+        Re-keys the stats of moved files without probing them again. A move keeps the
+        file size, so each row is carried over to its new path; only files that had no
+        stats yet are probed, in one batch. All changes go to the journal in one append.
+
+        Args:
+            path_mapping (dict): Old file path -> new file path.
+
+        Returns:
+            int: Number of stats rows moved or added.
+        """
+        entries = []
+        to_process = []
+        for old_path, new_path in path_mapping.items():
+            new_path = normalise_path(new_path)
+            try:
+                file_size = str(os.path.getsize(new_path))
+            except OSError:
+                continue
+            old_key = (normalise_path(old_path), file_size)
+            row = self.stats.pop(old_key, None)
+            if row is None:
+                if (new_path, file_size) not in self.stats:
+                    to_process.append(new_path)
+                continue
+            self.index.remove(old_key)
+            new_row = {**row, "File Path": new_path}
+            new_key = (new_path, file_size)
+            self.stats[new_key] = new_row
+            self.index.add(new_key, new_row)
+            entries.append((JOURNAL_DELETE, {"File Path": row["File Path"], "File Size": row["File Size"]}))
+            entries.append((JOURNAL_UPSERT, new_row))
+            logger.update_logs("[STATS MOVED]", f"{old_path} -> {new_path}")
+
+        if entries:
+            self._append_journal(entries)
+        added = 0
+        if to_process:
+            new_stats = [r for r in self.processor.process_videos(to_process) if r]
+            self._write_stats(new_stats)
+            added = len(new_stats)
+        return len(entries) // 2 + added
 
     def get_vertical_videos(self):
         """Return list of vertical video file paths from stats."""
-        vertical = []
-        for row in self.stats.values():
-            if row.get("Orientation") == "Vertical":
-                vertical.append(row["File Path"])
-        return vertical
+        return sorted(self.stats[key]["File Path"] for key in self.index.lookup("orientation", "Vertical"))
 
     def get_horizontal_videos(self):
         """Return list of horizontal video file paths from stats."""
-        horizontal = []
-        for row in self.stats.values():
-            if row.get("Orientation") == "Horizontal":
-                horizontal.append(row["File Path"])
-        return horizontal
+        return sorted(self.stats[key]["File Path"] for key in self.index.lookup("orientation", "Horizontal"))
 
     def refresh_stats(self, file_path, file_size=None):
         """
@@ -175,12 +328,9 @@ class VideoStatsManager:
             return False 
 
         new_row = result[0]
-        with open(self.stats_csv, "a", newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.STATS_HEADER)
-            if os.stat(self.stats_csv).st_size == 0:
-                writer.writeheader()
-            writer.writerow(new_row)
+        self._append_journal([(JOURNAL_UPSERT, new_row)])
         self.stats[key] = new_row
+        self.index.add(key, new_row)
         logger.update_logs("[STATS ADDED]",file_path)
         print(f"[Processed Stats] {file_path}")
         return True
@@ -0,0 +1,246 @@
+import re
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+
+class StatsQueryError(ValueError):
+    """Raised when a stats query expression cannot be parsed."""
+
+
+RESOLUTION_BUCKETS = [(2160, "2160p"), (1440, "1440p"), (1080, "1080p"), (720, "720p"), (480, "480p"), (0, "sd")]
+RESOLUTION_ALIASES = {"4k": "2160p", "uhd": "2160p", "2k": "1440p", "qhd": "1440p", "fhd": "1080p", "hd": "720p"}
+
+# query field -> Video_Stats.csv column
+CATEGORICAL_FIELDS = {
+    "orientation": "Orientation",
+    "codec": "Video Codec",
+    "format": "Format",
+    "audio": "Audio Codec",
+}
+NUMERIC_FIELDS = {
+    "duration": "Duration (s)",
+    "bitrate": "Bitrate (kbps)",
+    "fps": "Frame Rate",
+}
+
+_CONDITION = re.compile(r"^\s*([a-z_]+)\s*(>=|<=|!=|=|>|<)\s*(.+?)\s*$")
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)\s*([smh]?)$")
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def resolution_short_side(resolution):
+    """Returns the shorter side of a "WIDTHxHEIGHT" resolution string, or None."""
+    try:
+        width, height = (int(part) for part in str(resolution).lower().split("x"))
+    except (TypeError, ValueError):
+        return None
+    return min(width, height)
+
+
+def resolution_bucket(resolution):
+    """Buckets a "WIDTHxHEIGHT" resolution by its shorter side, e.g. 1920x1080 -> "1080p"."""
+    short_side = resolution_short_side(resolution)
+    if short_side is None:
+        return None
+    for threshold, name in RESOLUTION_BUCKETS:
+        if short_side >= threshold:
+            return name
+    return None
+
+
+def _parse_number(field, value):
+    value = value.lower()
+    if field == "duration":
+        match = _DURATION.match(value)
+        if match:
+            return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    elif field == "resolution":
+        value = RESOLUTION_ALIASES.get(value, value)
+        number = _to_float(value[:-1] if value.endswith("p") else value)
+        if number is not None:
+            return number
+    else:
+        number = _to_float(value)
+        if number is not None:
+            return number
+    raise StatsQueryError(f"Invalid value for {field}: {value}")
+
+
+def parse_query(expression):
+    """
+    Parses a query such as "duration>10m and codec=h264 and orientation=Vertical".
+
+    Conditions are joined with "and". Text fields (orientation, codec, format, audio)
+    support = and !=, numeric fields (duration, bitrate, fps) and resolution also support
+    <, <=, > and >=. Durations accept s/m/h suffixes and resolutions accept buckets such
+    as 720p, 1080p or 4k.
+
+    Returns:
+        list: (field, operator, value) tuples.
+
+    Raises:
+        StatsQueryError: If a condition cannot be parsed.
+    """
+    conditions = []
+    for part in re.split(r"\s+and\s+", expression.strip(), flags=re.IGNORECASE):
+        if not part.strip():
+            continue
+        match = _CONDITION.match(part.lower())
+        if not match:
+            raise StatsQueryError(f"Invalid condition: {part}")
+        field, op, value = match.groups()
+        value = value.strip("\"'")
+        if field in CATEGORICAL_FIELDS:
+            if op not in ("=", "!="):
+                raise StatsQueryError(f"{field} only supports = and !=")
+        elif field == "resolution":
+            bucket = RESOLUTION_ALIASES.get(value, value)
+            if op in ("=", "!=") and bucket in {name for _, name in RESOLUTION_BUCKETS}:
+                value = bucket
+            else:
+                value = _parse_number(field, value)
+        elif field in NUMERIC_FIELDS:
+            value = _parse_number(field, value)
+        else:
+            raise StatsQueryError(f"Unknown field: {field}")
+        conditions.append((field, op, value))
+    if not conditions:
+        raise StatsQueryError("Empty query")
+    return conditions
+
+
+class StatsIndex:
+    """
+    In-memory secondary indexes over Video_Stats rows.
+
+    Text fields and resolution buckets map each (lowercased) value to the set of row keys
+    having it. Numeric fields keep their values sorted next to the row keys so ranges are
+    answered with bisect instead of a scan over every row.
+    """
+
+    def __init__(self, rows=None):
+        """
+        Args:
+            rows (dict, optional): Rows keyed like VideoStatsManager.stats, i.e. by (path, size).
+        """
+        self.rows = {}
+        self._values = {field: {} for field in list(CATEGORICAL_FIELDS) + ["resolution"]}
+        self._numbers = {field: ([], []) for field in list(NUMERIC_FIELDS) + ["resolution"]}
+        # built with one sort per numeric field; add() inserts into the sorted lists afterwards
+        pairs = {field: [] for field in self._numbers}
+        for key, row in (rows or {}).items():
+            self.rows[key] = row
+            values, numbers = self._row_values(row)
+            self._add_values(key, values)
+            for field, number in numbers.items():
+                if number is not None:
+                    pairs[field].append((number, key))
+        for field, field_pairs in pairs.items():
+            field_pairs.sort(key=itemgetter(0))
+            self._numbers[field] = ([number for number, key in field_pairs], [key for number, key in field_pairs])
+
+    def _row_values(self, row):
+        values = {field: (row.get(column) or "").strip().lower() or None for field, column in CATEGORICAL_FIELDS.items()}
+        values["resolution"] = resolution_bucket(row.get("Resolution"))
+        numbers = {field: _to_float(row.get(column)) for field, column in NUMERIC_FIELDS.items()}
+        short_side = resolution_short_side(row.get("Resolution"))
+        numbers["resolution"] = float(short_side) if short_side is not None else None
+        return values, numbers
+
+    def add(self, key, row):
+        """Indexes a row, replacing any row already indexed under the same key."""
+        if key in self.rows:
+            self.remove(key)
+        self.rows[key] = row
+        values, numbers = self._row_values(row)
+        self._add_values(key, values)
+        for field, number in numbers.items():
+            if number is not None:
+                sorted_values, keys = self._numbers[field]
+                i = bisect_right(sorted_values, number)
+                sorted_values.insert(i, number)
+                keys.insert(i, key)
+
+    def _add_values(self, key, values):
+        for field, value in values.items():
+            if value is not None:
+                self._values[field].setdefault(value, set()).add(key)
+
+    def remove(self, key):
+        """Drops a row from every index. Unknown keys are ignored."""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        values, numbers = self._row_values(row)
+        for field, value in values.items():
+            keys = self._values[field].get(value)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._values[field][value]
+        for field, number in numbers.items():
+            if number is None:
+                continue
+            sorted_values, keys = self._numbers[field]
+            for i in range(bisect_left(sorted_values, number), bisect_right(sorted_values, number)):
+                if keys[i] == key:
+                    del sorted_values[i]
+                    del keys[i]
+                    break
+
+    def _match(self, field, op, value):
+        if field in self._values and isinstance(value, str):
+            matched = set(self._values[field].get(value, ()))
+            return matched if op == "=" else set(self.rows) - matched
+
+        sorted_values, keys = self._numbers[field]
+        if op == "=":
+            start, end = bisect_left(sorted_values, value), bisect_right(sorted_values, value)
+        elif op == ">":
+            start, end = bisect_right(sorted_values, value), len(keys)
+        elif op == ">=":
+            start, end = bisect_left(sorted_values, value), len(keys)
+        elif op == "<":
+            start, end = 0, bisect_left(sorted_values, value)
+        elif op == "<=":
+            start, end = 0, bisect_right(sorted_values, value)
+        else:  # !=
+            return set(self.rows) - set(keys[bisect_left(sorted_values, value):bisect_right(sorted_values, value)])
+        return set(keys[start:end])
+
+    def query(self, expression):
+        """
+        Returns the keys of the rows matching a query expression (see parse_query).
+
+        Raises:
+            StatsQueryError: If the expression cannot be parsed.
+        """
+        result = None
+        for field, op, value in parse_query(expression):
+            matched = self._match(field, op, value)
+            result = matched if result is None else result & matched
+            if not result:
+                break
+        return result or set()
+
+    def lookup(self, field, value):
+        """Returns the keys of the rows whose text field (or resolution bucket) equals value."""
+        return set(self._values[field].get(str(value).lower(), ()))
+
+
+if __name__ == "__main__":
+    demo = StatsIndex({
+        ("a.mp4", "1"): {"File Path": "a.mp4", "Orientation": "Vertical", "Video Codec": "h264", "Resolution": "1080x1920", "Duration (s)": "700", "Bitrate (kbps)": "4000"},
+        ("b.mkv", "2"): {"File Path": "b.mkv", "Orientation": "Horizontal", "Video Codec": "hevc", "Resolution": "3840x2160", "Duration (s)": "120", "Bitrate (kbps)": "15000"},
+    })
+    for expression in ["duration>600 and codec=h264 and orientation=Vertical", "resolution>=4k", "bitrate<5000 or"]:
+        try:
+            print(expression, "->", demo.query(expression))
+        except StatsQueryError as e:
+            print(expression, "->", e)
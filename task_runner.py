@@ -0,0 +1,114 @@
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised by Task.check() once a newer task has replaced the task."""
+
+
+class Task:
+    """Handle of one background query: its cancellation flag and its way back to the Tk thread."""
+
+    def __init__(self, root):
+        self.root = root
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check(self):
+        """Stops the task (by raising TaskCancelled) if it was cancelled. Call it between chunks of work."""
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def post(self, callback, *args):
+        """Runs callback(*args) on the Tk thread, unless the task is cancelled by then."""
+        def run():
+            if not self._cancelled.is_set():
+                callback(*args)
+        self.root.after(0, run)
+
+
+class TaskRunner:
+    """
+    Runs the explorer's queries one at a time, off the Tk thread.
+
+    run() cancels the query still in flight before starting the new one, so only the
+    latest query can touch the table. Work functions receive their Task, check it
+    between chunks and post partial results back to the Tk thread with task.post();
+    posts are delivered in order and dropped once the task is cancelled.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.current = None
+        self._lock = threading.Lock()
+
+    def run(self, work, on_done=None, on_error=None):
+        """
+        Starts work(task) on a daemon thread.
+
+        Args:
+            work (callable): Takes the Task, returns the result handed to on_done.
+            on_done (callable, optional): Called on the Tk thread with the result.
+            on_error (callable, optional): Called on the Tk thread with the exception work raised.
+
+        Returns:
+            Task: The started task.
+        """
+        task = Task(self.root)
+        with self._lock:
+            if self.current is not None:
+                self.current.cancel()
+            self.current = task
+
+        def worker():
+            try:
+                result = work(task)
+            except TaskCancelled:
+                return
+            except Exception as e:
+                print(f"Background task failed: {e}")
+                if on_error is not None:
+                    task.post(on_error, e)
+                return
+            task.post(self._finish, task, on_done, result)
+
+        threading.Thread(target=worker, daemon=True).start()
+        return task
+
+    def _finish(self, task, on_done, result):
+        with self._lock:
+            if self.current is task:
+                self.current = None
+        if on_done is not None:
+            on_done(result)
+
+    def cancel(self):
+        """Cancels the query in flight, if any."""
+        with self._lock:
+            if self.current is not None:
+                self.current.cancel()
+                self.current = None
+
+
+if __name__ == "__main__":
+    import time
+    import tkinter as tk
+
+    root = tk.Tk()
+    runner = TaskRunner(root)
+
+    def count(task, label):
+        for i in range(5):
+            task.check()
+            task.post(print, f"{label}: chunk {i}")
+            time.sleep(0.1)
+        return label
+
+    runner.run(lambda task: count(task, "first"))
+    root.after(250, lambda: runner.run(lambda task: count(task, "second"), on_done=lambda r: (print(f"{r} done"), root.destroy())))
+    root.mainloop()
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from logs_writer import LogManager
+from player_constants import (
+    IMAGE_PREVIEW_MEMORY_ITEMS,
+    LOG_PATH,
+    THUMBNAIL_CACHE_FOLDER,
+    THUMBNAIL_CACHE_MEMORY_ITEMS,
+    THUMBNAIL_DISK_CACHE_MB,
+    THUMBNAIL_WORKERS,
+)
+from static_methods import ensure_folder_exists
+
+# new thumbnails saved between two checks of the disk cache size
+_PRUNE_EVERY = 200
+
+
+class _LRU:
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key, item):
+        with self._lock:
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+
+def _decode(path, size):
+    """Opens an image and shrinks it to fit size, letting JPEG decode straight at a reduced scale."""
+    with Image.open(path) as img:
+        img.draft("RGB", size)  # no-op for formats other than JPEG
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        img.load()
+        return img
+
+
+class ThumbnailCache:
+    """
+    Thumbnails and previews of image files, keyed by (path, mtime, file size, requested size).
+
+    Thumbnails are kept in a memory LRU and as JPEGs in THUMBNAIL_CACHE_FOLDER, so a
+    screenshot is decoded at full size once, ever, until it changes. The folder is kept
+    under THUMBNAIL_DISK_CACHE_MB by deleting the JPEGs used least recently (their mtime
+    is bumped on every disk hit), which also clears out those of changed or deleted images. Previews (images
+    fitted to the screen) are only kept in a smaller memory LRU. Both can be generated
+    ahead of time on a background pool with submit().
+    """
+
+    def __init__(self, folder=THUMBNAIL_CACHE_FOLDER, memory_items=THUMBNAIL_CACHE_MEMORY_ITEMS, preview_items=IMAGE_PREVIEW_MEMORY_ITEMS,
+                 disk_cache_mb=THUMBNAIL_DISK_CACHE_MB):
+        self.folder = folder
+        self.disk_cache_bytes = disk_cache_mb * 1024 * 1024
+        self._saved = 0
+        self._saved_lock = threading.Lock()
+        self.logger = LogManager(LOG_PATH)
+        self._thumbnails = _LRU(memory_items)
+        self._previews = _LRU(preview_items)
+        self._pool = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+        self._pool.submit(self.prune_disk_cache)
+
+    def _key(self, path, size):
+        stat = os.stat(path)
+        return f"{os.path.normcase(os.path.abspath(path))}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+
+    def _disk_path(self, key):
+        return os.path.join(self.folder, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jpg")
+
+    def get_thumbnail(self, path, size=(150, 150)):
+        """
+        Returns a PIL image of path fitted inside size, from memory, disk or freshly decoded.
+
+        Raises:
+            OSError: If the image can't be read.
+        """
+        key = self._key(path, size)
+        thumbnail = self._thumbnails.get(key)
+        if thumbnail is not None:
+            return thumbnail
+
+        disk_path = self._disk_path(key)
+        try:
+            with Image.open(disk_path) as img:
+                img.load()
+                thumbnail = img
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Regenerating unreadable thumbnail {disk_path}: {e}")
+        if thumbnail is not None:
+            try:
+                os.utime(disk_path)  # recently used, kept by prune_disk_cache
+            except OSError:
+                pass
+
+        if thumbnail is None:
+            thumbnail = _decode(path, size)
+            try:
+                ensure_folder_exists(self.folder)
+                temp_path = disk_path + ".temp"
+                thumbnail.save(temp_path, "JPEG", quality=90)
+                os.replace(temp_path, disk_path)
+                self._count_saved()
+            except OSError as e:
+                print(f"Error saving thumbnail of {path}: {e}")
+                self.logger.error_logs(f"{e} While Saving Thumbnail of {path}")
+
+        self._thumbnails.put(key, thumbnail)
+        return thumbnail
+
+    def _count_saved(self):
+        with self._saved_lock:
+            self._saved += 1
+            due = self._saved % _PRUNE_EVERY == 0
+        if due:
+            self._pool.submit(self.prune_disk_cache)
+
+    def prune_disk_cache(self):
+        """
+        Deletes the least recently used thumbnails once the folder is over its size cap, down to 90% of it.
+
+        Returns:
+            int: Number of thumbnails deleted.
+        """
+        entries = []
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if entry.name.endswith(".jpg"):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            return 0
+        total = sum(size for mtime, size, path in entries)
+        if total <= self.disk_cache_bytes:
+            return 0
+
+        deleted = 0
+        target = self.disk_cache_bytes * 0.9
+        for mtime, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+        print(f"Pruned {deleted} thumbnail(s) from {self.folder}.")
+        return deleted
+
+    def get_preview(self, path, size):
+        """
+        Returns a PIL image of path fitted inside size (the whole image if it is smaller).
+
+        Raises:
+            OSError: If the image can't be read.
+        """
+        key = self._key(path, size)
+        preview = self._previews.get(key)
+        if preview is None:
+            preview = _decode(path, size)
+            self._previews.put(key, preview)
+        return preview
+
+    def submit(self, method, path, size):
+        """Runs get_thumbnail or get_preview (by name) on the background pool and returns its future."""
+        return self._pool.submit(getattr(self, method), path, size)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    """Returns the cache shared by every window showing thumbnails or previews."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache()
+        return _cache
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    cache = get_thumbnail_cache()
+    for image_path in sys.argv[1:]:
+        start = time.perf_counter()
+        cache.get_thumbnail(image_path)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        cache.get_thumbnail(image_path)
+        print(f"{image_path}: {first * 1000:.1f} ms, then {(time.perf_counter() - start) * 1000:.3f} ms")
@@ -0,0 +1,203 @@
+import errno
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from logs_writer import LogManager
+from path_status import get_path_status
+from player_constants import LOG_PATH, TRANSFER_BUFFER_SIZE, TRANSFER_WORKERS
+
+
+class TransferEngine:
+    """
+    Moves files using the cheapest method available for each one.
+
+    Moves that stay on the same filesystem are a single atomic rename. Moves across
+    devices are copied on a bounded worker pool into a ".part" file next to the
+    destination, using copy_file_range/sendfile where the OS provides them and large
+    buffered reads otherwise. The copy's size is verified before it is renamed into
+    place and the source is removed.
+    """
+
+    PROGRESS_INTERVAL = 0.25  # seconds between progress callbacks
+
+    def __init__(self, max_workers=TRANSFER_WORKERS, buffer_size=TRANSFER_BUFFER_SIZE, progress_callback=None):
+        """
+        Args:
+            max_workers (int, optional): Cross-device copies running at once. Defaults to TRANSFER_WORKERS.
+            buffer_size (int, optional): Chunk size of each copy call in bytes. Defaults to TRANSFER_BUFFER_SIZE.
+            progress_callback (callable, optional): Called as progress_callback(progress) with a dict of
+                "files_done", "total_files", "bytes_done", "total_bytes" and "bytes_per_sec".
+                It may be called from worker threads.
+        """
+        self.max_workers = max(1, max_workers)
+        self.buffer_size = buffer_size
+        self.progress_callback = progress_callback
+        self.logger = LogManager(LOG_PATH)
+        self._lock = threading.Lock()
+        self._reset_progress(0, 0)
+
+    def _reset_progress(self, total_files, total_bytes):
+        self._files_done = 0
+        self._bytes_done = 0
+        self._total_files = total_files
+        self._total_bytes = total_bytes
+        self._started = time.perf_counter()
+        self._last_report = 0.0
+
+    def _advance(self, nbytes=0, files=0, force=False):
+        with self._lock:
+            self._bytes_done += nbytes
+            self._files_done += files
+            now = time.perf_counter()
+            if self.progress_callback is None or (not force and now - self._last_report < self.PROGRESS_INTERVAL):
+                return
+            self._last_report = now
+            elapsed = max(now - self._started, 1e-6)
+            progress = {
+                "files_done": self._files_done,
+                "total_files": self._total_files,
+                "bytes_done": self._bytes_done,
+                "total_bytes": self._total_bytes,
+                "bytes_per_sec": self._bytes_done / elapsed,
+            }
+        try:
+            self.progress_callback(progress)
+        except Exception as e:
+            self.logger.error_logs(f"Transfer progress callback failed: {e}")
+
+    @staticmethod
+    def same_device(src, dest_dir):
+        """Returns True if src and dest_dir are on the same filesystem, so a rename can move the file."""
+        try:
+            return os.stat(src).st_dev == os.stat(dest_dir).st_dev
+        except OSError:
+            return False
+
+    def _copy_data(self, src_file, dest_file, size):
+        """Copies size bytes between two open files, zero-copy where the OS supports it."""
+        src_fd, dest_fd = src_file.fileno(), dest_file.fileno()
+        copied = 0
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied < size:
+                    sent = os.copy_file_range(src_fd, dest_fd, min(self.buffer_size, size - copied))
+                    if sent == 0:
+                        break
+                    copied += sent
+                    self._advance(sent)
+                if copied >= size:
+                    return copied
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                    raise
+
+        if hasattr(os, "sendfile") and os.name != "nt":
+            try:
+                while copied < size:
+                    sent = os.sendfile(dest_fd, src_fd, copied, min(self.buffer_size, size - copied))
+                    if sent == 0:
+                        break
+                    copied += sent
+                    self._advance(sent)
+                if copied >= size:
+                    return copied
+            except OSError as e:
+                if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                    raise
+
+        src_file.seek(copied)
+        dest_file.seek(copied)
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        while True:
+            read = src_file.readinto(buffer)
+            if not read:
+                break
+            dest_file.write(view[:read])
+            copied += read
+            self._advance(read)
+        return copied
+
+    def _copy_and_remove(self, src, dest_path):
+        size = os.path.getsize(src)
+        part_path = dest_path + ".part"
+        try:
+            with open(src, "rb") as src_file, open(part_path, "wb") as dest_file:
+                self._copy_data(src_file, dest_file, size)
+            copied_size = os.path.getsize(part_path)
+            if copied_size != size:
+                raise OSError(f"Size mismatch after copying {src}: expected {size} bytes, got {copied_size}")
+            shutil.copystat(src, part_path)
+            os.replace(part_path, dest_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        os.remove(src)
+
+    def move(self, src, dest_path):
+        """
+        Moves one file to dest_path (a full file path whose folder exists).
+
+        Returns:
+            bool: True if the file was moved.
+        """
+        try:
+            if self.same_device(src, os.path.dirname(dest_path) or "."):
+                try:
+                    size = os.path.getsize(src)
+                    os.rename(src, dest_path)
+                    self._advance(size, files=1)
+                    return True
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+            self._copy_and_remove(src, dest_path)
+            self._advance(files=1)
+            return True
+        except Exception as e:
+            print(f"[Transfer failed] {src} -> {dest_path}: {e}")
+            self.logger.error_logs(f"Transfer failed {src} -> {dest_path}: {e}")
+            return False
+        finally:
+            get_path_status().invalidate([src, dest_path])
+
+    def move_many(self, jobs):
+        """
+        Moves several files. Same-device moves are renamed right away; cross-device moves are
+        copied on the worker pool.
+
+        Args:
+            jobs (list): (src, dest_path) pairs with unique destination paths.
+
+        Returns:
+            dict: src -> dest_path of every file that was moved, in the order of jobs.
+        """
+        total_bytes = 0
+        for src, _ in jobs:
+            try:
+                total_bytes += os.path.getsize(src)
+            except OSError:
+                pass
+        self._reset_progress(len(jobs), total_bytes)
+
+        results = {}
+        cross_device = []
+        for src, dest_path in jobs:
+            if self.same_device(src, os.path.dirname(dest_path) or "."):
+                results[src] = self.move(src, dest_path)
+            else:
+                cross_device.append((src, dest_path))
+
+        if cross_device:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(cross_device))) as executor:
+                futures = {executor.submit(self.move, src, dest_path): src for src, dest_path in cross_device}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+        self._advance(force=True)
+        return {src: dest_path for src, dest_path in jobs if results.get(src)}
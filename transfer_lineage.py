@@ -0,0 +1,170 @@
+import csv
+import os
+import threading
+
+from player_constants import FILE_TRANSFER_LOG
+from static_methods import normalise_path
+
+_TAIL_CHECK_BYTES = 64
+
+
+class TransferLineage:
+    """
+    In-memory index of file_transfer_log.csv.
+
+    Every path that was ever moved is a node of a union-find, so all the identities
+    of a file (the paths it was moved from and to, transitively) are one find() away.
+    The last known previous and next path of each file are kept in dictionaries.
+    The log is read once; rows appended later are read from the last indexed byte
+    offset, and FileManager records the rows it writes as it writes them.
+    """
+
+    def __init__(self, log_path=FILE_TRANSFER_LOG):
+        self.log_path = log_path
+        self._lock = threading.RLock()
+        self._reset()
+        self._loaded = False
+
+    def _reset(self):
+        self._parent = {}
+        self._members = {}
+        self._previous = {}
+        self._destination = {}
+        self._offset = 0
+        self._tail = b""
+        self._header = None
+
+    def _find(self, path):
+        parent = self._parent
+        root = path
+        while parent[root] != root:
+            root = parent[root]
+        while parent[path] != root:  # path compression
+            parent[path], path = root, parent[path]
+        return root
+
+    def _add_node(self, path):
+        if path not in self._parent:
+            self._parent[path] = path
+            self._members[path] = [path]
+
+    def _union(self, a, b):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        # union by size: the smaller member list joins the larger one
+        if len(self._members[root_a]) < len(self._members[root_b]):
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._members[root_a].extend(self._members.pop(root_b))
+
+    def _add_transfer(self, src, dst):
+        if not src or not dst:
+            return
+        src, dst = normalise_path(src), normalise_path(dst)
+        self._add_node(src)
+        self._add_node(dst)
+        self._union(src, dst)
+        # later rows win, like the linear scans this replaces
+        self._destination[os.path.normcase(src)] = dst
+        self._previous[os.path.normcase(dst)] = src
+
+    def _advance(self, data):
+        self._offset += len(data)
+        self._tail = (self._tail + data[-_TAIL_CHECK_BYTES:])[-_TAIL_CHECK_BYTES:]
+
+    def _catch_up(self):
+        """Indexes the rows appended to the log since the last indexed offset."""
+        self._loaded = True
+        try:
+            with open(self.log_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                start = max(0, self._offset - len(self._tail))
+                f.seek(start)
+                if size < self._offset or f.read(self._offset - start) != self._tail:
+                    self._reset()
+                    f.seek(0)
+                if size == self._offset:
+                    return
+                chunk = f.read(size - self._offset)
+        except FileNotFoundError:
+            return
+
+        end = chunk.rfind(b"\n") + 1
+        if not end:
+            return
+        chunk = chunk[:end]
+        rows = list(csv.reader(chunk.decode("utf-8", errors="replace").splitlines()))
+        if self._header is None and rows:
+            self._header = rows.pop(0)
+        header = self._header or []
+        src_i = header.index("Source Path") if "Source Path" in header else 0
+        dst_i = header.index("Destination Path") if "Destination Path" in header else 1
+        for row in rows:
+            if len(row) > max(src_i, dst_i):
+                self._add_transfer(row[src_i], row[dst_i])
+        self._advance(chunk)
+
+    def record(self, transfers, rows_text, write):
+        """
+        Indexes transfers that FileManager is about to append to the log and hands the rows to write.
+
+        Args:
+            transfers (dict): src -> dest of the logged transfers.
+            rows_text (str): The formatted csv rows, as they will be written.
+            write (callable): Appends rows_text to the log.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._catch_up()
+            write(rows_text)
+            for src, dst in transfers.items():
+                self._add_transfer(src, dst)
+            self._advance(rows_text.encode("utf-8"))
+
+    def get_related_paths(self, path):
+        """Returns every path the file was known under (including path itself), sorted."""
+        path = normalise_path(path)
+        with self._lock:
+            self._catch_up()
+            if path not in self._parent:
+                return [path]
+            return sorted(self._members[self._find(path)])
+
+    def get_history(self, path):
+        """
+        Returns the path a file was last moved from and the path it was last moved to.
+
+        Returns:
+            dict: {'previous': <previous_path or None>, 'current': <path>, 'destination': <destination_path or None>}
+        """
+        key = os.path.normcase(normalise_path(path))
+        with self._lock:
+            self._catch_up()
+            previous = self._previous.get(key)
+            destination = self._destination.get(key)
+        return {
+            'previous': normalise_path(previous) if previous else None,
+            'current': normalise_path(path),
+            'destination': normalise_path(destination) if destination else None
+        }
+
+
+_lineages = {}
+_lineages_lock = threading.Lock()
+
+
+def get_transfer_lineage(log_path=FILE_TRANSFER_LOG):
+    """Returns the lineage index shared by everything reading or writing log_path."""
+    key = os.path.normcase(os.path.abspath(log_path))
+    with _lineages_lock:
+        if key not in _lineages:
+            _lineages[key] = TransferLineage(log_path)
+        return _lineages[key]
+
+
+if __name__ == "__main__":
+    lineage = get_transfer_lineage()
+    sample = input("Path to look up: ").strip()
+    print(lineage.get_related_paths(sample))
+    print(lineage.get_history(sample))
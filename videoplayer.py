@@ -1,5 +1,4 @@
 import os
-import random
 import subprocess
 import threading
 import time
@@ -16,9 +15,14 @@ from deletion_manager import DeletionManager
 from favorites_manager import FavoritesManager
 from logs_writer import LogManager
 from notes_window import NotesManagerGUI
+from playlist import Playlist
+from screenshot_index import get_screenshot_index
 from player_constants import (
     FILES_FOLDER, 
     LOG_PATH, 
+    PLAYER_GAPLESS,
+    PLAYER_LOOKAHEAD,
+    PROGRESS_UPDATE_MS,
     REPORTS_FOLDER, 
     SCREENSHOTS_FOLDER, 
     WATCHED_HISTORY_LOG_PATH, 
@@ -38,7 +42,14 @@ from custom_messagebox import askopenfilename, showinfo, showwarning, showerror,
 class MediaPlayerApp(tk.Toplevel):
     def __init__(self, video_files, current_file=None, random_select=True, video_path=None, watch_history_csv=WATCHED_HISTORY_LOG_PATH,
                   parent=None, category_manager=None, favorites_manager=None, deletion_manaager=None,
-                  notes_manager=None, snippets_manager=None):
+                  notes_manager=None, snippets_manager=None, video_stream=None):
+        """
+        Args:
+            video_files (list): Paths of the videos to play.
+            video_stream (iterable, optional): More paths to append to the playlist from a
+                background thread (e.g. VideoFileLoader.stream_start_here), so playback can
+                start on the first file while the rest of the playlist is still loading.
+        """
         super().__init__(parent)
         self._get_history_csvfile(watch_history_csv)
         self.favorites_manager = favorites_manager or FavoritesManager()
@@ -73,13 +84,30 @@ class MediaPlayerApp(tk.Toplevel):
         # self.input_path = None
 
         self.random_select = random_select
-        self.video_index = 0 if not current_file else video_files.index(current_file)
+        self.video_index = 0
+        # look-ahead: the next file is picked and its media pre-parsed while the current one plays
+        self.lookahead = PLAYER_LOOKAHEAD
+        # gapless: a second player holds the next video pre-rolled and paused (needs the look-ahead)
+        self.gapless = PLAYER_GAPLESS and self.lookahead
+        self._prefetched = None
+        self._prefetch_lock = threading.Lock()
+        self._closing = False  # set under _prefetch_lock so a late prefetch releases its own media
+        # progress is pushed by VLC time/length events and redrawn at most every PROGRESS_UPDATE_MS
+        self._progress_time = 0
+        self._progress_length = 0
+        self._progress_value = 0
+        self._progress_pending = False
+        self._window_hidden = False
         
         self.current_time_str = "00:00:00"
         self.total_duration_str = "00:00:00"
         
         self._keybinding()
+        self.bind("<Map>", self._on_window_visibility, add="+")
+        self.bind("<Unmap>", self._on_window_visibility, add="+")
         self.initialize_player(video_files, video_path, cur_file=current_file)
+        if video_stream is not None:
+            self._start_playlist_fill(video_stream)
         
 
     def _get_history_csvfile(self, watch_history_csv):
@@ -96,12 +124,20 @@ class MediaPlayerApp(tk.Toplevel):
     
     def _on_close(self, event=None):
         self.session_end = timeit.default_timer()
+        self.playlist_loading = False
         self.stop()  # Call the stop method when the window is closed
+        self.watch_history_logger.flush()
         # tk.Tk.quit(self)
+        with self._prefetch_lock:
+            self._closing = True
         self.show_seassion_stats(self.get_stats())
+        self._take_prefetched_media(None)
         if hasattr(self, 'media_player'):
             self.media_player.stop()
             self.media_player.release()
+        if getattr(self, 'standby_player', None):
+            self.standby_player.stop()
+            self.standby_player.release()
         if hasattr(self, 'instance'):
             self.instance.release()
         # self.destroy()
@@ -112,11 +148,40 @@ class MediaPlayerApp(tk.Toplevel):
         # print("Application quit")
 
     def _create_new_player(self):
-        self.media_player = self.instance.media_player_new()
-        self.media_player.event_manager().event_attach(vlc.EventType.MediaPlayerEncounteredError, self.handle_error)
-        self.media_player.event_manager().event_attach(
-            vlc.EventType.MediaPlayerEndReached, self._on_video_end
-        )
+        self.media_player = self._new_vlc_player()
+        self.standby_player = self._new_vlc_player() if self.gapless else None
+
+    def _new_vlc_player(self):
+        player = self.instance.media_player_new()
+        player.event_manager().event_attach(vlc.EventType.MediaPlayerEncounteredError, self.handle_error, player)
+        player.event_manager().event_attach(vlc.EventType.MediaPlayerEndReached, self._on_video_end, player)
+        player.event_manager().event_attach(vlc.EventType.MediaPlayerTimeChanged, self._on_time_changed, player)
+        player.event_manager().event_attach(vlc.EventType.MediaPlayerLengthChanged, self._on_length_changed, player)
+        return player
+
+    def _on_time_changed(self, event, player):
+        # runs on a VLC thread: only record the value and coalesce the redraw onto the Tk thread
+        if player is self.media_player:
+            self._progress_time = event.u.new_time
+            self._schedule_progress()
+
+    def _on_length_changed(self, event, player):
+        if player is self.media_player:
+            self._progress_length = event.u.new_length
+            self._schedule_progress()
+
+    def _schedule_progress(self):
+        if self._progress_pending or self.video_paused or self._window_hidden:
+            return
+        self._progress_pending = True
+        self.after(PROGRESS_UPDATE_MS, self._render_progress)
+
+    def _on_window_visibility(self, event):
+        if event.widget is not self:
+            return
+        self._window_hidden = event.type == tk.EventType.Unmap
+        if not self._window_hidden:
+            self._render_progress()
           
 
     def initialize_player(self, video_files, folder_path, cur_file=None):
@@ -130,7 +195,9 @@ class MediaPlayerApp(tk.Toplevel):
         # )
         self._create_new_player()
 
-        self.video_files = self.get_video_files(folder_path) if folder_path is not None else video_files
+        self.video_files = Playlist(self.get_video_files(folder_path) if folder_path is not None else video_files)
+        if cur_file in self.video_files:
+            self.video_index = self.video_files.index(cur_file)
         self.current_file = cur_file
         self.previous_file = None
         self.playing_video = False
@@ -154,24 +221,160 @@ class MediaPlayerApp(tk.Toplevel):
         if self.video_files:
             self.play_video()
 
+    def _start_playlist_fill(self, video_stream):
+        """Appends the remaining paths of video_stream to the playlist on a daemon thread."""
+        self.playlist_loading = True
+
+        def fill():
+            try:
+                for file_path in video_stream:
+                    if not self.playlist_loading:
+                        break
+                    self.video_files.append(file_path)
+                print(f"Total Videos Found: {len(self.video_files)}")
+            except Exception as e:
+                print(f"Error while loading the playlist: {e}")
+                self.logger.error_logs(f"{e} While Loading The Playlist")
+            finally:
+                self.playlist_loading = False
+
+        threading.Thread(target=fill, daemon=True).start()
+
     def select_random_video(self):
         """Selects a random video from the list of video files."""
         if self.video_files:
-            self.current_file = random.choice(self.video_files)
+            self.current_file = self.video_files.next_random()
 
     def select_sequential_videos(self):
         if self.video_files:
             self.current_file = self.video_files[self.video_index]
             self.video_index += 1
 
-    def _on_video_end(self, event):
+    def _pick_next_file(self):
+        """Picks the file play_next would choose, without changing the playlist position."""
+        if not self.video_files:
+            return None
+        forward = self.video_files.peek_forward()
+        if forward is not None:
+            return forward
+        if self.random_select:
+            return self.video_files.peek_random()
+        if self.video_index < len(self.video_files):
+            return self.video_files[self.video_index]
+        return None
+
+    def _prefetch_next(self):
+        """
+        Picks the next file and pre-creates and pre-parses its vlc.Media on a background
+        thread, reading the start of the file so its header is in the OS page cache.
+        """
+        next_file = self._pick_next_file()
+        if not next_file or next_file == self.current_file:
+            return
+
+        def prefetch():
+            try:
+                with open(next_file, "rb") as f:
+                    f.read(1024 * 1024)
+                media = self.instance.media_new(next_file)
+                media.parse_async()
+            except Exception as e:
+                print(f"Prefetch failed for {next_file}: {e}")
+                return
+            prefetched = {"file": next_file, "media": media, "player": None}
+            with self._prefetch_lock:
+                if self._closing:
+                    # the window closed while this file was read; nothing will take the media
+                    media.release()
+                    return
+                old, self._prefetched = self._prefetched, prefetched
+                # scheduled under the lock so _on_close can't destroy the window in between
+                if old:
+                    self.after(0, lambda: self._discard_prefetched(old))
+                if self.gapless:
+                    self.after(0, lambda: self._preroll_standby(prefetched))
+
+        threading.Thread(target=prefetch, daemon=True).start()
+
+    def _discard_prefetched(self, prefetched):
+        if prefetched["player"] is not None:
+            prefetched["player"].stop()
+            prefetched["player"].set_media(None)
+        prefetched["media"].release()
+
+    def _take_prefetched_media(self, file_path):
+        """Returns the pre-parsed media for file_path (or None) and clears the prefetch slot."""
+        with self._prefetch_lock:
+            prefetched, self._prefetched = self._prefetched, None
+        if prefetched is None:
+            return None
+        if prefetched["file"] == file_path and prefetched["player"] is None:
+            return prefetched["media"]
+        self._discard_prefetched(prefetched)
+        return None
+
+    def _preroll_standby(self, prefetched):
+        """Loads the prefetched media on the standby player and leaves it paused and muted on its first frame."""
+        if self._prefetched is not prefetched or self.standby_player is None:
+            return
+        try:
+            player = self.standby_player
+            player.stop()
+            prefetched["media"].add_option(":start-paused")
+            player.set_media(prefetched["media"])
+            player.audio_set_mute(True)
+            player.set_hwnd(self.standby_canvas.winfo_id())
+            player.play()
+            prefetched["player"] = player
+        except Exception as e:
+            print(f"Pre-roll failed for {prefetched['file']}: {e}")
+
+    def _drop_failed_preroll(self, player):
+        """Discards the prefetched entry held by player, so the file isn't swapped in."""
+        with self._prefetch_lock:
+            prefetched = self._prefetched
+            if prefetched is None or prefetched["player"] is not player:
+                return
+            self._prefetched = None
+        self._discard_prefetched(prefetched)
+
+    def _standby_ready(self, file_path=None):
+        """Returns True if the standby player holds file_path (or any file if None) pre-rolled."""
+        prefetched = self._prefetched
+        return bool(
+            self.gapless and prefetched and prefetched["player"] is self.standby_player
+            and (file_path is None or prefetched["file"] == file_path)
+        )
+
+    def _swap_to_standby(self):
+        """Makes the pre-rolled standby player the active one and resumes it, instead of loading the file again."""
+        with self._prefetch_lock:
+            prefetched, self._prefetched = self._prefetched, None
+        self.media_player, self.standby_player = self.standby_player, self.media_player
+        self.media_canvas, self.standby_canvas = self.standby_canvas, self.media_canvas
+        self.media_canvas.tkraise()
+        self.current_media = prefetched["media"]
+        self.last_looped_file = self.current_file
+
+        self.media_player.audio_set_mute(self.standby_player.audio_get_mute() == 1)
+        self.media_player.audio_set_volume(int(self.volume_bar.get()))
+        self.volume_bar.media_player = self.media_player
+        # its LengthChanged event fired while it was still the standby player
+        self._progress_length = self.media_player.get_length()
+        title = f"[{self.video_files.index(self.current_file)} / {len(self.video_files)}] " + self.current_file.split("\\")[-1]
+        self._on_video_loaded(title)
+
+    def _on_video_end(self, event, player=None):
+        if player is not None and player is not self.media_player:
+            return
         # Schedule play_next or loop on the main thread
         if self.loop_video:
             self.after(50, self.stop)
             self.after(200, self.play_video)
         elif self.autoplay:
             # self.current_media.release()
-            self.after(200, self.play_next)
+            # the pre-rolled standby player can take over right away
+            self.after(0 if self._standby_ready() else 200, self.play_next)
 
 
     def _create_widgets(self):
@@ -188,8 +391,17 @@ class MediaPlayerApp(tk.Toplevel):
         # self.drag_label.pack_forget()
         # self.drag_bar.pack_forget()
 
-        self.media_canvas = tk.Canvas(self, bg="black", width=900, height=400, highlightthickness=0)
-        self.media_canvas.pack(pady=(0, 0), fill=tk.BOTH, expand=True)
+        if self.gapless:
+            # both players render into stacked canvases; the active one is raised on top
+            self.video_frame = tk.Frame(self, bg="black", width=900, height=400)
+            self.video_frame.pack(pady=(0, 0), fill=tk.BOTH, expand=True)
+            self.standby_canvas = tk.Canvas(self.video_frame, bg="black", highlightthickness=0)
+            self.standby_canvas.place(relx=0, rely=0, relwidth=1, relheight=1)
+            self.media_canvas = tk.Canvas(self.video_frame, bg="black", highlightthickness=0)
+            self.media_canvas.place(relx=0, rely=0, relwidth=1, relheight=1)
+        else:
+            self.media_canvas = tk.Canvas(self, bg="black", width=900, height=400, highlightthickness=0)
+            self.media_canvas.pack(pady=(0, 0), fill=tk.BOTH, expand=True)
 
         control_frame = tk.Frame(self, bg="black")
         control_frame.pack(pady=(5, 0), fill=tk.X)
@@ -485,6 +697,7 @@ class MediaPlayerApp(tk.Toplevel):
         self.reset_trim()
 
         self.title(title)
+        self.video_files.visit(self.current_file)
         self.media_player.set_hwnd(self.media_canvas.winfo_id())
         self.media_player.play()
         # self.set_playback_speed(self.segment_speed)
@@ -492,7 +705,10 @@ class MediaPlayerApp(tk.Toplevel):
         self.session_start = timeit.default_timer() if self.session_start is None else self.session_start
         self.playing_video = True
         self.watched_videos.add_watch(self.current_file)
-        self.progress_bar.set(0)
+        self._progress_time = 0
+        self._set_progress_bar(0)
+        if self.lookahead:
+            self._prefetch_next()
 
     def reset_values(self, segment_speed=None):
         self.playback_segments = []
@@ -585,6 +801,7 @@ class MediaPlayerApp(tk.Toplevel):
             self.progress_bar.pack(side=tk.LEFT, fill=tk.X, padx=5, pady=0, expand=True)
             self.volume_bar.pack(side=tk.RIGHT, padx=5, pady=0)
             # self.time_label.pack(side=tk.RIGHT, padx=10, pady=0)
+            self.after_idle(self._render_progress)
         else:
             for widget in widgets_with_default_padding:
                 widget.pack_forget()
@@ -616,7 +833,8 @@ class MediaPlayerApp(tk.Toplevel):
         filename = self.current_file.split('\\')[-1]
         # length = self.get_duration_str
         screenshot_path = f"{SCREENSHOTS_FOLDER}\\screenshot_{filename}_{self.media_player.get_time()}.png"
-        self.media_player.video_take_snapshot(0, screenshot_path, 0, 0)
+        if self.media_player.video_take_snapshot(0, screenshot_path, 0, 0) == 0:
+            get_screenshot_index(SCREENSHOTS_FOLDER).add(screenshot_path)
 
     def volume_increase(self, event):
         """Increases the volume."""
@@ -676,14 +894,20 @@ class MediaPlayerApp(tk.Toplevel):
 
             self.previous_file = self.current_file
 
-            if self.random_select:
+            forward = self.video_files.forward()
+            if forward is not None:
+                self.current_file = forward
+            elif self.random_select:
                 self.select_random_video()
             else:
                 self.select_sequential_videos()
 
             self.video_paused = False
             print(f"Now playing: {self.current_file}")
-            self.play_video()
+            if self._standby_ready(self.current_file) and os.path.exists(self.current_file):
+                self._swap_to_standby()
+            else:
+                self.play_video()
 
         except IndexError:
             self.current_file = None
@@ -695,10 +919,13 @@ class MediaPlayerApp(tk.Toplevel):
             self._playing_lock = False
 
     
-    def play_previous(self, event=None):
+    def play_previous(self, event=None, file_path=None):
         """
         Plays the previous video in the playlist.
-        Stops the current video, swaps the current and previous file, and plays the previous one.
+        Stops the current video and steps back through the watch history, one video per call.
+
+        Args:
+            file_path (str, optional): Play this file instead of the previous one in the history.
         """
         if getattr(self, "_playing_lock", False):
             print("Already transitioning between videos.")
@@ -709,12 +936,15 @@ class MediaPlayerApp(tk.Toplevel):
             if self.playing_video:
                 self.stop()
 
-            if self.previous_file and os.path.exists(self.previous_file):
-                if self.previous_file == self.current_file:
+            target = file_path or self.video_files.back()
+            while target and not os.path.exists(target) and file_path is None:
+                target = self.video_files.back()
+            if target and os.path.exists(target):
+                if target == self.current_file:
                     print("Previous file is same as current. Ignoring.")
                     return
 
-                self.current_file, self.previous_file = self.previous_file, self.current_file
+                self.current_file, self.previous_file = target, self.current_file
                 print(f"Reverted to: {self.current_file}")
                 self.play_video()
             else:
@@ -777,6 +1007,7 @@ class MediaPlayerApp(tk.Toplevel):
             self.random_select = False
             current_index = self.video_files.index(self.current_file)
             self.video_index = current_index + 1 if current_index < len(self.video_files) else 0
+            self.video_files.clear_forward()
             # self.after(50, self.play_next)
             self.play_next()
             self.random_select = True
@@ -791,7 +1022,7 @@ class MediaPlayerApp(tk.Toplevel):
             self.random_select = False
             current_index = self.video_files.index(self.current_file) 
             self.previous_file = self.video_files[current_index - 1] if current_index > 0 else self.video_files[len(self.video_files) - 1]
-            self.play_previous()
+            self.play_previous(file_path=self.previous_file)
             self.random_select = True
         else:
             self.play_previous()
@@ -815,13 +1046,16 @@ class MediaPlayerApp(tk.Toplevel):
                     #     self.current_media.release()
                     # if hasattr(self, 'media_player'):
                     #     self.media_player.release()
-                    time.sleep(0.3)
+                    if not self.lookahead:
+                        time.sleep(0.3)
                 if os.path.exists(self.current_file):
                     title = f"[{self.video_files.index(self.current_file)} / {len(self.video_files)}] " + self.current_file.split("\\")[-1]
                     self._release_current_media()
-                    media = self.instance.media_new(self.current_file)
+                    media = self._take_prefetched_media(self.current_file)
+                    if media is None:
+                        media = self.instance.media_new(self.current_file)
+                        media.parse_async()  # Preloads meta info
                     self.current_media = media
-                    media.parse_async()  # Preloads meta info
                     # self._create_new_player()
                     self.media_player.set_media(media)
                     self.last_looped_file = self.current_file
@@ -855,7 +1089,8 @@ class MediaPlayerApp(tk.Toplevel):
                 print("Released current media.")
         except Exception as e:
             print(f"Error during media release: {e}")
-        time.sleep(0.25)
+        if not self.lookahead:
+            time.sleep(0.25)
 
     def fast_forward(self, event=None):
         """
@@ -899,6 +1134,7 @@ class MediaPlayerApp(tk.Toplevel):
                 self.record_segment()
                 self.media_player.play()
                 self.video_paused = False
+                self._schedule_progress()
                 self.pause_button.config(text="⏸️ Pause")
             else:
                 self.record_segment()
@@ -948,6 +1184,9 @@ class MediaPlayerApp(tk.Toplevel):
             value (float): The value representing the desired playback position as a percentage.
                         Value should be between 0 and 100.
         """
+        # the Scale also calls this when the progress bar is moved by playback; that must not seek
+        if float(value) == self._progress_value:
+            return
         if self.playing_video:
             total_duration = self.media_player.get_length()
             position = int((float(value) / 100) * total_duration)
@@ -956,30 +1195,34 @@ class MediaPlayerApp(tk.Toplevel):
     def update_video_progress(self):
         """
         Updates the progress of the currently playing video.
-        Updates the time label with the current playback time and total duration.
+        Reads the time and length from the player once; after that the time label and
+        progress bar are updated from VLC's TimeChanged/LengthChanged events.
         """
-        if self.playing_video and not self.video_paused:
-            total_duration = self.media_player.get_length()
-            current_time = self.media_player.get_time()
-
-            # if total_duration - current_time <= 1000:
-            #     self.playing_video = False
-            # print(current_time, total_duration)
-
-            # the following lines are commented inorder to avoid lag in the video which is caused by progress_bar
-            # progress_percentage = (current_time / total_duration) * 100
-            # self.progress_bar.set(progress_percentage)
-
-            self.current_time_str = str(timedelta(milliseconds=current_time))[:-3]
-            self.total_duration_str = str(timedelta(milliseconds=total_duration))[:-3]
-            self.time_label.config(text=f"{self.current_time_str} / {self.total_duration_str}")
-            # print(total_duration, current_time)
-            # if total_duration - current_time <= 500 and (total_duration != 0 or not self.video_paused):
-            # if total_duration - current_time <= 500 and (total_duration != 0):
-                # print(total_duration, current_time)
-                # return
-                # return
-        self.after(200, self.update_video_progress)
+        if self.playing_video:
+            self._progress_length = self.media_player.get_length()
+            self._progress_time = self.media_player.get_time()
+        self._render_progress()
+
+    def _render_progress(self):
+        """Redraws the time label and progress bar from the last reported time and length."""
+        self._progress_pending = False
+        if not self.playing_video:
+            return
+        total_duration = max(self._progress_length, 0)
+        current_time = max(self._progress_time, 0)
+        self.current_time_str = str(timedelta(milliseconds=current_time))[:-3]
+        self.total_duration_str = str(timedelta(milliseconds=total_duration))[:-3]
+        # the controls are hidden in fullscreen and the shortened window
+        if self.minimized or getattr(self, "fullscreen", False):
+            return
+        self.time_label.config(text=f"{self.current_time_str} / {self.total_duration_str}")
+        if total_duration:
+            self._set_progress_bar((current_time / total_duration) * 100)
+
+    def _set_progress_bar(self, percentage):
+        """Moves the progress bar without seeking (see set_video_position)."""
+        self.progress_bar.set(percentage)
+        self._progress_value = self.progress_bar.get()
     
     def seconds_to_hhmmss(self, seconds, safe_for_filename=True):
         hours = int(seconds) // 3600
@@ -1019,7 +1262,12 @@ class MediaPlayerApp(tk.Toplevel):
         return watched_stats
     
 
-    def handle_error(self, event):
+    def handle_error(self, event, player=None):
+        if player is not None and player is not self.media_player:
+            # the look-ahead file failed while pre-rolling; play_next will load it with play_video instead
+            print("Error occurred while pre-rolling the next media.")
+            self.after(0, lambda: self._drop_failed_preroll(player))
+            return
         print("Error occurred while playing the media.")
         self.destroy()
     
@@ -0,0 +1,241 @@
+import tkinter as tk
+from tkinter import ttk
+
+from player_constants import VIRTUAL_TABLE_OVERSCAN
+
+
+class VirtualTable:
+    """
+    A Treeview that only holds the rows currently on screen.
+
+    The rows live in a plain list (rows) and the Treeview is refilled with the visible
+    window plus VIRTUAL_TABLE_OVERSCAN rows whenever it scrolls, so showing 150k files
+    costs a few dozen items instead of 150k. Selection, sorting and removal work on the
+    list; the item ids in the Treeview are the row positions in it.
+    """
+
+    def __init__(self, master, columns, overscan=VIRTUAL_TABLE_OVERSCAN, **tree_options):
+        """
+        Args:
+            master (tk.Widget): Frame the table and its scrollbar are packed into.
+            columns (tuple): Column names, in the order of the values of each row.
+            overscan (int, optional): Rows kept below the visible ones. Defaults to VIRTUAL_TABLE_OVERSCAN.
+            **tree_options: Passed to ttk.Treeview.
+        """
+        self.columns = columns
+        self.overscan = overscan
+        self.rows = []
+        self.first = 0
+        self._selected = set()  # id() of the selected rows
+        self._focus = None
+        self._anchor = None  # row index Shift ranges start from
+
+        self.tree = ttk.Treeview(master, columns=columns, **tree_options)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(master, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", lambda event: self._render())
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<<TreeviewSelect>>", self._sync_selection)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Up>", lambda event: self._move_focus(-1, event))
+        self.tree.bind("<Down>", lambda event: self._move_focus(1, event))
+        self.tree.bind("<Prior>", lambda event: self._move_focus(-self._visible_rows(), event))
+        self.tree.bind("<Next>", lambda event: self._move_focus(self._visible_rows(), event))
+
+    # Treeview pass-throughs used to set the table up
+    def heading(self, column, **options):
+        return self.tree.heading(column, **options)
+
+    def column(self, column, **options):
+        return self.tree.column(column, **options)
+
+    def tag_configure(self, tag, **options):
+        return self.tree.tag_configure(tag, **options)
+
+    def bind(self, sequence, func):
+        """Binds func to the Treeview without replacing the table's own bindings."""
+        return self.tree.bind(sequence, func, add="+")
+
+    def _row_height(self):
+        style = self.tree.cget("style") or "Treeview"
+        try:
+            return int(ttk.Style().lookup(style, "rowheight")) or 20
+        except (ValueError, tk.TclError):
+            return 20
+
+    def _visible_rows(self):
+        # the heading takes about one row
+        return max(1, self.tree.winfo_height() // self._row_height() - 1)
+
+    def _max_first(self):
+        return max(0, len(self.rows) - self._visible_rows())
+
+    def _render(self):
+        tree = self.tree
+        self.first = min(max(0, self.first), self._max_first())
+        end = min(len(self.rows), self.first + self._visible_rows() + self.overscan)
+        tree.delete(*tree.get_children())
+        selected = []
+        for index in range(self.first, end):
+            row = self.rows[index]
+            tree.insert("", "end", iid=str(index), values=row, tags=("evenrow",) if index % 2 == 0 else ("oddrow",))
+            if id(row) in self._selected:
+                selected.append(str(index))
+        tree.selection_set(selected)
+        if self._focus is not None and self.first <= self._focus < end:
+            tree.focus(str(self._focus))
+        tree.yview_moveto(0)
+
+        total = len(self.rows)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self._visible_rows()) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def yview(self, *args):
+        """Scrollbar command: "moveto <fraction>" or "scroll <n> units|pages"."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.first += step * self._visible_rows() if args[2] == "pages" else step
+        self._render()
+
+    def see(self, index):
+        """Scrolls so the row at index is on screen."""
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self._visible_rows():
+            self.first = index - self._visible_rows() + 1
+        self._render()
+
+    def _on_mousewheel(self, event):
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+        return "break"
+
+    def _on_click(self, event):
+        # headings sort, separators resize and empty space keeps the selection
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return None
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return None
+        index = int(item)
+        if event.state & 0x0001 and self._anchor is not None:  # Shift selects from the anchor over all rows
+            self._select_range(index, keep=event.state & 0x0004)
+        elif event.state & 0x0004:  # Control toggles the row
+            self._selected ^= {id(self.rows[index])}
+            self._anchor = index
+        else:
+            self._selected = {id(self.rows[index])}
+            self._anchor = index
+        self._focus = index
+        self._render()
+        self.tree.focus_set()
+        self.tree.event_generate("<<TreeviewSelect>>")
+        # the Treeview's own click handling only knows the rendered rows
+        return "break"
+
+    def _select_range(self, index, keep=False):
+        """Selects the rows between the anchor and index, adding to the selection if keep."""
+        low, high = sorted((self._anchor, index))
+        if not keep:
+            self._selected.clear()
+        self._selected.update(id(row) for row in self.rows[low:high + 1])
+
+    def _sync_selection(self, event=None):
+        selected = set(self.tree.selection())
+        for item in self.tree.get_children():
+            row = self.rows[int(item)]
+            if item in selected:
+                self._selected.add(id(row))
+            else:
+                self._selected.discard(id(row))
+
+    def _move_focus(self, step, event):
+        if not self.rows:
+            return "break"
+        index = self._focus + step if self._focus is not None else self.first
+        index = min(max(0, index), len(self.rows) - 1)
+        if event.state & 0x0001 and self._anchor is not None:  # Shift extends the selection from the anchor
+            self._select_range(index)
+        else:
+            self._selected = {id(self.rows[index])}
+            self._anchor = index
+        self._focus = index
+        self.see(index)
+        self.tree.event_generate("<<TreeviewSelect>>")
+        return "break"
+
+    def set_rows(self, rows):
+        """Replaces the rows of the table and scrolls back to the top."""
+        self.rows = list(rows)
+        self.first = 0
+        self._selected.clear()
+        self._focus = None
+        self._anchor = None
+        self._render()
+        self.tree.event_generate("<<TreeviewSelect>>")
+
+    def extend_rows(self, rows):
+        self.rows.extend(rows)
+        self._render()
+
+    def clear(self):
+        self.set_rows([])
+
+    def remove_rows(self, rows):
+        """Removes the given row objects (as returned by selected_rows) from the table."""
+        removed = {id(row) for row in rows}
+        self.rows = [row for row in self.rows if id(row) not in removed]
+        self._selected -= removed
+        self._focus = None
+        self._anchor = None
+        self._render()
+        self.tree.event_generate("<<TreeviewSelect>>")
+
+    def selected_rows(self):
+        """Returns the selected rows in table order, including the ones scrolled out of view."""
+        if not self._selected:
+            return []
+        return [row for row in self.rows if id(row) in self._selected]
+
+    def row_at(self, y):
+        """Returns the row under the y coordinate of the Treeview, or None."""
+        item = self.tree.identify_row(y)
+        return self.rows[int(item)] if item else None
+
+    def select_row(self, row):
+        """Makes row the only selected row."""
+        self._selected = {id(row)}
+        self._anchor = None
+        self._render()
+        self.tree.event_generate("<<TreeviewSelect>>")
+
+    def is_selected(self, row):
+        return id(row) in self._selected
+
+    def sort(self, column, reverse=False):
+        """Sorts the rows by column, numerically if every value is a number."""
+        i = self.columns.index(column)
+        try:
+            self.rows.sort(key=lambda row: int(row[i]), reverse=reverse)
+        except (ValueError, TypeError):
+            self.rows.sort(key=lambda row: str(row[i]).lower(), reverse=reverse)
+        self._focus = None
+        self._anchor = None
+        self._render()
+
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.geometry("800x500")
+    table = VirtualTable(root, ("#", "File Name", "Folder Path"), show="headings", selectmode="extended")
+    for name in table.columns:
+        table.heading(name, text=name, command=lambda c=name: table.sort(c, True))
+    table.set_rows((i, f"video_{i}.mp4", f"C:\\Videos\\video_{i}.mp4") for i in range(150_000))
+    root.mainloop()
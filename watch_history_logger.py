@@ -1,9 +1,12 @@
 from datetime import datetime
 import csv
+import io
 import os
+from buffered_writer import get_writer
 from logs_writer import LogManager
 from player_constants import LOG_PATH, WATCHED_HISTORY_LOG_PATH
 from static_methods import convert_date_format
+from watch_stats_index import get_watch_stats_index
 
 class WatchHistoryLogger:
     """A class for logging the history of watched videos."""
@@ -21,6 +24,11 @@ class WatchHistoryLogger:
         self.file_exists = self.check_file_exists()
         if not self.file_exists:
             self.create_csv_file()
+        # rows are formatted into a reused buffer and appended in batches by the shared writer
+        self.writer = get_writer(self.csv_file, newline='')
+        self._row_buffer = io.StringIO()
+        self._row_writer = csv.DictWriter(self._row_buffer, fieldnames=self.fieldnames)
+        self.stats_index = get_watch_stats_index(self.csv_file)
         
 
     def check_file_exists(self):
@@ -49,18 +57,25 @@ class WatchHistoryLogger:
         """
         try:
             date_watched = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.csv_file, 'a', newline='', encoding="utf-8") as file:
-                writer = csv.DictWriter(file, fieldnames=self.fieldnames)
-                writer.writerow({
-                    'File Name': file_name,
-                    'Total Duration': total_duration,
-                    'Date Watched': date_watched,
-                    'Duration Watched': video_duration
-                })
+            self._row_writer.writerow({
+                'File Name': file_name,
+                'Total Duration': total_duration,
+                'Date Watched': date_watched,
+                'Duration Watched': video_duration
+            })
+            # the per-file aggregates are updated along with the row
+            self.stats_index.record(file_name, video_duration, date_watched, self._row_buffer.getvalue(), self.writer.write)
+            self._row_buffer.seek(0)
+            self._row_buffer.truncate()
         except Exception as e:
             print(f"Error Occurred While Writing Watch History Logs {e}")
             self.logger.error_logs(f"{e} While Writing Watch History")
 
+    def flush(self):
+        """Writes the queued rows to the csv and fsyncs it."""
+        self.writer.close()
+        self.stats_index.save()
+
 
 if __name__ == "__main__":
     convert_date_format(WATCHED_HISTORY_LOG_PATH)
@@ -0,0 +1,258 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+from history_parsing import NAT, parse_durations_ms, parse_timestamps_s, s_to_datetime
+from logs_writer import LogManager
+from player_constants import LOG_PATH, WATCH_HISTORY_STORE_FOLDER, WATCHED_HISTORY_LOG_PATH
+from static_methods import ensure_folder_exists, normalise_path
+
+COLUMNS = ("watched_at", "total_ms", "watched_ms", "path_code")
+DTYPES = {"watched_at": np.int64, "total_ms": np.int64, "watched_ms": np.int64, "path_code": np.int32}
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+_TAIL_CHECK_BYTES = 64
+# bumped when the on-disk layout changes; stores in an older layout are rebuilt from the csv
+_STORE_FORMAT = 2
+
+_store_lock = threading.Lock()
+
+
+def _empty_rollups():
+    return {
+        "totals": [0, 0, 0],  # [count, total_ms, watched_ms] in every rollup
+        "daily": {},
+        "hourly": [[0, 0, 0] for _ in range(24)],
+        "weekday": [[0, 0, 0] for _ in range(7)],
+        "folder": {},
+    }
+
+
+def _add(bucket, total_ms, watched_ms):
+    bucket[0] += 1
+    bucket[1] += total_ms if total_ms != NAT else 0
+    bucket[2] += watched_ms if watched_ms != NAT else 0
+
+
+class WatchHistoryStore:
+    """
+    Columnar copy of a watch history csv for the dashboard.
+
+    Rows are kept as memory-mapped raw NumPy columns: the watch timestamp as int64
+    seconds, both durations as int64 milliseconds and the file path as an int32 code
+    into a path table. Daily, hourly, weekday and folder rollups are kept next to them
+    in a JSON file. refresh() only parses the bytes appended to the csv since the last
+    call and appends them to the column files; the store is rebuilt from scratch if the
+    csv was rewritten instead.
+    """
+
+    def __init__(self, csv_path=WATCHED_HISTORY_LOG_PATH, store_folder=WATCH_HISTORY_STORE_FOLDER):
+        self.csv_path = csv_path
+        key = hashlib.sha256(normalise_path(os.path.abspath(csv_path)).lower().encode("utf-8")).hexdigest()[:16]
+        self.folder = os.path.join(store_folder, key)
+        self.meta_path = os.path.join(self.folder, "meta.json")
+        self.logger = LogManager(LOG_PATH)
+        self._load_meta()
+
+    def _column_path(self, name):
+        return os.path.join(self.folder, f"{name}.bin")
+
+    def _load_meta(self):
+        self.meta = None
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Rebuilding unreadable watch history store {self.meta_path}: {e}")
+            self.logger.error_logs(f"{e} While Reading {self.meta_path}")
+        if not self.meta or self.meta.get("format") != _STORE_FORMAT:
+            self._reset()
+
+    def _reset(self):
+        self.meta = {
+            "format": _STORE_FORMAT, "offset": 0, "tail": "", "open_row": False,
+            "header": None, "rows": 0, "paths": [], "rollups": _empty_rollups(),
+        }
+
+    def _tail_matches(self, f):
+        offset = self.meta["offset"]
+        if not offset:
+            return True
+        start = max(0, offset - _TAIL_CHECK_BYTES)
+        f.seek(start)
+        return f.read(offset - start).hex() == self.meta["tail"]
+
+    def columns(self):
+        """Returns a dict of the columns as read-only memory-mapped arrays."""
+        rows = self.meta["rows"]
+        columns = {}
+        for name in COLUMNS:
+            path = self._column_path(name)
+            if rows and os.path.exists(path):
+                # files appended to before a crash can be longer than the committed row count
+                columns[name] = np.memmap(path, dtype=DTYPES[name], mode="r", shape=(rows,))
+            else:
+                columns[name] = np.empty(0, dtype=DTYPES[name])
+        return columns
+
+    @property
+    def paths(self):
+        return self.meta["paths"]
+
+    @property
+    def rollups(self):
+        return self.meta["rollups"]
+
+    def refresh(self):
+        """
+        Appends the csv rows written since the last refresh to the store.
+
+        Returns:
+            int: Number of rows added.
+        """
+        with _store_lock:
+            try:
+                with open(self.csv_path, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size < self.meta["offset"] or not self._tail_matches(f):
+                        print(f"{self.csv_path} was rewritten, rebuilding its watch history store.")
+                        self._reset()
+                    if size == self.meta["offset"]:
+                        return 0
+                    f.seek(self.meta["offset"])
+                    chunk = f.read(size - self.meta["offset"])
+                    if self.meta["open_row"] and chunk[:1] not in (b"\r", b"\n"):
+                        # the last row read had no line end and was still being written; read it again
+                        print(f"{self.csv_path} continued its last row, rebuilding its watch history store.")
+                        self._reset()
+                        f.seek(0)
+                        chunk = f.read(size)
+            except FileNotFoundError:
+                return 0
+
+            # the last row may have no line end (files not ending in a newline); it is read too,
+            # and open_row makes the next refresh rebuild if more of that row gets written
+            rows = list(csv.reader(chunk.decode("utf-8", errors="replace").splitlines()))
+            if self.meta["header"] is None and rows:
+                self.meta["header"] = rows.pop(0)
+            added = self._append_rows(rows)
+
+            self.meta["offset"] += len(chunk)
+            self.meta["open_row"] = not chunk.endswith(b"\n")
+            self.meta["tail"] = (bytes.fromhex(self.meta["tail"]) + chunk[-_TAIL_CHECK_BYTES:])[-_TAIL_CHECK_BYTES:].hex()
+            self._save_meta()
+            return added
+
+    def _append_rows(self, rows):
+        header = self.meta["header"] or []
+        try:
+            name_i = header.index("File Name")
+            total_i = header.index("Total Duration")
+            date_i = header.index("Date Watched")
+            watched_i = header.index("Duration Watched")
+        except ValueError:
+            print(f"{self.csv_path} is not a watch history csv.")
+            return 0
+
+        width = max(name_i, total_i, date_i, watched_i) + 1
+        rows = [row for row in rows if len(row) >= width]
+        if not rows:
+            return 0
+
+        path_codes = {path: i for i, path in enumerate(self.meta["paths"])}
+        codes = []
+        for row in rows:
+            code = path_codes.get(row[name_i])
+            if code is None:
+                code = path_codes[row[name_i]] = len(self.meta["paths"])
+                self.meta["paths"].append(row[name_i])
+            codes.append(code)
+        new = {
+            "watched_at": parse_timestamps_s([row[date_i] for row in rows]),
+            "total_ms": parse_durations_ms([row[total_i] for row in rows]),
+            "watched_ms": parse_durations_ms([row[watched_i] for row in rows]),
+            "path_code": codes,
+        }
+
+        rollups = self.meta["rollups"]
+        for row, watched_at, total_ms, watched_ms in zip(
+            rows, new["watched_at"].tolist(), new["total_ms"].tolist(), new["watched_ms"].tolist()
+        ):
+            file_path = row[name_i]
+            _add(rollups["totals"], total_ms, watched_ms)
+            folder = os.path.dirname(normalise_path(file_path))
+            _add(rollups["folder"].setdefault(folder, [0, 0, 0]), total_ms, watched_ms)
+            if watched_at != NAT:
+                date = s_to_datetime(watched_at)
+                _add(rollups["daily"].setdefault(date.strftime("%Y-%m-%d"), [0, 0, 0]), total_ms, watched_ms)
+                _add(rollups["hourly"][date.hour], total_ms, watched_ms)
+                _add(rollups["weekday"][date.weekday()], total_ms, watched_ms)
+
+        self._append_columns(new)
+        self.meta["rows"] += len(rows)
+        return len(rows)
+
+    def _append_columns(self, new):
+        ensure_folder_exists(self.folder)
+        for name in COLUMNS:
+            values = np.asarray(new[name], dtype=DTYPES[name])
+            committed = self.meta["rows"] * values.itemsize
+            path = self._column_path(name)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # rows appended before a crash, but never committed to meta, are overwritten
+                if os.fstat(f.fileno()).st_size != committed:
+                    f.truncate(committed)
+                f.seek(committed)
+                f.write(values.tobytes())
+
+    def _save_meta(self):
+        try:
+            ensure_folder_exists(self.folder)
+            temp_path = self.meta_path + ".temp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.meta, f)
+            os.replace(temp_path, self.meta_path)
+        except OSError as e:
+            print(f"Error saving watch history store: {e}")
+            self.logger.error_logs(f"{e} While Saving {self.meta_path}")
+
+    def to_dataframe(self):
+        """
+        Returns the history as a DataFrame with typed columns: "File Name", "Total Duration" and
+        "Duration Watched" (timedelta64), "Date Watched" (datetime64), "video_name" and "primary_folder".
+        """
+        import pandas as pd
+
+        # copied out of the memory maps so the DataFrame doesn't keep the files mapped
+        columns = {name: np.array(values) for name, values in self.columns().items()}
+        codes = columns["path_code"]
+        paths = np.array(self.meta["paths"] or [""], dtype=object)
+        names = np.array([os.path.basename(p) for p in self.meta["paths"]] or [""], dtype=object)
+        folders = np.array([os.path.dirname(normalise_path(p)) for p in self.meta["paths"]] or [""], dtype=object)
+        return pd.DataFrame({
+            "File Name": paths[codes],
+            "Total Duration": pd.to_timedelta(columns["total_ms"].view("timedelta64[ms]")),
+            "Date Watched": pd.to_datetime(columns["watched_at"].view("datetime64[s]")),
+            "Duration Watched": pd.to_timedelta(columns["watched_ms"].view("timedelta64[ms]")),
+            "video_name": names[codes],
+            "primary_folder": folders[codes],
+        })
+
+    def weekday_counts(self):
+        """Returns {weekday name: watch count}, Monday first."""
+        return {day: bucket[0] for day, bucket in zip(WEEKDAYS, self.rollups["weekday"])}
+
+    def daily_counts(self, since=None):
+        """Returns {"YYYY-MM-DD": watch count}, optionally only for days on or after the since date string."""
+        return {day: bucket[0] for day, bucket in sorted(self.rollups["daily"].items()) if since is None or day >= since}
+
+
+if __name__ == "__main__":
+    store = WatchHistoryStore()
+    print(f"Added {store.refresh()} row(s), {store.meta['rows']} in total.")
+    print("Weekdays:", store.weekday_counts())
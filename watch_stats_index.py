@@ -0,0 +1,193 @@
+import atexit
+import csv
+import json
+import os
+import threading
+
+from buffered_writer import flush_all
+from history_parsing import NAT, durations_seconds, parse_timestamps_s, s_to_datetime
+from logs_writer import LogManager
+from player_constants import LOG_PATH, WATCHED_HISTORY_LOG_PATH
+from static_methods import normalise_path
+
+_TAIL_CHECK_BYTES = 64
+
+
+def get_index_path(csv_path):
+    """Returns the path of the stats index kept next to a watch history csv."""
+    return os.path.splitext(csv_path)[0] + "_Stats_Index.json"
+
+
+class WatchStatsIndex:
+    """
+    Persistent per-file watch aggregates keyed by lowercased file name.
+
+    Each entry holds [watch_count, total_seconds, last_watched] (last_watched as int64
+    seconds, see history_parsing). WatchHistoryLogger records every row it logs, and
+    rows appended to the csv by anything else are read from the last indexed byte
+    offset, so a lookup never rescans the whole history. The index is rebuilt if the
+    csv was rewritten.
+    """
+
+    def __init__(self, csv_path=WATCHED_HISTORY_LOG_PATH, index_path=None):
+        self.csv_path = csv_path
+        self.index_path = index_path or get_index_path(csv_path)
+        self.logger = LogManager(LOG_PATH)
+        self._lock = threading.RLock()
+        self._data = None
+        self._dirty = False
+
+    def _empty(self):
+        return {"offset": 0, "tail": "", "open_row": False, "header": None, "entries": {}}
+
+    def _load(self):
+        if self._data is not None:
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except FileNotFoundError:
+            self._data = self._empty()
+        except (ValueError, OSError) as e:
+            print(f"Rebuilding unreadable watch stats index {self.index_path}: {e}")
+            self.logger.error_logs(f"{e} While Reading {self.index_path}")
+            self._data = self._empty()
+
+    def _advance_tail(self, row_bytes):
+        self._data["offset"] += len(row_bytes)
+        self._data["open_row"] = not row_bytes.endswith(b"\n")
+        self._data["tail"] = (bytes.fromhex(self._data["tail"]) + row_bytes[-_TAIL_CHECK_BYTES:])[-_TAIL_CHECK_BYTES:].hex()
+
+    def _add_rows(self, names, durations, dates):
+        if not names:
+            return
+        seconds = durations_seconds(durations)
+        timestamps = parse_timestamps_s(dates)
+        entries = self._data["entries"]
+        for name, watched, watched_at in zip(names, seconds.tolist(), timestamps.tolist()):
+            entry = entries.setdefault(os.path.basename(normalise_path(name)).lower(), [0, 0.0, None])
+            entry[0] += 1
+            if watched == watched:  # NaN for an invalid duration
+                entry[1] += watched
+            if watched_at != NAT and (entry[2] is None or watched_at > entry[2]):
+                entry[2] = watched_at
+        self._dirty = True
+
+    def _catch_up(self):
+        """Indexes the rows appended to the csv since the last indexed offset."""
+        self._load()
+        flush_all()  # rows queued by an open player
+        try:
+            with open(self.csv_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                offset = self._data["offset"]
+                start = max(0, offset - _TAIL_CHECK_BYTES)
+                f.seek(start)
+                if size < offset or f.read(offset - start).hex() != self._data["tail"]:
+                    print(f"{self.csv_path} was rewritten, rebuilding its watch stats index.")
+                    self._data = self._empty()
+                    f.seek(0)
+                chunk = f.read(size - self._data["offset"])
+                if self._data.get("open_row") and chunk and chunk[:1] not in (b"\r", b"\n"):
+                    # the last row read had no line end and was still being written; read it again
+                    print(f"{self.csv_path} continued its last row, rebuilding its watch stats index.")
+                    self._data = self._empty()
+                    f.seek(0)
+                    chunk = f.read(size)
+        except FileNotFoundError:
+            return
+
+        if not chunk:
+            return
+        # the last row may have no line end (files not ending in a newline); it is counted too,
+        # and open_row makes the next catch up rebuild if more of that row gets written
+        rows = list(csv.reader(chunk.decode("utf-8", errors="replace").splitlines()))
+        if self._data["header"] is None and rows:
+            self._data["header"] = rows.pop(0)
+        header = self._data["header"] or []
+        if all(column in header for column in ("File Name", "Date Watched", "Duration Watched")):
+            name_i, date_i, watched_i = (header.index(c) for c in ("File Name", "Date Watched", "Duration Watched"))
+            rows = [row for row in rows if len(row) > max(name_i, date_i, watched_i)]
+            self._add_rows([r[name_i] for r in rows], [r[watched_i] for r in rows], [r[date_i] for r in rows])
+        self._advance_tail(chunk)
+        self._dirty = True
+
+    def record(self, file_name, duration_watched, date_watched, row_text, write):
+        """
+        Counts a row that WatchHistoryLogger is about to append and hands it to write.
+
+        The row is written while the index lock is held, so the indexed offset always
+        matches the bytes in (or queued for) the csv.
+
+        Args:
+            file_name (str): The watched file.
+            duration_watched (str): The "Duration Watched" value.
+            date_watched (str): The "Date Watched" value.
+            row_text (str): The formatted csv row, as it will be written.
+            write (callable): Appends row_text to the csv.
+        """
+        with self._lock:
+            if self._data is None:
+                self._catch_up()
+            write(row_text)
+            self._add_rows([file_name], [duration_watched], [date_watched])
+            self._advance_tail(row_text.encode("utf-8"))
+
+    def get_stats(self, file_paths):
+        """
+        Returns the combined watch stats of the given paths, matched on file name only.
+
+        Returns:
+            dict: "watch_count", "total_seconds" and "last_watched" ("%Y-%m-%d %H:%M:%S" or "Never").
+        """
+        with self._lock:
+            self._catch_up()
+            entries = self._data["entries"]
+            watch_count, total_seconds, last_watched = 0, 0, None
+            for name in {os.path.basename(p).lower() for p in file_paths}:
+                entry = entries.get(name)
+                if entry is None:
+                    continue
+                watch_count += entry[0]
+                total_seconds += entry[1]
+                if entry[2] is not None and (last_watched is None or entry[2] > last_watched):
+                    last_watched = entry[2]
+        return {
+            "watch_count": watch_count,
+            "total_seconds": total_seconds,
+            "last_watched": s_to_datetime(last_watched).strftime("%Y-%m-%d %H:%M:%S") if last_watched is not None else "Never",
+        }
+
+    def save(self):
+        """Writes the index to disk if it changed."""
+        with self._lock:
+            if not self._dirty or self._data is None:
+                return
+            try:
+                temp_path = self.index_path + ".temp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._data, f)
+                os.replace(temp_path, self.index_path)
+                self._dirty = False
+            except OSError as e:
+                print(f"Error saving watch stats index: {e}")
+                self.logger.error_logs(f"{e} While Saving {self.index_path}")
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_watch_stats_index(csv_path=WATCHED_HISTORY_LOG_PATH):
+    """Returns the index shared by everything reading or logging csv_path."""
+    key = os.path.normcase(os.path.abspath(csv_path))
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = WatchStatsIndex(csv_path)
+            atexit.register(_indexes[key].save)
+        return _indexes[key]
+
+
+if __name__ == "__main__":
+    index = get_watch_stats_index()
+    print(index.get_stats([WATCHED_HISTORY_LOG_PATH]))